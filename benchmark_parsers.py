@@ -0,0 +1,96 @@
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+from html_parsers import PARSER_BACKENDS, DEFAULT_PARSER, available_parsers
+from parsed_page import ParsedPage
+from bulk_scraper import ContactScraper
+from page_crawler import PageCrawler
+
+
+def extract_all(scraper: ContactScraper, html: str, url: str, parser: str) -> Dict:
+    """Analyse une page et lance tous les extracteurs, en mesurant l'analyse et l'extraction"""
+    start = time.perf_counter()
+    page = ParsedPage(html, url, parser=parser)
+    page.flat
+    parsed = time.perf_counter()
+
+    contacts = scraper.extract_contacts(page, url)
+    result = {
+        'links': sorted(PageCrawler(None).extract_links(page.links, url)),
+        'emails': sorted(email['value'] for email in contacts['emails']),
+        'phones': sorted(phone['value'] for phone in contacts['phones']),
+        'social_media': contacts['social_media'],
+        'technologies': {category: sorted(techs) for category, techs in
+                         scraper.tech_detector.detect_technologies(page).items()},
+        'company_info': scraper.company_detector.extract_company_info(page, url),
+    }
+    return {
+        'result': result,
+        'parse_seconds': parsed - start,
+        'extract_seconds': time.perf_counter() - parsed,
+    }
+
+
+def run_benchmark(files: List[Path], parsers: List[str], url: str, repeat: int = 1) -> Dict:
+    """
+    Mesure le coût par page de chaque backend et compare ses résultats à ceux de BeautifulSoup
+
+    Returns:
+        Dict backend -> temps moyens par page (ms) et pages dont les résultats diffèrent
+    """
+    scraper = ContactScraper(parser=DEFAULT_PARSER)
+    documents = [(path, path.read_text(encoding='utf-8', errors='replace')) for path in files]
+    reference = {path: extract_all(scraper, html, url, DEFAULT_PARSER)['result'] for path, html in documents}
+
+    report = {}
+    for parser in parsers:
+        parse_seconds = extract_seconds = 0.0
+        mismatches = []
+        for _ in range(repeat):
+            for path, html in documents:
+                run = extract_all(scraper, html, url, parser)
+                parse_seconds += run['parse_seconds']
+                extract_seconds += run['extract_seconds']
+                if run['result'] != reference[path] and path.name not in mismatches:
+                    mismatches.append(path.name)
+        pages = len(documents) * repeat
+        report[parser] = {
+            'parse_ms': round(parse_seconds * 1000 / pages, 2),
+            'extract_ms': round(extract_seconds * 1000 / pages, 2),
+            'total_ms': round((parse_seconds + extract_seconds) * 1000 / pages, 2),
+            'mismatches': mismatches,
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare le coût par page des backends d'analyse HTML")
+    parser.add_argument('directory', nargs='?', default='html_content',
+                      help='Dossier des pages HTML à analyser (default: html_content, rempli par scrape_html.py)')
+    parser.add_argument('--parsers', nargs='+', choices=sorted(PARSER_BACKENDS), default=None,
+                      help='Backends à mesurer (default: tous ceux installés)')
+    parser.add_argument('--repeat', type=int, default=3,
+                      help='Nombre de passes sur le corpus (default: 3)')
+    parser.add_argument('--url', default='https://www.example.com/contact',
+                      help='URL attribuée aux pages (base des liens relatifs)')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    files = sorted(Path(args.directory).glob('*.html'))
+    if not files:
+        print(f"Erreur: aucune page HTML dans {args.directory}")
+        sys.exit(1)
+
+    parsers = args.parsers or available_parsers()
+    report = run_benchmark(files, parsers, args.url, max(1, args.repeat))
+
+    print(f"{len(files)} pages, {args.repeat} passes")
+    print(f"{'backend':<12}{'analyse ms':>12}{'extraction ms':>16}{'total ms':>12}  résultats")
+    for name, stats in report.items():
+        status = 'identiques' if not stats['mismatches'] else f"{len(stats['mismatches'])} pages différentes"
+        print(f"{name:<12}{stats['parse_ms']:>12}{stats['extract_ms']:>16}{stats['total_ms']:>12}  {status}")
+        for page_name in stats['mismatches']:
+            print(f"    {page_name}")
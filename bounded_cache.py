@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+# Taille par défaut des caches partagés du run (entrées)
+DEFAULT_MAX_ENTRIES = 50000
+
+_MISSING = object()
+
+
+class LruCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Any], int]] = None):
+        """
+        Cache borné : les entrées les moins récemment utilisées sont évincées au-delà des limites
+
+        Args:
+            max_entries: Nombre maximum d'entrées
+            max_bytes: Taille maximum cumulée des valeurs (None = pas de limite)
+            sizeof: Taille d'une valeur, en octets (requis avec max_bytes)
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof if sizeof is not None else (lambda value: 0)
+        # Clé -> (valeur, taille), de la moins récemment utilisée à la plus récente
+        self.entries: OrderedDict = OrderedDict()
+        self.bytes = 0
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Valeur de la clé (marquée comme la plus récente), `default` si absente"""
+        entry = self.entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.stats['misses'] += 1
+            return default
+        self.stats['hits'] += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        """Ajoute ou remplace une entrée, puis évince les plus anciennes au-delà des limites"""
+        size = self.sizeof(value)
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= previous[1]
+        self.entries[key] = (value, size)
+        self.bytes += size
+
+        while len(self.entries) > self.max_entries or (
+                self.max_bytes is not None and self.bytes > self.max_bytes and len(self.entries) > 1):
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.stats['evictions'] += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Valeur de la clé, calculée et mémorisée si absente"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Retourne les compteurs du cache
+
+        Returns:
+            Dict avec les hits, misses, évictions, le nombre d'entrées, la taille et le taux de hits
+        """
+        stats = dict(self.stats)
+        stats['entries'] = len(self.entries)
+        if self.max_bytes is not None:
+            stats['bytes'] = self.bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+# Caches partagés par tous les sites du processus (résultats indépendants du site)
+_shared: Dict[str, LruCache] = {}
+
+
+def shared_cache(name: str, max_entries: int = DEFAULT_MAX_ENTRIES) -> LruCache:
+    """
+    Cache partagé du processus, créé au premier appel
+
+    Args:
+        name: Nom du cache (phones, urls, company_ids...)
+        max_entries: Nombre maximum d'entrées (pris en compte à la création)
+    """
+    if name not in _shared:
+        _shared[name] = LruCache(max_entries)
+    return _shared[name]
+
+
+def shared_cache_stats() -> Dict[str, Dict[str, float]]:
+    """Compteurs des caches partagés du processus, par nom"""
+    return {name: cache.get_stats() for name, cache in _shared.items()}
+
+
+def merge_cache_stats(snapshots: Iterable[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+    """Additionne les compteurs de plusieurs processus (workers d'extraction), par nom de cache"""
+    merged = {}
+    for snapshot in snapshots:
+        for name, stats in snapshot.items():
+            total = merged.setdefault(name, {})
+            for key, value in stats.items():
+                if key != 'hit_ratio':
+                    total[key] = total.get(key, 0) + value
+    for total in merged.values():
+        lookups = total.get('hits', 0) + total.get('misses', 0)
+        total['hit_ratio'] = round(total.get('hits', 0) / lookups, 3) if lookups else 0.0
+    return merged
@@ -1,32 +1,107 @@
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
 import json
 import tqdm
 import aiofiles
 from contact_extractor import ContactExtractor
 from social_media_extractor import SocialMediaExtractor
 from tech_detector import TechnologyDetector
-from company_detector import CompanyDetector
+from company_detector import CompanyDetector, STRUCTURED
 from data_saver import DataSaver
 import sys
 import uuid
 import random
-from functools import lru_cache
 import hashlib
 import argparse
 import time
 import logging
+from urllib.parse import urlparse
 from page_crawler import PageCrawler
+from parsed_page import ParsedPage
+from html_parsers import PARSER_BACKENDS, DEFAULT_PARSER, get_parser_backend
+from extraction_pool import ExtractionPool
+from http_client import HttpClient
+from host_limiter import HostLimiter
+from concurrency_controller import AdaptiveConcurrency
+from deadline import Deadline
+from fetch_errors import TRANSIENT_ERRORS, DEADLINE, CIRCUIT_OPEN
+from retry_queue import RetryQueue
+from liveness_probe import LivenessProbe
+from bounded_cache import shared_cache_stats, merge_cache_stats
+from contact_aggregate import ContactList
 
 class ContactScraper:
-    def __init__(self):
+    def __init__(self, limit: int = 100, limit_per_host: int = 4, concurrency: int = 10,
+                 adaptive: bool = True, min_concurrency: int = 2, max_concurrency: int = 200,
+                 site_timeout: float = 10, dns_prefetch: bool = True, preflight: bool = False,
+                 preflight_concurrency: int = 500, preflight_timeout: float = 3,
+                 host_rate: float = 2.0, host_max_in_flight: int = 2,
+                 ip_rate: float = 8.0, ip_max_in_flight: int = 8,
+                 max_page_bytes: int = 2 * 1024 * 1024, discovery_bytes: int = None,
+                 parser: str = DEFAULT_PARSER, extract_workers: int = None, fingerprints: str = None,
+                 emails_only: bool = False, full_scan: bool = False):
         """
         Initialise le scraper avec ses extracteurs
+        
+        Args:
+            concurrency: Nombre de sites traités simultanément (fenêtre initiale si adaptive)
+            adaptive: Ajuste automatiquement le nombre de sites simultanés (AIMD)
+            min_concurrency: Borne basse de la fenêtre adaptative
+            max_concurrency: Borne haute de la fenêtre adaptative
+            site_timeout: Budget de temps par site (secondes), partagé par toutes ses requêtes
+            dns_prefetch: Résout les domaines de la liste en avance sur les workers
+            preflight: Écarte les domaines morts (DNS + connexion TCP) avant le crawl
+            preflight_concurrency: Nombre de sondes de pré-vol simultanées
+            preflight_timeout: Timeout DNS et TCP des sondes de pré-vol (secondes)
+            limit: Nombre maximum de connexions HTTP ouvertes pour tout le run
+            limit_per_host: Nombre maximum de connexions HTTP ouvertes par hôte
+            host_rate: Requêtes par seconde autorisées par hôte
+            host_max_in_flight: Requêtes simultanées maximum par hôte
+            ip_rate: Requêtes par seconde autorisées par adresse IP
+            ip_max_in_flight: Requêtes simultanées maximum par adresse IP
+            max_page_bytes: Nombre maximum d'octets lus par page (au-delà, la page est tronquée)
+            discovery_bytes: Lit seulement le début (requête Range) des pages visitées pour leurs liens
+            parser: Backend d'analyse HTML (bs4, lxml ou selectolax)
+            extract_workers: Processus d'extraction (défaut : un par cœur, 0 = extraction sur la boucle asyncio)
+            fingerprints: Fichier d'empreintes de technologies au format Wappalyzer (défaut : technologies.json)
+            emails_only: N'extrait que les emails, sur les octets bruts des réponses (pas d'analyse HTML
+                         hors découverte des liens)
+            full_scan: Cherche aussi les emails et les numéros dans les pages dont les données
+                       structurées (JSON-LD, microdata) en fournissent déjà
         """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.concurrency = max(1, concurrency)
+        self.adaptive = adaptive
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.site_timeout = site_timeout
+        self.dns_prefetch = dns_prefetch
+        self.preflight = preflight
+        self.preflight_concurrency = preflight_concurrency
+        self.preflight_timeout = preflight_timeout
+        self.dead_sites = []
+        self.retry_queue = None
+        self.host_rate = host_rate
+        self.host_max_in_flight = host_max_in_flight
+        self.ip_rate = ip_rate
+        self.ip_max_in_flight = ip_max_in_flight
+        self.max_page_bytes = max_page_bytes
+        self.discovery_bytes = discovery_bytes
+        self.parser = get_parser_backend(parser).name
+        self.extract_workers = extract_workers
+        self.fingerprints = fingerprints
+        self.emails_only = emails_only
+        self.full_scan = full_scan
+        # Étape d'extraction : pool de processus pendant bulk_scrape, analyse sur la boucle sinon
+        self.extraction_pool = ExtractionPool(workers=0, parser=self.parser, fingerprints=fingerprints,
+                                              emails_only=emails_only, full_scan=full_scan)
+        self.run_stats = {}
+        # Compteurs cumulés des caches de pages des crawlers (un cache par site)
+        self.page_cache_stats = {}
         self.contact_extractor = ContactExtractor()
         self.social_media_extractor = SocialMediaExtractor()
-        self.tech_detector = TechnologyDetector()
+        self.tech_detector = TechnologyDetector(fingerprints)
         self.company_detector = CompanyDetector()
         
         # Liste des User-Agents
@@ -52,39 +127,9 @@ class ContactScraper:
             'Upgrade-Insecure-Requests': '1'
         }
 
-    async def fetch_url(self, session: aiohttp.ClientSession, url: str, headers: dict) -> tuple[str, dict]:
-        """
-        Récupère le contenu d'une URL avec gestion des erreurs et des timeouts
-        """
-        try:
-            async with session.get(url, headers=headers) as response:
-                # Essayer d'abord avec l'encodage spécifié dans les headers
-                content_type = response.headers.get('content-type', '')
-                charset = None
-                if 'charset=' in content_type:
-                    charset = content_type.split('charset=')[-1]
-                
-                # Lire le contenu
-                content = await response.read()
-                
-                # Essayer différents encodages
-                for encoding in [charset, 'utf-8', 'latin1', 'cp1252', 'iso-8859-1']:
-                    if not encoding:
-                        continue
-                    try:
-                        html = content.decode(encoding)
-                        return html, dict(response.headers)
-                    except UnicodeDecodeError:
-                        continue
-                
-                return "", {}
-                
-        except Exception as e:
-            return "", {}
-
-    def extract_contacts(self, html: str, url: str) -> dict:
+    def extract_contacts(self, html, url: str) -> dict:
         """
-        Extrait toutes les informations de contact d'une page HTML
+        Extrait toutes les informations de contact d'une page HTML (document déjà analysé ou HTML brut)
         """
         contacts = {
             'emails': [],  
@@ -93,11 +138,11 @@ class ContactScraper:
             'url': url
         }
 
-        # Parse le HTML
-        soup = BeautifulSoup(html, 'html.parser')
+        # Parse le HTML (une seule fois pour tous les extracteurs)
+        page = ParsedPage.of(html, url, parser=self.parser)
         
         # Extraction des emails et téléphones
-        emails, phones = self.contact_extractor.extract_contacts(soup)
+        emails, phones = self.contact_extractor.extract_contacts(page)
         
         # Ajout des sources pour les emails
         for email in emails:
@@ -106,175 +151,332 @@ class ContactScraper:
                 'sources': [url]  
             })
         
-        # Ajout des sources pour les téléphones
-        for phone in phones:
+        # Ajout des sources et de la confiance pour les téléphones
+        for phone, confidence in phones.items():
             contacts['phones'].append({
                 'value': phone,
+                'confidence': confidence,
                 'sources': [url]  
             })
         
         # Extraction des liens sociaux
-        contacts['social_media'] = self.social_media_extractor.extract_social_links(soup, url)
+        contacts['social_media'] = self.social_media_extractor.extract_social_links(page, url)
         
         return contacts
 
-    async def process_url(self, session: aiohttp.ClientSession, url: str, crawl: bool = True):
+    def normalize_url(self, url: str) -> str:
+        """Ajoute le schéma https:// aux URLs qui n'en ont pas"""
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        return url
+
+    async def process_url(self, client: HttpClient, url: str, crawl: bool = True, deadline: Deadline = None):
         """
         Traite une URL et ses pages prioritaires pour extraire les contacts et technologies
+        
+        Chaque requête et chaque analyse ne dispose que du temps restant sur le budget du site.
+        Quand le budget est épuisé, le résultat contient ce qui a déjà été récupéré et analysé,
+        marqué partial, avec la liste des pages non récupérées ou non analysées.
         """
         # Normaliser l'URL de départ
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
+        url = self.normalize_url(url)
         
         # Choisir un User-Agent pour tout le site
         headers = self.get_random_headers()
         
-        crawler = PageCrawler(max_pages=5)
+        crawler = PageCrawler(client, max_pages=5, deadline=deadline, discovery_bytes=self.discovery_bytes,
+                              pool=self.extraction_pool)
         
         # Si crawl est False, on ne traite que la page d'accueil
         if not crawl:
-            priority_pages = {url}
+            pages = {url: None}
         else:
-            priority_pages = await crawler.crawl_priority_pages(url, headers)
+            pages = await crawler.crawl_priority_pages(url, headers)
+            self.page_cache_stats = merge_cache_stats([self.page_cache_stats, {'pages': crawler.page_cache.get_stats()}])
+        
+        # Ne récupérer (en parallèle) que les pages que le crawler n'a pas déjà téléchargées
+        missing_urls = [page_url for page_url, page in pages.items() if page is None]
+        if missing_urls:
+            fetched_pages = await asyncio.gather(*(client.fetch(page_url, headers, deadline=deadline)
+                                                   for page_url in missing_urls))
+            pages.update(zip(missing_urls, fetched_pages))
+        
+        # Analyser (hors de la boucle) les pages que le crawler n'a pas déjà analysées, dans le budget
+        # du site : les pages analysées à temps sont gardées, les autres sont signalées comme sautées
+        await asyncio.gather(*(self.extraction_pool.analyze(page, page_url, deadline=deadline)
+                               for page_url, page in pages.items() if page['html'] and not page['error_kind']))
+        unanalyzed = [page_url for page_url, page in pages.items()
+                      if page['html'] and not page['error_kind'] and page.get('analysis') is None
+                      and deadline and deadline.expired]
         
         # Initialiser les résultats
         results = {
             'url': url,
-            'emails': [],
-            'phones': [],
+            # Contacts indexés par valeur (fusion des pages en O(nouveaux contacts))
+            'emails': ContactList(),
+            'phones': ContactList(),
             'social_media': {},
             'technologies': [],
             'headers_info': {},
             'security_headers': {},
             'crawled_pages': [],  
+            'partial': False,
+            'skipped_pages': [page_url for page_url, page in pages.items()
+                              if page['error_kind'] == DEADLINE] + unanalyzed,
+            'failed_pages': [{'url': page_url, 'error': page['error_kind']} for page_url, page in pages.items()
+                             if page['error_kind'] and page['error_kind'] != DEADLINE],
             'company_info': {
                 'siren': None,
                 'siret': None,
                 'tva': None,
-                'source': None
+                'address': None,
+                'source': None,
+                'origin': None,
+                'confidence': None
+            },
+            'stats': {
+                'pages_fetched': sum(1 for page in pages.values() if page['status'] is not None),
+                'fetch_errors': sum(1 for page in pages.values() if page['error']),
+                'fetch_timeouts': sum(1 for page in pages.values() if page['error_kind'] == 'timeout'),
+                'connect_errors': sum(1 for page in pages.values() if page['error_kind'] == 'connect'),
+                'pages_truncated': sum(1 for page in pages.values() if page['truncated']),
+                'bytes_read': sum(page['bytes_read'] for page in pages.values()),
+                'deadline_seconds': deadline.seconds if deadline else None,
+                'dns_ms': client.dns_cache.get_timing(urlparse(url).hostname),
+                'dns_prefetched': urlparse(url).hostname in client.dns_cache.prefetched
             }
         }
         
+        # Relancer plus tard les pages en échec transitoire
+        for page_url, page in pages.items():
+            if page['error_kind'] in TRANSIENT_ERRORS and self.retry_queue is not None:
+                self.retry_queue.schedule({'results': results, 'page_url': page_url, 'headers': headers})
+        
         # Traiter chaque page prioritaire
-        for page_url in priority_pages:
-            try:
-                html, response_headers = await self.fetch_url(session, page_url, headers)
-                if not html:
-                    continue
-                
-                # Déterminer le type de page
-                page_type = self.determine_page_type(page_url)
-                if not page_type:
-                    page_type = 'home' if page_url == url else 'other'
-                
-                # Ajouter la page aux pages crawlées
-                results['crawled_pages'].append({
-                    'url': page_url,
-                    'type': page_type
-                })
-                
-                # Extraction des contacts
-                page_contacts = self.extract_contacts(html, page_url)
-                
-                # Fusionner les emails
-                for email in page_contacts['emails']:
-                    if not any(e['value'] == email['value'] for e in results['emails']):
-                        results['emails'].append({
-                            'value': email['value'],
-                            'sources': [page_url]
-                        })
-                    else:
-                        # Ajouter la source si l'email existe déjà
-                        for existing_email in results['emails']:
-                            if existing_email['value'] == email['value'] and page_url not in existing_email['sources']:
-                                existing_email['sources'].append(page_url)
-                
-                # Fusionner les téléphones
-                for phone in page_contacts['phones']:
-                    if not any(p['value'] == phone['value'] for p in results['phones']):
-                        results['phones'].append({
-                            'value': phone['value'],
-                            'sources': [page_url]
-                        })
-                    else:
-                        # Ajouter la source si le téléphone existe déjà
-                        for existing_phone in results['phones']:
-                            if existing_phone['value'] == phone['value'] and page_url not in existing_phone['sources']:
-                                existing_phone['sources'].append(page_url)
-                
-                # Fusionner les réseaux sociaux
-                for platform, url in page_contacts['social_media'].items():
-                    if url and platform not in results['social_media']:
-                        results['social_media'][platform] = url
-                
-                # Détecter les technologies si pas encore fait
-                if not results['technologies']:
-                    results['technologies'] = self.tech_detector.detect_technologies(html)
-                    results['headers_info'] = self.tech_detector.get_headers_info(response_headers)
-                    results['security_headers'] = self.tech_detector.get_security_headers(response_headers)
-                
-                # Extraction des informations d'entreprise
-                company_info = self.company_detector.extract_company_info(html, page_url)
-                if company_info['siren'] and not results['company_info']['siren']:
-                    results['company_info'] = company_info
-                elif company_info['siret'] and not results['company_info']['siret']:
-                    results['company_info'] = company_info
-                elif company_info['tva'] and not results['company_info']['tva']:
-                    results['company_info'] = company_info
-                    
-            except Exception as e:
-                logging.error(f"Erreur lors du traitement de {page_url}: {str(e)}")
-                continue
+        for page_url, page in pages.items():
+            self.merge_page(results, page_url, page)
         
+        results['partial'] = bool(results['skipped_pages'])
         return results
 
+    def merge_page(self, results: dict, page_url: str, page: dict):
+        """
+        Fusionne l'analyse d'un document récupéré dans les résultats du site ; une page en échec
+        (5xx, 429... même avec un corps) n'est pas fusionnée, seule la relance réussie l'est
+        """
+        try:
+            analysis, response_headers = page.get('analysis'), page['headers']
+            if page['error_kind'] or not page['html'] or not analysis:
+                return
+            
+            # Déterminer le type de page
+            page_type = self.determine_page_type(page_url)
+            if not page_type:
+                page_type = 'home' if page_url == results['url'] else 'other'
+            
+            # Ajouter la page aux pages crawlées
+            crawled_page = {
+                'url': page_url,
+                'type': page_type
+            }
+            if page['truncated']:
+                crawled_page['truncated'] = True
+            structured = analysis['structured']
+            if structured:
+                # Champs remplis par les données structurées de la page (JSON-LD, microdata)
+                crawled_page['structured'] = list(structured)
+            results['crawled_pages'].append(crawled_page)
+            
+            # Fusionner les emails et les téléphones (sources uniques, meilleure confiance, type de
+            # la première page), ceux des données structurées marqués comme tels
+            results['emails'].merge(analysis['emails'], page_url, page_type)
+            results['phones'].merge(analysis['phones'], page_url, page_type)
+            results['emails'].merge(structured.get('emails', []), page_url, page_type, STRUCTURED)
+            results['phones'].merge(structured.get('phones', []), page_url, page_type, STRUCTURED)
+            
+            # Fusionner les réseaux sociaux
+            for platform, social_url in analysis['social_media'].items():
+                if social_url and platform not in results['social_media']:
+                    results['social_media'][platform] = social_url
+            
+            # Détecter les technologies si pas encore fait
+            if not results['technologies']:
+                results['technologies'] = analysis['technologies']
+                results['headers_info'] = self.tech_detector.get_headers_info(response_headers)
+                results['security_headers'] = self.tech_detector.get_security_headers(response_headers)
+            
+            # Extraction des informations d'entreprise : la page la plus sûre l'emporte (puis la
+            # plus complète, puis la première), un numéro isolé ne masque pas un SIREN annoncé
+            company_info = analysis['company_info']
+            address = results['company_info']['address']
+            if self.company_rank(company_info) > self.company_rank(results['company_info']):
+                results['company_info'] = company_info
+            # Adresse : la première trouvée, même sur une page sans identifiant
+            if not results['company_info']['address']:
+                results['company_info']['address'] = address or company_info['address']
+                
+        except Exception as e:
+            logging.error(f"Erreur lors du traitement de {page_url}: {str(e)}")
+
+    def company_rank(self, company_info: dict) -> tuple:
+        """Ordre des informations d'entreprise de deux pages : confiance, puis identifiants trouvés"""
+        return (company_info['confidence'] or 0,
+                sum(1 for key in ('siren', 'siret', 'tva') if company_info[key]))
+
+    async def retry_page(self, client: HttpClient, entry: dict) -> dict:
+        """
+        Relance la récupération d'une page en échec transitoire et fusionne le résultat dans son site
+        """
+        results, page_url = entry['results'], entry['page_url']
+        page = await client.fetch(page_url, entry['headers'], timeout=self.site_timeout)
+        
+        failed = [failure for failure in results['failed_pages'] if failure['url'] == page_url]
+        if page['error_kind'] is None:
+            results['failed_pages'] = [failure for failure in results['failed_pages'] if failure['url'] != page_url]
+            await self.extraction_pool.analyze(page, page_url)
+            self.merge_page(results, page_url, page)
+        elif page['error_kind'] != CIRCUIT_OPEN:
+            # Un refus du disjoncteur ne remplace pas la cause d'origine
+            for failure in failed:
+                failure['error'] = page['error_kind']
+        return page
+
+    def failure_summary(self, client: HttpClient, results: list) -> dict:
+        """
+        Résume les échecs par classe (dns, connect, tls, timeout, 5xx, 429, 4xx, ...)
+        """
+        final = {}
+        for result in results:
+            for failure in result['failed_pages']:
+                final[failure['error']] = final.get(failure['error'], 0) + 1
+        return {
+            'attempts': dict(client.failures),
+            'final': final,
+            'retries': self.retry_queue.get_stats(),
+            'circuit_breaker': client.breaker.get_stats()
+        }
+
     async def bulk_scrape(self, urls: list, crawl: bool = True) -> list:
         """
         Scrape en masse une liste d'URLs
-        """
-        timeout = aiohttp.ClientTimeout(total=30, connect=5)
-        connector = aiohttp.TCPConnector(ssl=False, limit=5)
         
-        print(f"Début du scraping de {len(urls)} URLs...")
-        progress_bar = tqdm.tqdm(total=len(urls), unit='site')
+        Un pool de workers traite les sites au fil de l'eau : dès qu'un site se termine,
+        une place se libère pour l'URL suivante de la file. Le nombre de sites simultanés
+        est piloté par un contrôleur AIMD (fixe si adaptive=False).
+        """
+        if self.adaptive:
+            controller = AdaptiveConcurrency(initial=self.concurrency, min_window=self.min_concurrency,
+                                             max_window=max(self.concurrency, self.max_concurrency))
+        else:
+            controller = AdaptiveConcurrency(initial=self.concurrency, min_window=self.concurrency,
+                                             max_window=self.concurrency)
+        scheduler_stats = {'timeouts': 0, 'errors': 0, 'timed_out_sites': []}
+        self.retry_queue = RetryQueue()
         
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-            results = []
-            # Traiter les URLs par lots de 3 pour éviter la surcharge
-            batch_size = 3
+        # Un seul client HTTP (pool de connexions, contexte SSL) partagé par le crawler et le scraper
+        limiter = HostLimiter(host_rate=self.host_rate, host_max_in_flight=self.host_max_in_flight,
+                              ip_rate=self.ip_rate, ip_max_in_flight=self.ip_max_in_flight)
+        self.extraction_pool = ExtractionPool(workers=self.extract_workers, parser=self.parser,
+                                              fingerprints=self.fingerprints, emails_only=self.emails_only,
+                                              full_scan=self.full_scan)
+        async with HttpClient(limit=self.limit, limit_per_host=self.limit_per_host, limiter=limiter,
+                              max_body_bytes=self.max_page_bytes) as client, self.extraction_pool:
+            # Pré-vol optionnel : seuls les sites vivants entrent dans le pipeline de crawl
+            if self.preflight:
+                print(f"Pré-vol (DNS + TCP) de {len(urls)} URLs...")
+                probe = LivenessProbe(client.dns_cache, concurrency=self.preflight_concurrency,
+                                      dns_timeout=self.preflight_timeout, connect_timeout=self.preflight_timeout)
+                urls, self.dead_sites = await probe.filter([self.normalize_url(url) for url in urls])
+                self.run_stats['preflight'] = probe.get_stats()
+                print(f"{len(self.dead_sites)} sites morts écartés")
             
-            for i in range(0, len(urls), batch_size):
-                batch = urls[i:i + batch_size]
-                batch_tasks = []
-                
-                for url in batch:
-                    # Utiliser un timeout plus court pour chaque URL
-                    task = asyncio.create_task(
-                        asyncio.wait_for(
-                            self.process_url(session, url, crawl),
-                            timeout=10
+            print(f"Début du scraping de {len(urls)} URLs...")
+            progress_bar = tqdm.tqdm(total=len(urls), unit='site')
+            
+            # File des sites à traiter (index conservé pour restituer l'ordre d'entrée)
+            queue = asyncio.Queue()
+            for index, url in enumerate(urls):
+                queue.put_nowait((index, url))
+            site_results = [None] * len(urls)
+            
+            async def worker():
+                while True:
+                    await controller.acquire()
+                    try:
+                        index, url = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        await controller.release()
+                        return
+                    
+                    site_start = time.monotonic()
+                    ok = True
+                    try:
+                        # Le budget du site est transmis à chaque requête ; le wait_for n'est qu'un
+                        # filet de sécurité, les résultats partiels sont retournés avant son expiration
+                        result = await asyncio.wait_for(
+                            self.process_url(client, url, crawl, Deadline(self.site_timeout)),
+                            timeout=self.site_timeout + 5
                         )
-                    )
-                    batch_tasks.append(task)
-                
-                try:
-                    batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-                    for result in batch_results:
-                        if isinstance(result, Exception):
-                            if not isinstance(result, asyncio.TimeoutError):
-                                print(f"Error in batch: {str(result)}")
-                            continue
-                        if result:
-                            results.append(result)
-                    progress_bar.update(len(batch))
-                except Exception as e:
-                    print(f"Batch processing error: {str(e)}")
-                
-                # Petit délai entre les lots
-                await asyncio.sleep(0.5)
+                        site_results[index] = result
+                        # Les timeouts et erreurs de connexion signalent une surcharge
+                        ok = not (result['stats']['fetch_timeouts'] or result['stats']['connect_errors'])
+                    except asyncio.TimeoutError:
+                        ok = False
+                        scheduler_stats['timeouts'] += 1
+                        scheduler_stats['timed_out_sites'].append(url)
+                    except Exception as e:
+                        scheduler_stats['errors'] += 1
+                        print(f"Error processing {url}: {str(e)}")
+                    finally:
+                        await controller.release(time.monotonic() - site_start, ok)
+                        progress_bar.update(1)
+                        progress_bar.set_postfix(window=controller.window, refresh=False)
+            
+            # Résolution DNS de la liste en avance sur les workers (dans l'ordre de la file)
+            prefetch_task = None
+            if self.dns_prefetch:
+                hosts = [urlparse(self.normalize_url(url)).hostname for url in urls]
+                prefetch_task = asyncio.create_task(client.dns_cache.prefetch(hosts))
+            
+            start_time = time.monotonic()
+            workers = [asyncio.create_task(worker()) for _ in range(min(controller.max_window, len(urls)))]
+            await asyncio.gather(*workers)
+            elapsed = time.monotonic() - start_time
+            if prefetch_task:
+                # Tous les sites sont traités : le préchargement restant n'a plus d'utilité, et
+                # son échec ne doit pas faire perdre les résultats collectés
+                prefetch_task.cancel()
+                await asyncio.gather(prefetch_task, return_exceptions=True)
+            
+            # Relances différées des échecs transitoires, après la passe principale
+            if len(self.retry_queue):
+                print(f"Relance de {len(self.retry_queue)} pages en échec transitoire...")
+                await self.retry_queue.drain(lambda entry: self.retry_page(client, entry),
+                                             concurrency=self.concurrency)
             
             progress_bar.close()
-            return results
+            self.run_stats['http'] = client.get_stats()
+            self.run_stats['politeness'] = limiter.get_stats()
+            self.run_stats['dns'] = client.dns_cache.get_stats()
+            self.run_stats['failures'] = self.failure_summary(client, [result for result in site_results if result])
+            self.run_stats['extraction'] = self.extraction_pool.get_stats()
+            # Caches bornés du run : processus principal, workers d'extraction et pages des crawlers
+            self.run_stats['caches'] = merge_cache_stats([shared_cache_stats(), self.run_stats['extraction'].pop('caches'),
+                                                          self.page_cache_stats])
+        
+        sites_per_sec = len(urls) / elapsed if elapsed > 0 else 0.0
+        scheduler_stats.update({
+            'sites': len(urls),
+            'elapsed_seconds': round(elapsed, 2),
+            'sites_per_sec': round(sites_per_sec, 2)
+        })
+        self.run_stats['scheduler'] = scheduler_stats
+        self.run_stats['concurrency'] = controller.get_stats()
+        self.run_stats['parser'] = self.parser
+        print(f"{len(urls)} sites traités en {elapsed:.1f}s ({sites_per_sec:.2f} sites/s), "
+              f"{scheduler_stats['timeouts']} timeouts")
+        
+        return [result for result in site_results if result]
 
     async def save_results(self, results: list, filename: str):
         """Sauvegarde les résultats dans un fichier JSON et CSV"""
@@ -339,77 +541,6 @@ class ContactScraper:
         
         return security_headers
 
-    async def process_page(self, html: str, response_headers: dict, page_url: str, url: str, results: dict):
-        """
-        Traite une page de manière asynchrone
-        """
-        try:
-            # Déterminer le type de page
-            page_type = self.determine_page_type(page_url)
-            
-            # Ajouter la page aux pages crawlées
-            results['crawled_pages'].append({
-                'url': page_url,
-                'type': page_type
-            })
-            
-            # Extraction des contacts de manière asynchrone
-            page_contacts = await asyncio.create_task(
-                asyncio.to_thread(self.contact_extractor.extract_contacts, html, page_url)
-            )
-            
-            # Fusionner les emails
-            for email in page_contacts['emails']:
-                if not any(e['value'] == email['value'] for e in results['emails']):
-                    results['emails'].append({
-                        'value': email['value'],
-                        'sources': [page_url]
-                    })
-                else:
-                    for existing_email in results['emails']:
-                        if existing_email['value'] == email['value'] and page_url not in existing_email['sources']:
-                            existing_email['sources'].append(page_url)
-            
-            # Fusionner les téléphones
-            for phone in page_contacts['phones']:
-                if not any(p['value'] == phone['value'] for p in results['phones']):
-                    results['phones'].append({
-                        'value': phone['value'],
-                        'sources': [page_url]
-                    })
-                else:
-                    for existing_phone in results['phones']:
-                        if existing_phone['value'] == phone['value'] and page_url not in existing_phone['sources']:
-                            existing_phone['sources'].append(page_url)
-            
-            # Fusionner les réseaux sociaux
-            results['social_media'].update(page_contacts['social_media'])
-            
-            # Détecter les technologies si pas encore fait
-            if not results['technologies']:
-                tech_task = asyncio.create_task(
-                    asyncio.to_thread(self.tech_detector.detect_technologies, html)
-                )
-                results['technologies'] = await tech_task
-                results['headers_info'] = self.tech_detector.get_headers_info(response_headers)
-                results['security_headers'] = self.tech_detector.get_security_headers(response_headers)
-            
-            # Extraction des informations d'entreprise de manière asynchrone
-            company_task = asyncio.create_task(
-                asyncio.to_thread(self.company_detector.extract_company_info, html, page_url)
-            )
-            company_info = await company_task
-            
-            if company_info['siren'] and not results['company_info']['siren']:
-                results['company_info'] = company_info
-            elif company_info['siret'] and not results['company_info']['siret']:
-                results['company_info'] = company_info
-            elif company_info['tva'] and not results['company_info']['tva']:
-                results['company_info'] = company_info
-                
-        except Exception as e:
-            logging.error(f"Erreur lors du traitement de la page {page_url}: {str(e)}")
-
     def determine_page_type(self, url: str) -> str:
         """
         Détermine le type de page en fonction de l'URL
@@ -449,6 +580,50 @@ if __name__ == "__main__":
                       help='Fichier de sortie (default: resultats_scraping.json)')
     parser.add_argument('--crawl', action='store_true', default=False,
                       help='Si activé, crawl tout le site. Sinon, analyse uniquement la page d\'accueil')
+    parser.add_argument('--concurrency', type=int, default=10,
+                      help='Nombre de sites traités simultanément, valeur initiale en mode adaptatif (default: 10)')
+    parser.add_argument('--adaptive', action=argparse.BooleanOptionalAction, default=True,
+                      help='Ajuste automatiquement le nombre de sites simultanés selon la latence et les erreurs (default: activé)')
+    parser.add_argument('--min-concurrency', type=int, default=2,
+                      help='Nombre minimum de sites simultanés en mode adaptatif (default: 2)')
+    parser.add_argument('--max-concurrency', type=int, default=200,
+                      help='Nombre maximum de sites simultanés en mode adaptatif (default: 200)')
+    parser.add_argument('--site-timeout', type=float, default=10,
+                      help='Budget de temps par site en secondes ; au-delà, les résultats partiels sont conservés (default: 10)')
+    parser.add_argument('--dns-prefetch', action=argparse.BooleanOptionalAction, default=True,
+                      help='Résout les domaines de la liste en avance sur le crawl (default: activé)')
+    parser.add_argument('--preflight', action='store_true', default=False,
+                      help='Écarte les domaines morts (DNS + connexion TCP) avant le crawl')
+    parser.add_argument('--preflight-concurrency', type=int, default=500,
+                      help='Nombre de sondes de pré-vol simultanées (default: 500)')
+    parser.add_argument('--preflight-timeout', type=float, default=3,
+                      help='Timeout DNS et TCP des sondes de pré-vol en secondes (default: 3)')
+    parser.add_argument('--limit', type=int, default=100,
+                      help='Nombre maximum de connexions HTTP simultanées (default: 100)')
+    parser.add_argument('--limit-per-host', type=int, default=4,
+                      help='Nombre maximum de connexions HTTP simultanées par hôte (default: 4)')
+    parser.add_argument('--host-rate', type=float, default=2.0,
+                      help='Requêtes par seconde autorisées par hôte (default: 2)')
+    parser.add_argument('--host-max-in-flight', type=int, default=2,
+                      help='Requêtes simultanées maximum par hôte (default: 2)')
+    parser.add_argument('--ip-rate', type=float, default=8.0,
+                      help='Requêtes par seconde autorisées par adresse IP (default: 8)')
+    parser.add_argument('--ip-max-in-flight', type=int, default=8,
+                      help='Requêtes simultanées maximum par adresse IP (default: 8)')
+    parser.add_argument('--max-page-bytes', type=int, default=2 * 1024 * 1024,
+                      help='Octets lus au maximum par page, au-delà la page est tronquée (default: 2097152)')
+    parser.add_argument('--discovery-bytes', type=int, default=None,
+                      help='Ne lit que les N premiers octets (requête Range) des pages visitées pour leurs liens')
+    parser.add_argument('--extract-workers', type=int, default=None,
+                      help='Processus d\'extraction (default: un par cœur, 0 = extraction sur la boucle asyncio)')
+    parser.add_argument('--parser', choices=sorted(PARSER_BACKENDS), default=DEFAULT_PARSER,
+                      help=f'Backend d\'analyse HTML (default: {DEFAULT_PARSER})')
+    parser.add_argument('--fingerprints', default=None,
+                      help='Fichier d\'empreintes de technologies au format Wappalyzer (default: technologies.json)')
+    parser.add_argument('--emails-only', action='store_true', default=False,
+                      help='N\'extrait que les emails, sur les octets bruts des réponses (pas d\'analyse HTML hors crawl)')
+    parser.add_argument('--full-scan', action='store_true', default=False,
+                      help='Cherche aussi les contacts dans les pages dont les données structurées en fournissent')
     
     # Parse les arguments
     args = parser.parse_args()
@@ -466,7 +641,18 @@ if __name__ == "__main__":
         parser.error("Vous devez spécifier au moins une URL avec --urls ou utiliser --bulk")
     
     # Création et exécution du scraper
-    scraper = ContactScraper()
+    scraper = ContactScraper(limit=args.limit, limit_per_host=args.limit_per_host,
+                             concurrency=args.concurrency, adaptive=args.adaptive,
+                             min_concurrency=args.min_concurrency, max_concurrency=args.max_concurrency,
+                             site_timeout=args.site_timeout, dns_prefetch=args.dns_prefetch, preflight=args.preflight,
+                             preflight_concurrency=args.preflight_concurrency,
+                             preflight_timeout=args.preflight_timeout,
+                             host_rate=args.host_rate, host_max_in_flight=args.host_max_in_flight,
+                             ip_rate=args.ip_rate, ip_max_in_flight=args.ip_max_in_flight,
+                             max_page_bytes=args.max_page_bytes, discovery_bytes=args.discovery_bytes,
+                             parser=args.parser, extract_workers=args.extract_workers,
+                             fingerprints=args.fingerprints, emails_only=args.emails_only,
+                             full_scan=args.full_scan)
     
     async def main():
         # Scraper les URLs
@@ -491,15 +677,27 @@ if __name__ == "__main__":
                     "technologies": result["technologies"],
                     "headers_info": result["headers_info"],
                     "security_headers": result["security_headers"],
-                    "company_info": result["company_info"]
+                    "company_info": result["company_info"],
+                    "partial": result["partial"],
+                    "skipped_pages": result["skipped_pages"],
+                    "failed_pages": result["failed_pages"],
+                    "stats": result["stats"]
                 }
                 final_result["data"].append(domain_result)
         
+        # Statistiques du run (réutilisation des connexions, etc.)
+        final_result["run_stats"] = scraper.run_stats
+        
         # Afficher le résultat formaté dans la console
         print(json.dumps([final_result], indent=2, ensure_ascii=False))
         
         # Sauvegarder les résultats avec DataSaver
         await scraper.save_results([final_result], args.output)
+        
+        # Sauvegarder les domaines écartés par le pré-vol
+        if scraper.dead_sites:
+            dead_path = DataSaver().save_dead_sites(scraper.dead_sites)
+            print(f"Domaines morts sauvegardés dans: {dead_path}")
 
     # Exécuter le scraper
     if sys.platform == 'win32':
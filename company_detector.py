@@ -1,23 +1,48 @@
 import re
-from bs4 import BeautifulSoup
 import json
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple, Union
+from parsed_page import ParsedPage
+from bounded_cache import shared_cache
+from structured_data import StructuredDataExtractor
+
+# Origine des informations d'entreprise : données structurées de la page ou texte
+STRUCTURED = 'structured'
+TEXT = 'text'
+
+SIREN = 'siren'
+SIRET = 'siret'
+TVA = 'tva'
+
+# Libellés qui annoncent un identifiant (le plus proche avant le numéro, à LABEL_DISTANCE caractères
+# au plus : « SIREN : », « RCS Paris B », « TVA intracommunautaire : »)
+COMPANY_LABELS = {'siren': SIREN, 'siret': SIRET, 'rcs': SIREN, 'tva': TVA, 'vat': TVA}
+LABEL_DISTANCE = 30
+
+# Confiance d'un identifiant trouvé dans le texte (un identifiant déclaré dans les données
+# structurées a la confiance maximale)
+STRUCTURED_CONFIDENCE = 1.0
+LABELLED_CONFIDENCE = 0.5
+UNLABELLED_CONFIDENCE = 0.2
+# Le même SIREN confirmé par un autre identifiant (SIRET, TVA dont la clé correspond)
+AGREEMENT_BONUS = 0.3
+# Le même SIREN écrit plusieurs fois
+REPEATED_BONUS = 0.1
 
 class CompanyDetector:
     def __init__(self):
-        # Patterns pour les numéros d'entreprise
-        self.patterns = {
-            'siren': r'\b(?:SIREN|siren|Siren|siret)\s*:?\s*(\d{9})\b',
-            'siret': r'\b(?:SIRET|siret|Siret)\s*:?\s*(\d{14})\b',
-            'tva': r'\b(?:TVA|N°\s*TVA|Numéro\s*TVA|VAT)\s*(?:intra(?:communautaire)?)?(?:n°|num[ée]ro)?\s*:?\s*((?:FR|BE|DE|IT|ES)\s*\d{2}\s*\d{9})\b'
-        }
+        # Un seul parcours du texte : libellés et candidats (SIREN, SIRET, TVA) dans l'ordre du texte.
+        # Les numéros peuvent être écrits par groupes (732 829 320 00074) mais pas coupés au milieu
+        # d'une suite de chiffres plus longue.
+        separator = r'[ .\u00a0]?'
+        self.candidate_pattern = re.compile(
+            r'(?P<label>(?i:\b(?:' + '|'.join(COMPANY_LABELS) + r')\b))'
+            r'|(?P<tva>\b(?:FR|BE|DE|IT|ES)' + separator + r'\d{2}' + (separator + r'\d{3}') * 3 + r'\b)'
+            r'|(?<!\d)(?<!\d[ .\u00a0])(?P<number>\d{3}' + separator + r'\d{3}' + separator + r'\d{3}'
+            r'(?:' + separator + r'\d{5})?)(?!' + separator + r'\d)'
+        )
         
-        # Patterns alternatifs (sans labels)
-        self.alt_patterns = {
-            'siren': r'\b(\d{9})(?!\d)\b',  # Ne pas capturer les 9 premiers chiffres d'un SIRET
-            'siret': r'\b(\d{14})\b',
-            'tva': r'\b((?:FR|BE|DE|IT|ES)\s*\d{2}\s*\d{9})\b'
-        }
+        # Résultats de validation (clé de Luhn), partagés par tous les sites
+        self.validation_cache = shared_cache('company_ids')
 
     def clean_number(self, number: str) -> str:
         """Nettoie un numéro en enlevant les espaces et caractères spéciaux"""
@@ -25,6 +50,9 @@ class CompanyDetector:
 
     def validate_siren(self, siren: str) -> bool:
         """Valide un numéro SIREN"""
+        return self.validation_cache.get_or_compute(('siren', siren), lambda: self._validate_siren(siren))
+
+    def _validate_siren(self, siren: str) -> bool:
         if not siren or not siren.isdigit() or len(siren) != 9:
             return False
         
@@ -41,6 +69,9 @@ class CompanyDetector:
 
     def validate_siret(self, siret: str) -> bool:
         """Valide un numéro SIRET"""
+        return self.validation_cache.get_or_compute(('siret', siret), lambda: self._validate_siret(siret))
+
+    def _validate_siret(self, siret: str) -> bool:
         if not siret or not siret.isdigit() or len(siret) != 14:
             return False
         
@@ -58,6 +89,9 @@ class CompanyDetector:
 
     def validate_tva(self, tva: str) -> bool:
         """Valide un numéro de TVA intracommunautaire"""
+        return self.validation_cache.get_or_compute(('tva', tva), lambda: self._validate_tva(tva))
+
+    def _validate_tva(self, tva: str) -> bool:
         if not tva:
             return False
         
@@ -75,53 +109,213 @@ class CompanyDetector:
         
         return True
 
-    def extract_company_info(self, html_content: str, url: str) -> Dict[str, Optional[str]]:
-        """
-        Extrait les informations d'entreprise (SIREN, SIRET, TVA) d'une page HTML
+    def extract_structured_company_info(self, structured: Dict[str, list], url: str) -> Dict[str, Optional[str]]:
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        Informations d'entreprise déclarées dans les données structurées (vatID, taxID, address)
         
-        # Initialiser le résultat
+        Args:
+            structured: Propriétés lues par StructuredDataExtractor
+            url: URL de la page
+        """
         result = {
             'siren': None,
             'siret': None,
             'tva': None,
-            'source': None
+            'address': StructuredDataExtractor.format_address(structured.get('address')),
+            'source': None,
+            'origin': None,
+            'confidence': None
         }
         
-        # Chercher dans le texte
-        text = soup.get_text()
+        for value in structured.get('vatID', []) + structured.get('taxID', []):
+            if not isinstance(value, str):
+                continue
+            number = self.clean_number(value)
+            if number[:2].isalpha():
+                if not result['tva'] and self.validate_tva(number):
+                    result['tva'] = number
+                    if number.startswith('FR') and not result['siren']:
+                        result['siren'] = number[4:]
+            elif len(number) == 14 and not result['siret'] and self.validate_siret(number):
+                result['siret'] = number
+                result['siren'] = number[:9]
+            elif len(number) == 9 and not result['siren'] and self.validate_siren(number):
+                result['siren'] = number
+        
+        if result['siren'] or result['tva'] or result['address']:
+            result['source'] = url
+            result['origin'] = STRUCTURED
+            result['confidence'] = STRUCTURED_CONFIDENCE
+        return result
+
+    def tva_key_matches(self, tva: str) -> bool:
+        """Vérifie la clé d'un numéro de TVA français (FR + clé + SIREN)"""
+        return (tva.startswith('FR') and tva[2:4].isdigit()
+                and int(tva[2:4]) == (12 + 3 * (int(tva[4:]) % 97)) % 97)
+
+    def scan_candidates(self, text: str) -> List[Tuple[str, str, int, bool]]:
+        """
+        Tous les identifiants candidats du texte, en un seul parcours
+        
+        Returns:
+            Liste (type siren/siret/tva, numéro nettoyé, position, annoncé par un libellé), dans l'ordre du texte
+        """
+        candidates = []
+        label, label_end = None, -LABEL_DISTANCE - 1
+        for match in self.candidate_pattern.finditer(text):
+            if match.lastgroup == 'label':
+                label, label_end = COMPANY_LABELS[match.group().lower()], match.end()
+                continue
             
-        # Chercher SIRET avec les patterns principaux
-        for pattern in [self.patterns['siret'], self.alt_patterns['siret']]:
-            siret_match = re.search(pattern, text)
-            if siret_match:
-                siret = siret_match.group(1)
-                if self.validate_siret(siret):
-                    result['siret'] = siret
-                    result['siren'] = siret[:9]
-                    result['source'] = url
-                    break
-        
-        # Chercher SIREN si pas trouvé via SIRET
-        if not result['siren']:
-            for pattern in [self.patterns['siren'], self.alt_patterns['siren']]:
-                siren_match = re.search(pattern, text)
-                if siren_match:
-                    siren = siren_match.group(1)
-                    if self.validate_siren(siren):
-                        result['siren'] = siren
-                        result['source'] = url
-                        break
-        
-        # Chercher TVA
-        for pattern in [self.patterns['tva'], self.alt_patterns['tva']]:
-            tva_match = re.search(pattern, text)
-            if tva_match:
-                tva = tva_match.group(1)
-                if self.validate_tva(tva):
-                    result['tva'] = tva.replace(" ", "")
-                    result['source'] = url
-                    break
+            number = self.clean_number(match.group())
+            if match.lastgroup == 'tva':
+                kind = TVA
+            else:
+                kind = SIRET if len(number) == 14 else SIREN
+            # Un numéro est annoncé par le libellé le plus proche (SIREN, SIRET ou RCS pour
+            # les numéros, TVA pour les numéros de TVA) ; un libellé n'annonce qu'un numéro
+            labelled = (match.start() - label_end <= LABEL_DISTANCE and label is not None
+                        and (label == TVA) == (kind == TVA))
+            if labelled:
+                label = None
+            candidates.append((kind, number, match.start(), labelled))
+        return candidates
+
+    def validate_candidates(self, candidates: List[Tuple[str, str, int, bool]]) -> Dict[Tuple[str, str], bool]:
+        """Valide (clé de Luhn) chaque numéro distinct une seule fois"""
+        validators = {SIREN: self.validate_siren, SIRET: self.validate_siret, TVA: self.validate_tva}
+        return {(kind, number): validators[kind](number) for kind, number in {(c[0], c[1]) for c in candidates}}
+
+    def rank_candidates(self, candidates: List[Tuple[str, str, int, bool]]) -> Optional[Dict]:
+        """
+        Choisit l'entreprise de la page parmi les candidats valides
+        
+        Les candidats sont regroupés par SIREN (celui d'un SIRET, celui d'une TVA française dont la
+        clé correspond) ; un SIREN annoncé par un libellé passe avant un numéro isolé, puis un SIREN
+        confirmé par un autre identifiant, puis un SIREN dont un identifiant est écrit plusieurs fois.
+        À égalité, le premier du texte l'emporte.
+        
+        Returns:
+            dict siren, siret, tva, confidence (None si aucun candidat n'est valide)
+        """
+        valid = self.validate_candidates(candidates)
+        # SIREN -> indices réunis pour cette entreprise
+        companies: Dict[str, Dict] = {}
+        # TVA valides sans SIREN vérifiable (étrangères, clé française incorrecte) : (sans libellé, position, numéro)
+        other_tvas = []
+        
+        for kind, number, position, labelled in candidates:
+            if not valid[(kind, number)]:
+                continue
+            if kind == TVA and not self.tva_key_matches(number):
+                other_tvas.append((not labelled, position, number))
+                continue
+            siren = number[4:] if kind == TVA else number[:9]
+            company = companies.setdefault(siren, {
+                'labelled': False,
+                'kinds': set(),
+                'identifiers': set(),
+                'repeated': False,
+                'position': position,
+                'siret': None,
+                'siret_labelled': False,
+                'tva': None
+            })
+            company['labelled'] = company['labelled'] or labelled
+            company['kinds'].add(kind)
+            # Le même identifiant écrit une seconde fois (un SIRET et une TVA sont un accord, pas une répétition)
+            company['repeated'] = company['repeated'] or (kind, number) in company['identifiers']
+            company['identifiers'].add((kind, number))
+            # Premier SIRET de l'entreprise, un SIRET annoncé par un libellé passant avant
+            if kind == SIRET and (company['siret'] is None or (labelled and not company['siret_labelled'])):
+                company['siret'], company['siret_labelled'] = number, labelled
+            elif kind == TVA and company['tva'] is None:
+                company['tva'] = number
+        
+        def rank(company: Dict) -> Tuple[bool, bool, bool, int]:
+            return company['labelled'], len(company['kinds']) > 1, company['repeated'], -company['position']
+        
+        def confidence(company: Dict) -> float:
+            score = LABELLED_CONFIDENCE if company['labelled'] else UNLABELLED_CONFIDENCE
+            if len(company['kinds']) > 1:
+                score += AGREEMENT_BONUS
+            if company['repeated']:
+                score += REPEATED_BONUS
+            return round(score, 2)
+        
+        if companies:
+            siren, company = max(companies.items(), key=lambda item: rank(item[1]))
+            return {
+                'siren': siren,
+                'siret': company['siret'],
+                'tva': company['tva'] or (min(other_tvas)[2] if other_tvas else None),
+                'confidence': confidence(company)
+            }
+        if other_tvas:
+            unlabelled, _, tva = min(other_tvas)
+            return {
+                'siren': None,
+                'siret': None,
+                'tva': tva,
+                'confidence': UNLABELLED_CONFIDENCE if unlabelled else LABELLED_CONFIDENCE
+            }
+        return None
+
+    def extract_company_info(self, html_content: Union[ParsedPage, str], url: str,
+                             structured: Optional[Dict[str, list]] = None) -> Dict[str, Optional[str]]:
+        """
+        Extrait les informations d'entreprise (SIREN, SIRET, TVA) d'une page HTML
+        (document déjà analysé ou HTML brut)
+        
+        Les identifiants déclarés dans les données structurées (voir StructuredDataExtractor) sont
+        pris en premier : quand ils donnent le SIREN, le SIRET et la TVA, le texte de la page n'est
+        pas parcouru, et quand ils ne donnent que le SIREN, le texte ne sert qu'à compléter les
+        identifiants de cette entreprise. Sinon tous les candidats du texte sont relevés en un
+        parcours, validés puis classés (voir rank_candidates).
+        """
+        page = ParsedPage.of(html_content, url)
+        
+        # Initialiser le résultat
+        if structured:
+            result = self.extract_structured_company_info(structured, url)
+            if result['siren'] and result['siret'] and result['tva']:
+                return result
+        else:
+            result = {
+                'siren': None,
+                'siret': None,
+                'tva': None,
+                'address': None,
+                'source': None,
+                'origin': None,
+                'confidence': None
+            }
+        
+        # Texte visible, blocs séparés par un saut de ligne (deux cellules voisines ne forment pas un numéro)
+        text = page.text_streams.get(None, ('',))[0]
+        candidates = self.scan_candidates(text)
+        if result['siren']:
+            # SIREN déclaré : seuls le SIRET et la TVA française de la même entreprise sont repris du texte
+            siren = result['siren']
+            candidates = [(kind, number, position, labelled) for kind, number, position, labelled in candidates
+                          if (number.startswith('FR') and number[4:] == siren if kind == TVA
+                              else number[:9] == siren)]
+        best = self.rank_candidates(candidates)
+        if best is None:
+            return result
+        
+        if result['siren']:
+            result['siret'] = result['siret'] or best['siret']
+            result['tva'] = result['tva'] or best['tva']
+            return result
         
+        if best['siren']:
+            result['siren'] = best['siren']
+            result['siret'] = best['siret']
+        if best['tva'] and not result['tva']:
+            result['tva'] = best['tva']
+        result['source'] = url
+        if best['siren'] or not result['origin']:
+            result['origin'] = TEXT
+            result['confidence'] = best['confidence']
         return result
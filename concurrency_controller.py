@@ -0,0 +1,143 @@
+import asyncio
+import time
+import logging
+from typing import Dict, List, Optional
+
+
+class AdaptiveConcurrency:
+    def __init__(self, initial: int = 10, min_window: int = 2, max_window: int = 200,
+                 increase: int = 1, decrease_factor: float = 0.5, error_threshold: float = 0.2,
+                 latency_ratio: float = 2.0, sample_size: int = 10, max_decisions: int = 100):
+        """
+        Contrôleur AIMD du nombre de sites traités simultanément
+
+        La fenêtre augmente de `increase` tant que la latence et le taux d'erreur restent sains,
+        et elle est multipliée par `decrease_factor` quand les timeouts / erreurs de connexion augmentent.
+
+        Args:
+            initial: Fenêtre de départ
+            min_window: Fenêtre minimale
+            max_window: Fenêtre maximale
+            increase: Augmentation additive après un intervalle sain
+            decrease_factor: Facteur de réduction multiplicative après un intervalle dégradé
+            error_threshold: Taux de timeouts / erreurs de connexion toléré sur un intervalle
+            latency_ratio: Dégradation tolérée de la latence moyenne par rapport à la meilleure observée
+            sample_size: Nombre minimum de sites terminés entre deux décisions
+            max_decisions: Nombre de décisions conservées pour les statistiques
+        """
+        self.min_window = max(1, min_window)
+        self.max_window = max(self.min_window, max_window)
+        self.window = min(max(initial, self.min_window), self.max_window)
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.error_threshold = error_threshold
+        self.latency_ratio = latency_ratio
+        self.sample_size = sample_size
+        self.max_decisions = max_decisions
+
+        self.in_flight = 0
+        self.condition = asyncio.Condition()
+        self.start_time = time.monotonic()
+
+        # Échantillons de l'intervalle courant
+        self.latencies: List[float] = []
+        self.failures = 0
+        self.best_latency: Optional[float] = None
+        self.window_limited = False
+
+        self.decisions: List[Dict] = []
+        self.stats = {
+            'increases': 0,
+            'decreases': 0,
+            'peak_window': self.window,
+        }
+
+    @property
+    def adaptive(self) -> bool:
+        return self.min_window != self.max_window
+
+    async def acquire(self):
+        """Attend qu'une place se libère dans la fenêtre"""
+        async with self.condition:
+            while self.in_flight >= self.window:
+                await self.condition.wait()
+            self.in_flight += 1
+            if self.in_flight >= self.window:
+                self.window_limited = True
+
+    async def release(self, latency: Optional[float] = None, ok: bool = True):
+        """
+        Libère une place et enregistre le résultat du site
+
+        Args:
+            latency: Durée de traitement du site (None si aucun site n'a été traité)
+            ok: False si le site a échoué sur un timeout ou une erreur de connexion
+        """
+        async with self.condition:
+            self.in_flight -= 1
+            if latency is not None:
+                self.latencies.append(latency)
+                if not ok:
+                    self.failures += 1
+                if len(self.latencies) >= max(self.sample_size, self.window):
+                    self._adjust()
+            self.condition.notify_all()
+
+    def _adjust(self):
+        """Décision AIMD à la fin d'un intervalle d'observation"""
+        samples = len(self.latencies)
+        error_rate = self.failures / samples
+        mean_latency = sum(self.latencies) / samples
+        if self.best_latency is None or mean_latency < self.best_latency:
+            self.best_latency = mean_latency
+
+        latency_degraded = mean_latency > self.best_latency * self.latency_ratio
+        previous = self.window
+        action = 'hold'
+
+        if error_rate > self.error_threshold or latency_degraded:
+            self.window = max(self.min_window, int(self.window * self.decrease_factor))
+            if self.window < previous:
+                action = 'decrease'
+                self.stats['decreases'] += 1
+        elif self.window_limited:
+            # N'augmenter que si la fenêtre a réellement été saturée pendant l'intervalle
+            self.window = min(self.max_window, self.window + self.increase)
+            if self.window > previous:
+                action = 'increase'
+                self.stats['increases'] += 1
+
+        self.stats['peak_window'] = max(self.stats['peak_window'], self.window)
+        if action != 'hold':
+            logging.info(f"Concurrence {action}: {previous} -> {self.window} "
+                         f"(erreurs {error_rate:.0%}, latence moyenne {mean_latency:.2f}s)")
+            self.decisions.append({
+                'elapsed_seconds': round(time.monotonic() - self.start_time, 2),
+                'action': action,
+                'window': self.window,
+                'error_rate': round(error_rate, 3),
+                'mean_latency': round(mean_latency, 3),
+            })
+            if len(self.decisions) > self.max_decisions:
+                self.decisions.pop(0)
+
+        self.latencies = []
+        self.failures = 0
+        self.window_limited = self.in_flight >= self.window
+
+    def get_stats(self) -> Dict:
+        """
+        Retourne l'état du contrôleur
+
+        Returns:
+            Dict avec la fenêtre courante, ses bornes et l'historique des décisions
+        """
+        stats = dict(self.stats)
+        stats.update({
+            'adaptive': self.adaptive,
+            'window': self.window,
+            'min_window': self.min_window,
+            'max_window': self.max_window,
+            'decisions': list(self.decisions),
+        })
+        return stats
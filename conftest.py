@@ -0,0 +1,2 @@
+# test_save.py est un script (il lit resultats_scraping.json à l'import), pas un test pytest
+collect_ignore = ['test_save.py']
@@ -0,0 +1,84 @@
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+def normalize_contact(value: str) -> str:
+    """Clé d'un contact : emails sans casse, numéros E.164 tels quels"""
+    return value.strip().lower()
+
+
+class ContactList(list):
+    def __init__(self):
+        """
+        Contacts d'un site (emails ou téléphones) au format de sortie : [{value, sources}, ...]
+
+        La liste est indexée par valeur normalisée : fusionner une page coûte O(contacts de la page),
+        quel que soit le nombre de contacts déjà trouvés. Les sources restent uniques et dans
+        l'ordre de découverte, le type de la page où le contact a été vu en premier est gardé dans
+        le contact. Sérialisée en JSON, c'est une liste ordinaire.
+        """
+        super().__init__()
+        # Valeur normalisée -> (contact, sources déjà vues)
+        self.index: Dict[str, Tuple[dict, Set[str]]] = {}
+
+    def add(self, value: str, source: str, page_type: Optional[str] = None,
+            confidence: Optional[float] = None, origin: Optional[str] = None) -> dict:
+        """
+        Ajoute un contact trouvé sur une page (ou une source de plus à un contact connu)
+
+        Args:
+            value: Email ou numéro
+            source: URL de la page
+            page_type: Type de la page (home, contact, legal...), conservé pour la première page
+            confidence: Confiance du contact (la plus haute est gardée)
+            origin: Origine du contact sur la page (structured : données structurées du site)
+
+        Returns:
+            Le contact agrégé
+        """
+        key = normalize_contact(value)
+        entry = self.index.get(key)
+        if entry is None:
+            record = {'value': value}
+            if page_type is not None:
+                record['page_type'] = page_type
+            if confidence is not None:
+                record['confidence'] = confidence
+            if origin is not None:
+                record['origin'] = origin
+            record['sources'] = [source]
+            self.append(record)
+            self.index[key] = (record, {source})
+            return record
+
+        record, sources = entry
+        if source not in sources:
+            sources.add(source)
+            record['sources'].append(source)
+        if confidence is not None and confidence > record.get('confidence', -1):
+            record['confidence'] = confidence
+        if origin is not None and 'origin' not in record:
+            record['origin'] = origin
+        return record
+
+    def merge(self, values: Iterable[str], source: str, page_type: Optional[str] = None,
+              origin: Optional[str] = None):
+        """
+        Fusionne les contacts d'une page
+
+        Args:
+            values: Contacts de la page (liste, ou dict contact -> confiance)
+            source: URL de la page
+            page_type: Type de la page
+            origin: Origine des contacts sur la page
+        """
+        if isinstance(values, dict):
+            for value, confidence in values.items():
+                self.add(value, source, page_type, confidence, origin)
+        else:
+            for value in values:
+                self.add(value, source, page_type, origin=origin)
+
+    def first_page_type(self, value: str) -> Optional[str]:
+        """Type de la page où le contact a été vu en premier"""
+        entry = self.index.get(normalize_contact(value))
+        return entry[0].get('page_type') if entry else None
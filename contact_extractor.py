@@ -1,43 +1,44 @@
 import re
-from bs4 import BeautifulSoup
-import base64
-from html import unescape
 from country_codes import COUNTRY_CODES
-from phone_keywords import PHONE_KEYWORDS, EXCLUDE_PATTERNS
+from phone_keywords import EXCLUDE_PATTERNS, EXCLUDE_KEYWORDS
+from parsed_page import ParsedPage
+from phone_scanner import PhoneScanner
+from phone_normalizer import PhoneNormalizer
+from phone_scorer import PhoneScorer, TEL_LINK_CONFIDENCE
+from email_scanner import EmailScanner
+from bounded_cache import shared_cache
 import logging
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote
+
+# Conteneurs dont le texte est parcouru pour les téléphones (None : texte visible)
+CONTACT_TEXT_KINDS = (None, 'script')
 
 class ContactExtractor:
     def __init__(self):
-        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+        # Emails lus sur les octets bruts (Cloudflare, entités, [at], mailto: encodés)
+        self.email_scanner = EmailScanner()
         
         # Utiliser la liste complète des codes pays
         self.country_codes = COUNTRY_CODES
         
-        # Construire le pattern de contexte avec tous les mots-clés
-        self.phone_context_before = r'(?:(?:^|[^\w])|(?:' + '|'.join(PHONE_KEYWORDS) + r')[: .-]*)?'
-        self.phone_context_after = r'(?:$|[^\d])'
-        
         # Patterns à exclure (compilés)
         self.exclude_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in EXCLUDE_PATTERNS]
         
-        # Construction et compilation des patterns de téléphone
-        phone_patterns = [
-            # Format français avec contexte (plus permissif)
-            rf"{self.phone_context_before}(?:(?:(?:\+|00)?33|0)\s*[1-9](?:[\s.-]*\d{{2}}){{4}}){self.phone_context_after}",
-            
-            # Format nord-américain avec contexte (plus permissif)
-            rf"{self.phone_context_before}(?:\+?1[-. ]?)?\(?[2-9][0-9]{{2}}\)?[-. ]?[0-9]{{3}}[-. ]?[0-9]{{4}}{self.phone_context_after}",
-            
-            # Format international avec contexte (plus permissif)
-            rf"{self.phone_context_before}(?:\+|00)?(?:{'|'.join(code for code, _ in self.country_codes.values())})\s*[1-9][0-9]{{7,14}}{self.phone_context_after}",
-            
-            # Format générique pour les numéros sans indicatif
-            rf"{self.phone_context_before}0[1-9](?:[\s.-]*\d{{2}}){{4}}{self.phone_context_after}",
-        ]
-        self.phone_patterns = [re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in phone_patterns]
+        # Mots suspects autour d'un numéro (liste construite une seule fois)
+        self.exclude_keywords = tuple(EXCLUDE_KEYWORDS)
+        
+        # Recherche des numéros : séquences de chiffres d'abord, formats ensuite (coût linéaire)
+        self.phone_scanner = PhoneScanner()
         
-        # Cache pour les numéros déjà nettoyés
-        self.clean_number_cache = {}
+        # Normalisation E.164 (arbre des indicatifs, longueurs et préfixes locaux par pays)
+        self.phone_normalizer = PhoneNormalizer(self.country_codes)
+        
+        # Confiance des numéros d'après les mots-clés et les mots d'exclusion voisins
+        self.phone_scorer = PhoneScorer()
+        
+        # Cache borné des numéros déjà nettoyés, partagé par tous les sites (le pays fait partie de la clé)
+        self.clean_number_cache = shared_cache('phones')
 
     def is_excluded_pattern(self, text: str) -> bool:
         """
@@ -51,165 +52,154 @@ class ContactExtractor:
             
         # Vérifier le contexte immédiat (5 caractères avant et après)
         context = text[-5:] + text[:5]
-        suspicious_patterns = [
-            r'id',
-            r'version',
-            r'timestamp',
-            r'date',
-            r'time',
-            r'size',
-            r'width',
-            r'height',
-            r'index',
-            r'item',
-            r'row',
-            r'col'
-        ]
-        
-        if any(pattern in context.lower() for pattern in suspicious_patterns):
+        if any(keyword in context for keyword in self.exclude_keywords):
             return True
             
         return False
 
-    def clean_phone_number(self, phone: str) -> str:
-        """Nettoie et normalise un numéro de téléphone avec cache"""
-        if phone in self.clean_number_cache:
-            return self.clean_number_cache[phone]
-            
+    def clean_phone_number(self, phone: str, country: str = None) -> str:
+        """
+        Nettoie et normalise un numéro de téléphone au format E.164 avec cache
+        
+        Args:
+            phone: Numéro brut trouvé dans la page
+            country: Pays des numéros sans indicatif (déduit du domaine du site, défaut : France)
+        """
+        return self.clean_number_cache.get_or_compute(
+            (phone, country), lambda: self._clean_phone_number(phone, country)
+        )
+
+    def _clean_phone_number(self, phone: str, country: str) -> str:
         try:
             if self.is_excluded_pattern(phone):
-                self.clean_number_cache[phone] = None
-                return None
-                
-            # Supprimer tous les caractères non numériques sauf + au début
-            cleaned = re.sub(r'[^\d+]', '', phone)
-            
-            # Traitement rapide des cas communs
-            if not cleaned or len(cleaned) < 8:
-                self.clean_number_cache[phone] = None
                 return None
                 
-            result = None
-            # Format français
-            if cleaned.startswith('0') and len(cleaned) == 10:
-                if cleaned[1] in '12345678':
-                    result = f"+33{cleaned[1:]}"
-            # Format international
-            elif cleaned.startswith('+'):
-                if 10 <= len(cleaned) <= 15:
-                    result = cleaned
-            # Format avec 00
-            elif cleaned.startswith('00'):
-                if 11 <= len(cleaned) <= 15:
-                    result = f"+{cleaned[2:]}"
-            
-            self.clean_number_cache[phone] = result
-            return result
+            return self.phone_normalizer.normalize(phone, country)
             
         except Exception as e:
             logging.error(f"Erreur lors du nettoyage du numéro {phone}: {str(e)}")
-            self.clean_number_cache[phone] = None
             return None
 
-    def is_valid_phone(self, phone: str) -> bool:
+    def scan_phones(self, text: str, country: str, phones: Dict[str, float],
+                    nearest: Optional[Callable[[int], Optional[list]]] = None):
         """
-        Vérifie si un numéro de téléphone est valide
+        Ajoute à `phones` les numéros du texte avec leur confiance (la plus haute si déjà trouvé)
+        
+        Les mots-clés du texte ne sont recherchés qu'une fois, au premier numéro trouvé.
+        
+        Args:
+            text: Texte à parcourir
+            country: Pays des numéros sans indicatif
+            phones: Numéro -> confiance, complété sur place
+            nearest: Élément le plus proche d'une position du texte (un numéro affiché dans un
+                     lien tel: a la confiance d'un lien tel:)
         """
-        try:
-            if not phone or self.is_excluded_pattern(phone):
-                return False
-                
-            # Le numéro doit être au format international maintenant
-            if not phone.startswith('+'):
-                return False
-                
-            # Supprimer les espaces pour la vérification
-            cleaned = phone.replace(' ', '')
-            
-            # Vérifier la longueur (entre 8 et 15 chiffres pour les formats internationaux)
-            if not (8 <= len(cleaned) <= 15):
-                return False
-                
-            # Vérifier que le numéro ne contient que des chiffres après le +
-            if not cleaned[1:].isdigit():
-                return False
-                
-            return True
+        index = None
+        for phone, start, end in self.phone_scanner.scan(
+                text, lambda raw: self.clean_phone_number(raw, country)):
+            if index is None:
+                index = self.phone_scorer.index(text)
+            confidence = self.phone_scorer.score(index, text[start:end], start, end)
+            if nearest is not None:
+                element = nearest(start)
+                if element is not None and element[0] == 'a' and element[1].get('href', '').startswith('tel:'):
+                    confidence = TEL_LINK_CONFIDENCE
+            if confidence > phones.get(phone, -1):
+                phones[phone] = confidence
+
+    def extract_emails(self, body: Union[bytes, str]) -> Dict[str, str]:
+        """
+        Extrait les emails d'une réponse sans l'analyser (chemin rapide quand seuls les emails comptent)
+        
+        Args:
+            body: Octets bruts de la réponse (ou HTML déjà décodé)
             
+        Returns:
+            Dict adresse en minuscules -> forme sous laquelle elle est écrite (plain, cloudflare...)
+        """
+        try:
+            return self.email_scanner.scan(body)
         except Exception as e:
-            logging.error(f"Erreur lors de la validation du numéro {phone}: {str(e)}")
-            return False
+            logging.error(f"Erreur lors de l'extraction des emails: {str(e)}")
+            return {}
 
-    def extract_phones(self, soup: BeautifulSoup) -> set:
-        """Extrait les numéros de téléphone d'une page web (optimisé)"""
-        phones = set()
-        try:
-            # Extraction du texte visible uniquement des balises pertinentes
-            text_blocks = []
-            for tag in soup.find_all(['p', 'div', 'span', 'a', 'li', 'td']):
-                if tag.string:
-                    text_blocks.append(tag.string)
-                elif tag.name == 'a' and tag.get('href', '').startswith('tel:'):
-                    phone = tag['href'].replace('tel:', '').strip()
-                    cleaned = self.clean_phone_number(phone)
-                    if cleaned:
-                        phones.add(cleaned)
-            
-            # Traitement du texte en un seul bloc
-            text_content = ' '.join(text_blocks)
-            
-            # Recherche des numéros avec les patterns compilés
-            for pattern in self.phone_patterns:
-                for match in pattern.finditer(text_content):
-                    phone = match.group().strip()
-                    cleaned = self.clean_phone_number(phone)
-                    if cleaned:
-                        phones.add(cleaned)
+    def extract_structured_contacts(self, structured: Dict[str, list], url: str) -> Tuple[List[str], Dict[str, float]]:
+        """
+        Emails et numéros déclarés dans les données structurées de la page (telephone, email)
+        
+        Args:
+            structured: Propriétés lues par StructuredDataExtractor
+            url: URL de la page (pays des numéros sans indicatif)
             
-        except Exception as e:
-            logging.error(f"Erreur lors de l'extraction des numéros de téléphone: {str(e)}")
+        Returns:
+            tuple: (liste des emails, dict numéro -> confiance), les numéros publiés par le site
+                   ayant la confiance d'un lien tel:
+        """
+        emails, phones = [], {}
+        for value in structured.get('email', []):
+            if isinstance(value, str):
+                email = self.email_scanner.validate(unquote(value.strip().lower().replace('mailto:', '', 1)))
+                if email and email not in emails:
+                    emails.append(email)
         
-        return phones
+        # Numéros déclarés comme tels : normalisés sans les exclusions propres au texte libre
+        country = self.phone_normalizer.country_for_url(url)
+        for value in structured.get('telephone', []):
+            if isinstance(value, str):
+                phone = self.phone_normalizer.normalize(value.strip().replace('tel:', '', 1), country)
+                if phone:
+                    phones[phone] = TEL_LINK_CONFIDENCE
+        return emails, phones
 
-    def extract_contacts(self, soup: BeautifulSoup):
+    def extract_contacts(self, page: ParsedPage, body: Optional[bytes] = None,
+                         structured: Optional[Tuple[List[str], Dict[str, float]]] = None,
+                         full_scan: bool = False):
         """
         Extrait les emails et numéros de téléphone d'une page
+        
+        Args:
+            page: Document déjà analysé (partagé avec les autres extracteurs)
+            body: Octets bruts de la réponse, lus pour les emails (défaut : HTML de la page)
+            structured: Contacts déjà lus dans les données structurées (voir extract_structured_contacts) :
+                        les emails ou les numéros qu'elles fournissent ne sont pas recherchés dans la page
+            full_scan: Recherche quand même les emails et les numéros dans la page (ils s'ajoutent
+                       à ceux des données structurées)
+            
+        Returns:
+            tuple: (liste des emails, dict numéro -> confiance de 0 à 1)
         """
         logging.info("Début de l'extraction des contacts")
         try:
             emails = set()
-            phones = set()
-            
-            # Extraction du texte visible
-            text_content = ' '.join([text for text in soup.stripped_strings])
-            logging.debug(f"Texte visible extrait: {text_content[:200]}...")
-            
-            # Extraction des emails
-            emails.update(self.email_pattern.findall(text_content))
-            emails.update(self.email_pattern.findall(str(soup)))
-            
-            # Recherche spécifique dans les balises qui contiennent souvent des contacts
-            for tag in soup.find_all(['a', 'div', 'span', 'p', 'script', 'meta']):
-                # Vérifier le contenu de la balise
-                tag_text = tag.get_text()
-                if tag_text:
-                    # Recherche d'emails
-                    found_emails = self.email_pattern.findall(tag_text)
-                    emails.update(found_emails)
-                    
-                    # Recherche de téléphones
-                    for pattern in self.phone_patterns:
-                        found_phones = pattern.findall(tag_text)
-                        for phone in found_phones:
-                            cleaned = self.clean_phone_number(phone)
-                            if cleaned:
-                                phones.add(cleaned)
+            phones = {}
+            structured_emails, structured_phones = structured or ([], {})
+            
+            # Emails : une passe sur les octets bruts, indépendante de l'analyse HTML
+            emails.update(structured_emails)
+            if not structured_emails or full_scan:
+                emails.update(self.extract_emails(page.html if body is None else body))
+            
+            # Téléphones : texte visible et scripts
+            if not structured_phones or full_scan:
+                # Pays des numéros sans indicatif (domaine du site, France par défaut)
+                country = self.phone_normalizer.country_for_url(page.url)
+                
+                # Texte du document en un seul parcours (chaque nœud texte lu une fois, quelle que
+                # soit la profondeur d'imbrication), par conteneur : texte visible, scripts, styles...
+                streams = page.text_streams
+                logging.debug(f"Texte visible extrait: {streams.get(None, ('',))[0][:200]}...")
+                
+                for kind in CONTACT_TEXT_KINDS:
+                    if kind in streams:
+                        self.scan_phones(streams[kind][0], country, phones,
+                                         lambda position, kind=kind: page.element_at(kind, position))
+            phones.update(structured_phones)
             
             logging.info(f"Emails trouvés: {emails}")
             logging.info(f"Téléphones trouvés: {phones}")
             
-            return list(emails), list(phones)
+            return list(emails), phones
             
         except Exception as e:
             logging.error(f"Erreur lors de l'extraction des contacts: {str(e)}", exc_info=True)
-            return [], []
+            return [], {}
@@ -196,3 +196,88 @@ COUNTRY_CODES = {
     'ZM': ('260', '0'),    # Zambie
     'ZW': ('263', '0'),    # Zimbabwe
 }
+
+"""
+Longueur du numéro national (sans indicatif ni préfixe local) : (minimum, maximum)
+Les pays absents utilisent DEFAULT_NATIONAL_LENGTH, dans la limite E.164 de 15 chiffres
+"""
+
+NATIONAL_NUMBER_LENGTHS = {
+    # Plan de numérotation nord-américain (indicatif 1)
+    'US': (10, 10), 'CA': (10, 10), 'DO': (10, 10), 'JM': (10, 10), 'TT': (10, 10),
+    # Europe
+    'FR': (9, 9),     # France
+    'MC': (8, 9),     # Monaco
+    'BE': (8, 9),     # Belgique
+    'LU': (4, 11),    # Luxembourg
+    'CH': (9, 9),     # Suisse
+    'DE': (6, 13),    # Allemagne
+    'AT': (4, 13),    # Autriche
+    'GB': (9, 10),    # Royaume-Uni
+    'IE': (7, 9),     # Irlande
+    'ES': (9, 9),     # Espagne
+    'PT': (9, 9),     # Portugal
+    'IT': (6, 11),    # Italie
+    'VA': (6, 11),    # Vatican
+    'NL': (9, 9),     # Pays-Bas
+    'DK': (8, 8),     # Danemark
+    'NO': (8, 8),     # Norvège
+    'SE': (7, 13),    # Suède
+    'FI': (5, 12),    # Finlande
+    'PL': (9, 9),     # Pologne
+    'CZ': (9, 9),     # République tchèque
+    'SK': (9, 9),     # Slovaquie
+    'HU': (8, 9),     # Hongrie
+    'RO': (9, 9),     # Roumanie
+    'BG': (8, 9),     # Bulgarie
+    'GR': (10, 10),   # Grèce
+    'HR': (8, 9),     # Croatie
+    'SI': (8, 8),     # Slovénie
+    'RS': (8, 9),     # Serbie
+    'UA': (9, 9),     # Ukraine
+    'RU': (10, 10),   # Russie
+    'KZ': (10, 10),   # Kazakhstan
+    'TR': (10, 10),   # Turquie
+    # Afrique et Moyen-Orient
+    'MA': (9, 9),     # Maroc
+    'DZ': (8, 9),     # Algérie
+    'TN': (8, 8),     # Tunisie
+    'SN': (9, 9),     # Sénégal
+    'CI': (10, 10),   # Côte d'Ivoire
+    'CM': (9, 9),     # Cameroun
+    'EG': (8, 10),    # Égypte
+    'NG': (8, 10),    # Nigeria
+    'KE': (9, 9),     # Kenya
+    'ZA': (9, 9),     # Afrique du Sud
+    'IL': (8, 9),     # Israël
+    'AE': (8, 9),     # Émirats arabes unis
+    'SA': (9, 9),     # Arabie saoudite
+    # Asie et Océanie
+    'IN': (10, 10),   # Inde
+    'PK': (9, 10),    # Pakistan
+    'CN': (9, 11),    # Chine
+    'HK': (8, 8),     # Hong Kong
+    'TW': (8, 9),     # Taïwan
+    'JP': (9, 10),    # Japon
+    'KR': (8, 10),    # Corée du Sud
+    'SG': (8, 8),     # Singapour
+    'MY': (8, 10),    # Malaisie
+    'TH': (8, 9),     # Thaïlande
+    'VN': (9, 10),    # Vietnam
+    'PH': (8, 10),    # Philippines
+    'ID': (8, 12),    # Indonésie
+    'AU': (9, 9),     # Australie
+    'NZ': (8, 10),    # Nouvelle-Zélande
+    # Amérique latine
+    'MX': (10, 10),   # Mexique
+    'BR': (10, 11),   # Brésil
+    'AR': (10, 10),   # Argentine
+    'CL': (9, 9),     # Chili
+    'CO': (8, 10),    # Colombie
+    'PE': (8, 9),     # Pérou
+}
+
+DEFAULT_NATIONAL_LENGTH = (6, 12)
+
+# Indicatifs dont le préfixe local est facultatif en numérotation nationale (555 123 4567 = 1 555 123 4567)
+OPTIONAL_TRUNK_CODES = {'1'}
@@ -70,6 +70,22 @@ class DataSaver:
         
         return csv_path
     
+    def save_dead_sites(self, dead_sites: List[Dict[str, Any]], filename: str = None) -> str:
+        """
+        Sauvegarde les domaines écartés par le pré-vol avec la raison de leur exclusion
+        
+        Args:
+            dead_sites: Résultats des sondes des sites morts
+            filename: Nom du fichier (optionnel)
+            
+        Returns:
+            str: Chemin du fichier sauvegardé
+        """
+        if filename is None:
+            filename = self._generate_filename("dead_domains", "json")
+        
+        return self.save_json(dead_sites, filename)
+    
     def save_all(self, data: List[Dict[str, Any]], json_filename: str = None, csv_filename: str = None) -> tuple[str, str]:
         """
         Sauvegarde les données en JSON et CSV
@@ -0,0 +1,21 @@
+import time
+
+
+class Deadline:
+    def __init__(self, seconds: float):
+        """
+        Budget de temps d'un site, transmis à chaque requête
+
+        Args:
+            seconds: Durée totale allouée (secondes)
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Temps restant en secondes (0 si le budget est épuisé)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
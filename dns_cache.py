@@ -0,0 +1,179 @@
+import asyncio
+import socket
+import time
+import ipaddress
+import logging
+from typing import Dict, Iterable, List, Optional
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import DefaultResolver
+
+
+class DnsCache(AbstractResolver):
+    def __init__(self, ttl: float = 300, negative_ttl: float = 60, timeout: float = 5,
+                 resolver: Optional[AbstractResolver] = None):
+        """
+        Cache DNS asynchrone partagé par toutes les connexions du run
+
+        Args:
+            ttl: Durée de validité d'une résolution réussie (secondes)
+            negative_ttl: Durée de validité d'un échec de résolution (secondes)
+            timeout: Timeout d'une résolution (secondes)
+            resolver: Résolveur sous-jacent (aiodns si installé, sinon getaddrinfo dans un thread)
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.resolver = resolver or DefaultResolver()
+
+        # (hôte, famille) -> (expiration, adresses ou exception)
+        self.cache: Dict[tuple, tuple] = {}
+        # Résolutions en cours, partagées entre les demandeurs
+        self.pending: Dict[tuple, asyncio.Task] = {}
+        # Hôte -> durée de la dernière résolution réelle (secondes)
+        self.timings: Dict[str, float] = {}
+        self.prefetched = set()
+
+        self.stats = {
+            'lookups': 0,
+            'hits': 0,
+            'negative_hits': 0,
+            'misses': 0,
+            'failures': 0,
+            'prefetched': 0,
+            'resolve_seconds': 0.0,
+        }
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET,
+                      timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Résout un hôte en passant par le cache (interface aiohttp)
+
+        Args:
+            host: Hôte à résoudre
+            port: Port recopié dans les adresses retournées
+            family: Famille d'adresses (AF_INET, AF_INET6, AF_UNSPEC)
+            timeout: Attente maximum de ce demandeur (secondes), sans interrompre la résolution
+                     partagée qui reste bornée par le timeout du cache (asyncio.TimeoutError)
+        """
+        self.stats['lookups'] += 1
+        key = (host, family)
+
+        entry = self.cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            result = entry[1]
+            if isinstance(result, Exception):
+                self.stats['negative_hits'] += 1
+                raise socket.gaierror(*result.args)
+            self.stats['hits'] += 1
+            return self._with_port(result, port)
+
+        # Une seule résolution réelle par hôte, même avec plusieurs demandeurs simultanés. Elle
+        # appartient au cache : un demandeur annulé (deadline du site, timeout du pré-vol) cesse
+        # seulement d'attendre, les autres reçoivent le résultat
+        task = self.pending.get(key)
+        if task is not None:
+            self.stats['hits'] += 1
+        else:
+            self.stats['misses'] += 1
+            task = asyncio.ensure_future(self._lookup(host, family))
+            self.pending[key] = task
+
+            def forget(done: asyncio.Task):
+                if self.pending.get(key) is done:
+                    del self.pending[key]
+            task.add_done_callback(forget)
+
+        if timeout is None:
+            result = await asyncio.shield(task)
+        else:
+            result = await asyncio.wait_for(asyncio.shield(task), timeout)
+
+        if isinstance(result, Exception):
+            raise socket.gaierror(*result.args)
+        return self._with_port(result, port)
+
+    async def _lookup(self, host: str, family: int):
+        """Résolution réelle, mémorisée avec son TTL (positif ou négatif)"""
+        start = time.monotonic()
+        try:
+            addresses = await asyncio.wait_for(self.resolver.resolve(host, 0, family), self.timeout)
+            result, ttl = addresses, self.ttl
+        except asyncio.TimeoutError:
+            result, ttl = socket.gaierror(socket.EAI_AGAIN, f"Timeout DNS pour {host}"), self.negative_ttl
+        except OSError as e:
+            result, ttl = socket.gaierror(*e.args), self.negative_ttl
+
+        elapsed = time.monotonic() - start
+        self.timings[host] = elapsed
+        self.stats['resolve_seconds'] += elapsed
+        if isinstance(result, Exception):
+            self.stats['failures'] += 1
+
+        self.cache[(host, family)] = (time.monotonic() + ttl, result)
+        return result
+
+    def _with_port(self, addresses: List[Dict], port: int) -> List[Dict]:
+        return [dict(address, port=port) for address in addresses]
+
+    def cached_ip(self, host: str, family: int = socket.AF_UNSPEC) -> Optional[str]:
+        """Retourne la première adresse IP en cache pour un hôte (sans résolution)"""
+        entry = self.cache.get((host, family))
+        if entry and not isinstance(entry[1], Exception) and entry[1]:
+            return entry[1][0]['host']
+        return None
+
+    def get_timing(self, host: str) -> Optional[float]:
+        """Durée de la résolution de l'hôte en millisecondes (None si jamais résolu)"""
+        elapsed = self.timings.get(host)
+        return round(elapsed * 1000, 1) if elapsed is not None else None
+
+    async def prefetch(self, hosts: Iterable[str], concurrency: int = 100):
+        """
+        Résout à l'avance une liste d'hôtes (dans l'ordre) pour que les fetchers ne bloquent pas sur le DNS
+
+        Args:
+            hosts: Hôtes à résoudre
+            concurrency: Nombre de résolutions simultanées
+        """
+        # Même famille que le TCPConnector d'aiohttp (AF_UNSPEC) pour partager les entrées du cache
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def prefetch_host(host: str):
+            async with semaphore:
+                try:
+                    await self.resolve(host, 0, socket.AF_UNSPEC)
+                except Exception as e:
+                    # L'échec est déjà en cache (négatif) ou sera retenté par le fetcher
+                    logging.debug(f"Préchargement DNS de {host} : {e!r}")
+                self.prefetched.add(host)
+                self.stats['prefetched'] += 1
+
+        # Les adresses IP littérales ne passent pas par le résolveur
+        unique_hosts = [host for host in dict.fromkeys(host for host in hosts if host) if not self.is_ip(host)]
+        await asyncio.gather(*(prefetch_host(host) for host in unique_hosts))
+        logging.info(f"Préchargement DNS terminé : {len(unique_hosts)} hôtes")
+
+    @staticmethod
+    def is_ip(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host)
+            return True
+        except ValueError:
+            return False
+
+    async def close(self):
+        for task in list(self.pending.values()):
+            task.cancel()
+        await self.resolver.close()
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Retourne les compteurs du cache DNS
+
+        Returns:
+            Dict avec les succès / échecs du cache et le temps cumulé de résolution
+        """
+        stats = dict(self.stats)
+        stats['resolve_seconds'] = round(stats['resolve_seconds'], 2)
+        stats['cached_hosts'] = len(self.cache)
+        return stats
@@ -0,0 +1,165 @@
+import re
+from html import unescape
+from typing import Dict, List, Optional, Tuple, Union
+
+# Octets lus au maximum de part et d'autre du @ (64 caractères de partie locale, 255 de domaine,
+# chacun pouvant être écrit sous forme d'entité &#xHH;)
+MAX_LOCAL_BYTES = 64 * 6
+MAX_DOMAIN_BYTES = 255 * 6
+
+# Extensions de fichiers prises à tort pour un domaine (logo@2x.png)
+FILE_EXTENSIONS = frozenset(['png', 'jpg', 'jpeg', 'gif', 'svg', 'webp', 'avif', 'ico', 'css', 'js'])
+
+# Forme sous laquelle l'adresse a été trouvée
+PLAIN = 'plain'
+CLOUDFLARE = 'cloudflare'
+ENTITIES = 'entities'
+URL_ENCODED = 'url_encoded'
+SPELLED = 'spelled'
+
+
+class EmailScanner:
+    def __init__(self):
+        """
+        Recherche des emails dans les octets bruts de la réponse, sans décodage ni analyse HTML
+
+        Le texte n'est parcouru qu'une fois : chaque @ (ou son écriture masquée : &#64;, %40,
+        [at], (arobase)...) sert d'ancre, la partie locale est lue à rebours et le domaine en avant,
+        sur une fenêtre bornée. Seuls les candidats sont décodés (entités HTML, encodage URL,
+        [dot]) puis validés. Les adresses protégées par Cloudflare (data-cfemail,
+        /cdn-cgi/l/email-protection#...) sont déchiffrées.
+
+        Les octets ASCII d'une adresse sont les mêmes en UTF-8, Latin-1 ou Windows-1252 : le charset
+        de la page n'a pas besoin d'être connu.
+        """
+        self.at_pattern = re.compile(rb'@|&#0*64;|&#x0*40;|&commat;|%40|[\[({]\s{0,3}(?:at|arobase)\s{0,3}[\])}]',
+                                     re.IGNORECASE)
+
+        # Partie locale lue à rebours (octets inversés : l'entité &#99; s'y lit ;99#&)
+        self.reversed_local_pattern = re.compile(rb'(?:[A-Za-z0-9._%+-]|;\d{2,3}#&|;[0-9a-fA-F]{2}x#&)+')
+
+        label = rb'(?:[A-Za-z0-9-]|&#\d{2,3};|&#x[0-9a-fA-F]{2};|%[0-9a-fA-F]{2})+'
+        dot = rb'(?:\.|&period;|\s{0,3}[\[({]\s{0,3}(?:dot|point)\s{0,3}[\])}]\s{0,3})'
+        self.domain_pattern = re.compile(label + rb'(?:' + dot + label + rb')*', re.IGNORECASE)
+
+        self.cloudflare_pattern = re.compile(
+            rb'(?:data-cfemail=["\']?|/cdn-cgi/l/email-protection#)([0-9a-fA-F]{2}(?:[0-9a-fA-F]{2})+)'
+        )
+        # Unités d'écriture d'un candidat, chacune décodée en un caractère
+        self.unit_pattern = re.compile(rb'&#\d{2,3};|&#x[0-9a-fA-F]{2};|&period;|%[0-9a-fA-F]{2}|'
+                                       rb'\s{0,3}[\[({]\s{0,3}(?:dot|point)\s{0,3}[\])}]\s{0,3}|.',
+                                       re.IGNORECASE | re.DOTALL)
+        # Plus long préfixe du domaine décodé qui reste un domaine (contact@acme.fr&#160; -> acme.fr)
+        self.domain_prefix_pattern = re.compile(r'[a-z0-9-]+(?:\.[a-z0-9-]+)*\.[a-z]{2,}(?![a-z0-9-])')
+        self.email_pattern = re.compile(r'[a-z0-9._%+-]+@[a-z0-9-]+(?:\.[a-z0-9-]+)*\.([a-z]{2,})')
+
+    def scan(self, data: Union[bytes, str]) -> Dict[str, str]:
+        """
+        Emails du document
+
+        Args:
+            data: Octets bruts de la réponse (un texte déjà décodé est encodé en UTF-8)
+
+        Returns:
+            Dict adresse en minuscules -> forme sous laquelle elle a été trouvée
+            (plain, cloudflare, entities, url_encoded, spelled)
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8', 'replace')
+        emails = {}
+
+        for anchor in self.at_pattern.finditer(data):
+            spelled = anchor.group()[:1] in b'[({'
+            start, end = anchor.start(), anchor.end()
+            if spelled:
+                # « contact [at] site [dot] fr » : espaces autour de l'ancre
+                while start > 0 and data[start - 1:start].isspace() and anchor.start() - start < 3:
+                    start -= 1
+                while data[end:end + 1].isspace() and end - anchor.end() < 3:
+                    end += 1
+
+            window = data[max(0, start - MAX_LOCAL_BYTES):start][::-1]
+            local = self.reversed_local_pattern.match(window)
+            domain = self.domain_pattern.match(data, end, end + MAX_DOMAIN_BYTES)
+            if not local or not domain:
+                continue
+
+            decoded = self.decode(local.group()[::-1], domain.group())
+            if decoded is None:
+                continue
+            email, raw_local, raw_domain = decoded
+            if email not in emails:
+                emails[email] = self.kind(raw_local + anchor.group() + raw_domain)
+
+        for match in self.cloudflare_pattern.finditer(data):
+            email = self.decode_cloudflare(match.group(1))
+            if email and email not in emails:
+                emails[email] = CLOUDFLARE
+
+        return emails
+
+    def decode(self, local: bytes, domain: bytes) -> Optional[Tuple[str, bytes, bytes]]:
+        """
+        Décode un candidat (entités, encodage URL, [dot]) et le ramène à une adresse valide
+
+        Les espaces et la ponctuation en tête de la partie locale sont retirés (mailto:%20contact@...),
+        le domaine est coupé à son plus long préfixe valide (acme.fr%20, acme.fr&#46;, acme.fr%3Fsubject=...).
+
+        Args:
+            local: Octets de la partie locale
+            domain: Octets du domaine
+
+        Returns:
+            Tuple (adresse en minuscules, octets de la partie locale gardés, octets du domaine gardés),
+            None si le candidat n'est pas une adresse
+        """
+        local_units = self.units(local)
+        while local_units and (local_units[0][0].isspace() or local_units[0][0] in '.-+_%'):
+            del local_units[0]
+        domain_units = self.units(domain)
+        prefix = self.domain_prefix_pattern.match(''.join(char for char, _ in domain_units).lower())
+        if not prefix:
+            return None
+        domain_units = domain_units[:prefix.end()]
+
+        email = self.validate(''.join(char for char, _ in local_units).lower() + '@' + prefix.group())
+        if email is None:
+            return None
+        return email, b''.join(raw for _, raw in local_units), b''.join(raw for _, raw in domain_units)
+
+    def units(self, raw: bytes) -> List[Tuple[str, bytes]]:
+        """Découpe des octets en unités d'écriture (caractère, entité, %XX, [dot]) avec leur caractère décodé"""
+        units = []
+        for unit in self.unit_pattern.findall(raw):
+            if len(unit) == 1:
+                char = unit.decode('latin-1')
+            elif unit[:1] == b'%':
+                char = chr(int(unit[1:], 16))
+            elif unit[:1] == b'&':
+                char = unescape(unit.decode('ascii'))
+            else:
+                char = '.'
+            units.append((char, unit))
+        return units
+
+    def decode_cloudflare(self, hex_digits: bytes) -> Optional[str]:
+        """Déchiffre une adresse protégée par Cloudflare (premier octet : clé XOR des suivants)"""
+        data = bytes.fromhex(hex_digits.decode('ascii'))
+        key = data[0]
+        return self.validate(bytes(byte ^ key for byte in data[1:]).decode('latin-1').lower())
+
+    def validate(self, email: str) -> Optional[str]:
+        match = self.email_pattern.fullmatch(email)
+        if not match or match.group(1) in FILE_EXTENSIONS:
+            return None
+        return email
+
+    def kind(self, raw: bytes) -> str:
+        """Forme sous laquelle l'adresse est écrite dans la page"""
+        if any(bracket in raw for bracket in (b'[', b'(', b'{')):
+            return SPELLED
+        if b'&' in raw:
+            return ENTITIES
+        if b'%' in raw:
+            return URL_ENCODED
+        return PLAIN
@@ -0,0 +1,299 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+from deadline import Deadline
+from parsed_page import ParsedPage
+from contact_extractor import ContactExtractor
+from social_media_extractor import SocialMediaExtractor
+from tech_detector import TechnologyDetector
+from company_detector import CompanyDetector, STRUCTURED
+from structured_data import StructuredDataExtractor
+from bounded_cache import shared_cache_stats, merge_cache_stats
+
+# Délai accordé à l'extraction au-delà du budget du site (secondes) : les pages déjà téléchargées
+# sont analysées si le pool le permet, bien avant le filet de sécurité du scheduler (budget + 5 s)
+EXTRACTION_GRACE = 2.0
+
+
+class PageAnalyzer:
+    def __init__(self, parser: Optional[str] = None, fingerprints: Optional[str] = None,
+                 emails_only: bool = False, full_scan: bool = False):
+        """
+        Extracteurs d'une page, construits une seule fois (patterns compilés, caches)
+
+        Args:
+            parser: Backend d'analyse HTML (bs4, lxml ou selectolax)
+            fingerprints: Fichier d'empreintes de technologies (défaut : technologies.json)
+            emails_only: N'extrait que les emails, sur les octets bruts (le document n'est
+                         analysé que si ses liens sont demandés)
+            full_scan: Cherche aussi les emails et les numéros dans la page quand ses données
+                       structurées en fournissent déjà
+        """
+        self.parser = parser
+        self.emails_only = emails_only
+        self.full_scan = full_scan
+        self.contact_extractor = ContactExtractor()
+        if not emails_only:
+            self.social_media_extractor = SocialMediaExtractor()
+            self.tech_detector = TechnologyDetector(fingerprints)
+            self.company_detector = CompanyDetector()
+            self.structured_data_extractor = StructuredDataExtractor()
+
+    def analyze(self, document, url: str, links: bool = False, extract: bool = True,
+                headers: Optional[Dict] = None, body: Optional[bytes] = None) -> Dict:
+        """
+        Analyse une page et retourne un résultat compact (listes et dicts simples)
+
+        Args:
+            document: HTML de la page ou document déjà analysé
+            url: URL de la page
+            links: Ajoute les liens <a href> de la page (découverte du crawler)
+            extract: Lance les extracteurs (contacts, réseaux sociaux, technologies, entreprise)
+            headers: En-têtes HTTP de la réponse (empreintes headers et cookies)
+            body: Octets bruts de la réponse (recherche des emails sans décodage)
+
+        Returns:
+            dict: emails, phones (numéro -> confiance), social_media, technologies, company_info,
+                  structured (champ -> valeurs fournies par les données structurées de la page)
+                  et links si demandé
+        """
+        if self.emails_only:
+            return self._analyze_emails(document, url, links, extract, headers, body)
+
+        page = ParsedPage.of(document, url, headers, parser=self.parser)
+        analysis = {}
+        if links:
+            analysis['links'] = page.links
+        if extract:
+            # Données structurées (JSON-LD, microdata) : les champs qu'elles remplissent ne sont
+            # pas recherchés dans le reste de la page (sauf full_scan pour les contacts)
+            structured = self.structured_data_extractor.extract(page)
+            structured_emails, structured_phones = self.contact_extractor.extract_structured_contacts(structured, url)
+            emails, phones = self.contact_extractor.extract_contacts(page, body, (structured_emails, structured_phones),
+                                                                     self.full_scan)
+            company_info = self.company_detector.extract_company_info(page, url, structured)
+            same_as = [link for link in structured.get('sameAs', []) if isinstance(link, str)]
+            profiles = [self.social_media_extractor.canonical_profile(link) for link in same_as]
+
+            # Valeurs de la page fournies par les données structurées, par champ
+            provided = {
+                'emails': structured_emails,
+                'phones': list(structured_phones),
+                'social_media': [profile[0] for profile in profiles if profile],
+                'company_info': [key for key in ('siren', 'siret', 'tva', 'address') if company_info[key]]
+                                if company_info['origin'] == STRUCTURED else [],
+            }
+            analysis.update({
+                'emails': emails,
+                'phones': phones,
+                'social_media': self.social_media_extractor.extract_social_links(page, url, same_as),
+                'technologies': self.tech_detector.detect_technologies(page),
+                'company_info': company_info,
+                'structured': {field: values for field, values in provided.items() if values},
+            })
+        return analysis
+
+    def _analyze_emails(self, document, url: str, links: bool, extract: bool,
+                        headers: Optional[Dict], body: Optional[bytes]) -> Dict:
+        """Chemin rapide : emails lus sur les octets bruts, sans analyse du document (sauf pour ses liens)"""
+        analysis = {}
+        if links:
+            analysis['links'] = ParsedPage.of(document, url, headers, parser=self.parser).links
+        if extract:
+            if body is None:
+                body = document.html if isinstance(document, ParsedPage) else document
+            analysis.update({
+                'emails': list(self.contact_extractor.extract_emails(body)),
+                'phones': {},
+                'social_media': {},
+                'technologies': {},
+                'company_info': {'siren': None, 'siret': None, 'tva': None, 'address': None,
+                                 'source': None, 'origin': None, 'confidence': None},
+                'structured': {},
+            })
+        return analysis
+
+
+# Extracteurs chauds du processus worker (construits par l'initialiseur du pool)
+_worker_analyzer: Optional[PageAnalyzer] = None
+
+
+def _init_worker(parser: Optional[str], fingerprints: Optional[str], emails_only: bool, full_scan: bool):
+    global _worker_analyzer
+    _worker_analyzer = PageAnalyzer(parser, fingerprints, emails_only, full_scan)
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _analyze_in_worker(html: str, url: str, headers: Dict, links: bool, extract: bool,
+                       body: Optional[bytes]) -> Dict:
+    start = time.perf_counter()
+    analysis = _worker_analyzer.analyze(html, url, links, extract, headers, body)
+    analysis['worker_seconds'] = time.perf_counter() - start
+    # Compteurs des caches du worker (les caches partagés vivent dans chaque processus)
+    analysis['worker_caches'] = (os.getpid(), shared_cache_stats())
+    return analysis
+
+
+class ExtractionPool:
+    def __init__(self, workers: Optional[int] = None, parser: Optional[str] = None,
+                 max_pending: Optional[int] = None, fingerprints: Optional[str] = None,
+                 emails_only: bool = False, full_scan: bool = False):
+        """
+        Étape d'extraction hors de la boucle asyncio : les pages sont analysées par un pool
+        de processus (un par cœur) qui gardent leurs extracteurs chargés. La boucle ne fait
+        que des entrées / sorties.
+
+        Args:
+            workers: Nombre de processus (défaut : nombre de cœurs, 0 = analyse sur la boucle)
+            parser: Backend d'analyse HTML des workers
+            max_pending: Pages soumises au pool au maximum ; au-delà, les sites attendent
+                         qu'une analyse se termine (défaut : 2 par processus)
+            fingerprints: Fichier d'empreintes de technologies des workers
+            emails_only: N'extrait que les emails (octets bruts, sans analyse HTML)
+            full_scan: Cherche aussi les contacts dans les pages dont les données structurées en fournissent
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else max(0, workers)
+        self.parser = parser
+        self.fingerprints = fingerprints
+        self.emails_only = emails_only
+        self.full_scan = full_scan
+        self.max_pending = max_pending or self.workers * 2
+        self.executor = None
+        self.analyzer = PageAnalyzer(parser, fingerprints, emails_only, full_scan) if self.workers == 0 else None
+        self.semaphore = None
+        # Worker -> derniers compteurs de ses caches
+        self.worker_caches: Dict[int, Dict] = {}
+        self.stats = {
+            'pages': 0,
+            'errors': 0,
+            'saturated': 0,
+            'deadline_skips': 0,
+            'wait_seconds': 0.0,
+            'worker_seconds': 0.0,
+        }
+
+    async def start(self):
+        """Démarre les processus et charge leurs extracteurs avant le premier site"""
+        if self.workers and self.executor is None:
+            # spawn : pas de fork d'un processus qui a déjà une boucle et des threads
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=_init_worker,
+                                                initargs=(self.parser, self.fingerprints, self.emails_only,
+                                                          self.full_scan))
+            self.semaphore = asyncio.Semaphore(self.max_pending)
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(self.executor, _warm_up) for _ in range(self.workers)))
+
+    async def close(self):
+        if self.executor is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: self.executor.shutdown(wait=True, cancel_futures=True)
+            )
+            self.executor = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def analyze(self, page: dict, url: str, links: bool = False, extract: bool = True,
+                      deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        """
+        Analyse une page récupérée par le client HTTP ; le résultat des extracteurs est
+        mémorisé dans la page (page['analysis']) pour n'être calculé qu'une fois
+
+        Args:
+            deadline: Budget du site : l'attente d'une place et du worker est abandonnée à son
+                      expiration, délai de grâce compris (l'analyse en cours se termine dans le worker)
+
+        Returns:
+            dict: Résultat de PageAnalyzer.analyze (None si l'analyse a échoué ou n'a pas tenu
+            dans le budget du site)
+        """
+        analysis = page.get('analysis')
+        if analysis is not None and (not links or 'links' in analysis):
+            return analysis
+        if not page['html']:
+            return None
+
+        try:
+            if self.executor is None:
+                # Analyse sur la boucle (workers=0), l'arbre reste partagé avec le crawler
+                if self.analyzer is None:
+                    self.analyzer = PageAnalyzer(self.parser, self.fingerprints, self.emails_only, self.full_scan)
+                if self.emails_only and not links:
+                    analysis = self.analyzer.analyze(page['html'], url, links, extract, body=page.get('body'))
+                else:
+                    analysis = self.analyzer.analyze(ParsedPage.from_page(page, url, self.parser), url, links,
+                                                     extract, body=page.get('body'))
+            else:
+                # Sans liens à lire, le chemin rapide des emails n'a besoin que des octets bruts
+                html = None if self.emails_only and not links and page.get('body') is not None else page['html']
+                submission = self._submit(html, url, page['headers'], links, extract, page.get('body'))
+                if deadline is None:
+                    analysis = await submission
+                else:
+                    grace_left = deadline.expires_at + EXTRACTION_GRACE - time.monotonic()
+                    analysis = await asyncio.wait_for(submission, grace_left)
+        except asyncio.TimeoutError:
+            self.stats['deadline_skips'] += 1
+            return None
+        except Exception as e:
+            self.stats['errors'] += 1
+            logging.error(f"Erreur lors de l'analyse de {url}: {str(e)}")
+            return None
+
+        self.stats['pages'] += 1
+        if extract:
+            page['analysis'] = analysis
+        return analysis
+
+    async def _submit(self, html: Optional[str], url: str, headers: Dict, links: bool, extract: bool,
+                      body: Optional[bytes]) -> Dict:
+        """Soumet une page au pool, en attendant une place quand il est saturé"""
+        if self.semaphore.locked():
+            self.stats['saturated'] += 1
+        wait_start = time.monotonic()
+        await self.semaphore.acquire()
+        self.stats['wait_seconds'] += time.monotonic() - wait_start
+
+        try:
+            future = asyncio.get_running_loop().run_in_executor(
+                self.executor, _analyze_in_worker, html, url, headers, links, extract, body
+            )
+        except BaseException:
+            self.semaphore.release()
+            raise
+        # La place n'est rendue qu'à la fin réelle de l'analyse, même si le site a abandonné l'attente
+        future.add_done_callback(lambda _: self.semaphore.release())
+
+        analysis = await asyncio.shield(future)
+        self.stats['worker_seconds'] += analysis.pop('worker_seconds')
+        pid, caches = analysis.pop('worker_caches')
+        self.worker_caches[pid] = caches
+        return analysis
+
+    def get_stats(self) -> Dict:
+        """
+        Retourne les compteurs de l'étape d'extraction
+
+        Returns:
+            Dict avec le nombre de processus, de pages analysées, les attentes de place, le temps CPU
+            des workers et les compteurs de leurs caches (vide si l'analyse tourne sur la boucle)
+        """
+        stats = dict(self.stats)
+        stats['workers'] = self.workers
+        stats['wait_seconds'] = round(stats['wait_seconds'], 2)
+        stats['worker_seconds'] = round(stats['worker_seconds'], 2)
+        stats['caches'] = merge_cache_stats(self.worker_caches.values())
+        return stats
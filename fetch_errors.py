@@ -0,0 +1,124 @@
+import asyncio
+import ssl
+import socket
+import time
+import logging
+from typing import Dict, Optional
+import aiohttp
+
+# Classes d'échec d'une récupération
+DNS = 'dns'
+CONNECT = 'connect'
+TLS = 'tls'
+TIMEOUT = 'timeout'
+SERVER_ERROR = '5xx'
+RATE_LIMITED = '429'
+CLIENT_ERROR = '4xx'
+UNSUPPORTED_CONTENT = 'content_type'
+DEADLINE = 'deadline'
+CIRCUIT_OPEN = 'circuit_open'
+OTHER = 'other'
+
+# Échecs transitoires, remis dans la file de relance
+TRANSIENT_ERRORS = {CONNECT, TIMEOUT, SERVER_ERROR, RATE_LIMITED}
+
+# Échecs qui indiquent un hôte en difficulté (alimentent le disjoncteur)
+HOST_FAILURES = {DNS, CONNECT, TLS, TIMEOUT, SERVER_ERROR, RATE_LIMITED}
+
+
+class UnsupportedContentType(Exception):
+    """Réponse ignorée d'après ses en-têtes (PDF, image, flux...) avant lecture du corps"""
+
+
+def classify_exception(error: BaseException) -> str:
+    """Classe une exception levée pendant une récupération"""
+    if isinstance(error, UnsupportedContentType):
+        return UNSUPPORTED_CONTENT
+    if isinstance(error, asyncio.TimeoutError):
+        return TIMEOUT
+    if isinstance(error, (aiohttp.ClientSSLError, ssl.SSLError)):
+        return TLS
+    if isinstance(error, aiohttp.ClientConnectorError):
+        return DNS if isinstance(error.os_error, socket.gaierror) else CONNECT
+    if isinstance(error, (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError, ConnectionError)):
+        return CONNECT
+    return OTHER
+
+
+def classify_status(status: int) -> Optional[str]:
+    """Classe un code HTTP (None si la réponse n'est pas un échec)"""
+    if status == 429:
+        return RATE_LIMITED
+    if status >= 500:
+        return SERVER_ERROR
+    if status >= 400:
+        return CLIENT_ERROR
+    return None
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = 5, cooldown: float = 60):
+        """
+        Disjoncteur par hôte : après `threshold` échecs consécutifs, plus aucune page
+        n'est demandée à l'hôte pendant `cooldown` secondes, puis une seule requête d'essai est autorisée ;
+        les autres restent refusées jusqu'à son résultat
+
+        Args:
+            threshold: Nombre d'échecs consécutifs avant ouverture
+            cooldown: Durée d'ouverture (secondes)
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures: Dict[str, int] = {}
+        self.open_until: Dict[str, float] = {}
+        # Requête d'essai en cours par hôte (instant de départ)
+        self.trials: Dict[str, float] = {}
+        self.stats = {
+            'opened': 0,
+            'rejected': 0,
+        }
+
+    def allow(self, host: str) -> bool:
+        """Indique si une requête peut être envoyée à l'hôte"""
+        now = time.monotonic()
+        trial_started = self.trials.get(host)
+        # Un essai sans résultat (requête annulée) n'immobilise pas l'hôte plus d'un cooldown
+        if trial_started is not None and now < trial_started + self.cooldown:
+            self.stats['rejected'] += 1
+            return False
+        open_until = self.open_until.get(host)
+        if open_until is None:
+            return True
+        if now >= open_until:
+            # Demi-ouvert : une seule requête d'essai, réouverture immédiate si elle échoue
+            del self.open_until[host]
+            self.failures[host] = self.threshold - 1
+            self.trials[host] = now
+            return True
+        self.stats['rejected'] += 1
+        return False
+
+    def record(self, host: str, error_kind: Optional[str]):
+        """Enregistre le résultat d'une requête vers l'hôte (et termine l'essai en cours)"""
+        self.trials.pop(host, None)
+        if error_kind not in HOST_FAILURES:
+            if error_kind is None:
+                self.failures.pop(host, None)
+            return
+
+        self.failures[host] = self.failures.get(host, 0) + 1
+        if self.failures[host] >= self.threshold and host not in self.open_until:
+            self.open_until[host] = time.monotonic() + self.cooldown
+            self.stats['opened'] += 1
+            logging.info(f"Disjoncteur ouvert pour {host} ({self.failures[host]} échecs consécutifs)")
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Retourne les compteurs du disjoncteur
+
+        Returns:
+            Dict avec le nombre d'ouvertures, de requêtes refusées et d'hôtes encore ouverts
+        """
+        stats = dict(self.stats)
+        stats['open_hosts'] = sum(1 for until in self.open_until.values() if until > time.monotonic())
+        return stats
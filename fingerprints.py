@@ -0,0 +1,472 @@
+"""
+Base d'empreintes de technologies au format Wappalyzer
+
+Le fichier JSON contient les catégories et les technologies :
+
+    {
+        "categories": {"1": {"name": "cms"}},
+        "technologies": {
+            "wordpress": {
+                "cats": [1],
+                "html": ["wp-content|wp-includes"],
+                "scriptSrc": ["/wp-includes/"],
+                "meta": {"generator": "^WordPress ?([\\d.]+)?\\;version:\\1"},
+                "headers": {"X-Pingback": "/xmlrpc\\.php$"},
+                "cookies": {"wordpress_test_cookie": ""},
+                "implies": "php"
+            }
+        }
+    }
+
+Sources reconnues : html (HTML de la page), scriptSrc (URLs des scripts), scripts (contenu des
+scripts), css (contenu des balises <style>), styleSrc (URLs des feuilles de style, extension),
+url, meta, headers, cookies ; implies et excludes. Les autres clés (js, dom...) demandent un
+navigateur et sont ignorées, tout comme les étiquettes `\\;version:` et `\\;confidence:`.
+Un motif vide sur meta, headers ou cookies indique que la présence suffit.
+
+La base compilée est mise en cache sur disque (pickle) sous une clé dérivée du hash du fichier :
+le démarrage ne recompile que si les empreintes changent.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+# Fichier livré avec le projet et dossier du cache compilé
+DEFAULT_FINGERPRINTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'technologies.json')
+FINGERPRINTS_CACHE_DIR = 'cache'
+# À incrémenter quand la forme compilée change (invalide les caches existants)
+CACHE_FORMAT = 1
+
+# Sources parcourues en texte et sources indexées par nom
+TEXT_SOURCES = ('html', 'scriptSrc', 'scripts', 'css', 'styleSrc', 'url')
+KEYED_SOURCES = ('meta', 'headers', 'cookies')
+
+# Caractères qui font d'un motif une vraie expression régulière (sinon : alternative de littéraux)
+REGEX_METACHARACTERS = set('.^$*+?{}[]()')
+
+# Longueur minimale du littéral qui sert de préfiltre à une regex (plus court, il est partout)
+MIN_ATOM_LENGTH = 3
+
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT,
+            getattr(sre_constants, 'POSSESSIVE_REPEAT', sre_constants.MAX_REPEAT)}
+
+
+def split_literals(pattern: str) -> Optional[List[str]]:
+    """
+    Décompose un motif de la forme `lit1|lit2|...` (points et autres caractères échappés)
+    en littéraux ; retourne None si le motif contient une vraie construction de regex
+    """
+    literals, current, escaped = [], [], False
+    for char in pattern:
+        if escaped:
+            if char.isalnum():
+                # \b, \d, \w... : classe ou ancre, pas un littéral
+                return None
+            current.append(char)
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == '|':
+            literals.append(''.join(current))
+            current = []
+        elif char in REGEX_METACHARACTERS:
+            return None
+        else:
+            current.append(char)
+    if escaped:
+        return None
+    literals.append(''.join(current))
+    return literals if all(literals) else None
+
+
+def required_literals(pattern: str) -> Optional[FrozenSet[str]]:
+    """
+    Littéraux (en minuscules) dont l'un au moins apparaît dans toute correspondance du motif,
+    en privilégiant les plus longs ; None si le motif n'en garantit aucun assez long
+
+    `/wp-(?:content|includes)/` -> {'content', 'includes'}
+    """
+    try:
+        literals = _required_literals(sre_parse.parse(pattern))
+    except (re.error, RecursionError, OverflowError):
+        return None
+    if not literals or min(map(len, literals)) < MIN_ATOM_LENGTH:
+        return None
+    return frozenset(literal.lower() for literal in literals)
+
+
+def _required_literals(items) -> Optional[Set[str]]:
+    candidates, run = [], []
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        if op is sre_constants.AT:
+            # Ancre de largeur nulle : le littéral en cours reste contigu
+            continue
+        if run:
+            candidates.append({''.join(run)})
+            run = []
+        if op is sre_constants.SUBPATTERN:
+            inner = _required_literals(av[-1])
+        elif op is sre_constants.BRANCH:
+            alternatives = [_required_literals(alternative) for alternative in av[1]]
+            inner = set().union(*alternatives) if all(alternatives) else None
+        elif op in _REPEATS and av[0] >= 1:
+            inner = _required_literals(av[2])
+        else:
+            inner = None
+        if inner:
+            candidates.append(inner)
+    if run:
+        candidates.append({''.join(run)})
+    return max(candidates, key=lambda literals: min(map(len, literals)), default=None)
+
+
+def _strip_tags(pattern: str) -> str:
+    """Retire les étiquettes Wappalyzer (\\;version:..., \\;confidence:...) d'un motif"""
+    return pattern.split('\\;', 1)[0]
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+class LiteralScanner:
+    def __init__(self, literals: Dict[str, Set]):
+        """
+        Recherche simultanée de littéraux (insensible à la casse) en une passe sur le texte
+
+        Les littéraux sont rangés dans un arbre de préfixes converti en une seule regex : à chaque
+        position, le coût dépend de la longueur des littéraux et non de leur nombre.
+
+        Args:
+            literals: Littéral -> identifiants (règles, technologies) qui le contiennent
+        """
+        self.targets: Dict[str, Set] = {}
+        for literal, targets in literals.items():
+            self.targets.setdefault(literal.lower(), set()).update(targets)
+
+        trie = {}
+        for literal in self.targets:
+            node = trie
+            for char in literal:
+                node = node.setdefault(char, {})
+            node[''] = literal
+
+        # La regex rend le littéral le plus long à une position donnée :
+        # les littéraux plus courts qui commencent au même endroit en sont des préfixes
+        self.prefixes = {literal: self._walk(trie, literal)[0] for literal in self.targets}
+        # Positions internes d'un littéral où un autre littéral peut commencer (masqué par finditer)
+        self.inner_offsets = {
+            literal: tuple(offset for offset in range(1, len(literal)) if self._walk(trie, literal[offset:])[1])
+            for literal in self.targets
+        }
+        self.pattern = self._trie_pattern(trie)
+        self._regex = None
+
+    def __getstate__(self):
+        # Seul le motif est mis en cache, la regex est compilée au premier texte parcouru
+        state = dict(self.__dict__)
+        state['_regex'] = None
+        return state
+
+    @property
+    def regex(self):
+        if self._regex is None:
+            self._regex = re.compile(self.pattern)
+        return self._regex
+
+    @staticmethod
+    def _walk(trie: dict, text: str) -> Tuple[List[str], bool]:
+        """Littéraux qui sont des préfixes du texte, et si un littéral peut commencer par ce texte"""
+        found, node = [], trie
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                return found, bool(found)
+            if '' in node:
+                found.append(node[''])
+        return found, True
+
+    @classmethod
+    def _trie_pattern(cls, node: dict) -> str:
+        branches = [re.escape(char) + cls._trie_pattern(child) for char, child in node.items() if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Fin de littéral possible : la suite est optionnelle (gloutonne, le plus long d'abord)
+        if '' in node:
+            return f'(?:{body})?'
+        return body
+
+    def scan(self, text: str) -> Set:
+        """Identifiants dont au moins un littéral apparaît dans le texte"""
+        found = set()
+        if not self.targets or not text:
+            return found
+        regex = self.regex
+        lowered = text.lower()
+        seen = set()
+        for match in regex.finditer(lowered):
+            literal = match.group()
+            self._collect(literal, found, seen)
+            for offset in self.inner_offsets[literal]:
+                inner = regex.match(lowered, match.start() + offset)
+                if inner:
+                    self._collect(inner.group(), found, seen)
+        return found
+
+    def _collect(self, literal: str, found: Set, seen: Set[str]):
+        if literal not in seen:
+            seen.add(literal)
+            for prefix in self.prefixes[literal]:
+                found.update(self.targets[prefix])
+
+
+class FingerprintMatcher:
+    def __init__(self, database: Dict):
+        """
+        Compile une base d'empreintes Wappalyzer
+
+        Les règles sont regroupées par index : un par source texte (html, scripts...) et un par
+        nom pour les sources nommées (meta generator, en-tête Server, cookie...). Chaque index a
+        un scanner de littéraux : les motifs qui sont de simples littéraux sont résolus par le
+        scanner, les vraies regex n'y sont indexées que par un littéral obligatoire et ne sont
+        évaluées que si ce littéral apparaît. Seuls les index des sources présentes sur la page
+        sont consultés : le coût par page ne croît pas avec le nombre de règles.
+
+        Args:
+            database: Contenu du fichier JSON (categories, technologies)
+        """
+        categories = database.get('categories', {})
+        technologies = database.get('technologies', database.get('apps', {}))
+
+        # Ordre du fichier : catégories puis technologies dans chaque catégorie
+        self.categories = [category.get('name', key) for key, category in categories.items()]
+        category_names = {str(key): category.get('name', key) for key, category in categories.items()}
+        self.techs = list(technologies)
+        self.tech_categories = {
+            tech: [category_names[str(cat)] for cat in fingerprint.get('cats', []) if str(cat) in category_names]
+            for tech, fingerprint in technologies.items()
+        }
+        self.implies = {}
+        self.excludes = {}
+
+        # Règle : (technologie, regex) ; regex None = confirmée dès qu'elle est candidate
+        # (littéral exact trouvé par le scanner, ou simple présence d'un en-tête / cookie / meta)
+        self.rules: List[Tuple[str, Optional[str]]] = []
+        self.invalid = 0
+        # Index : source texte, ou (source, nom en minuscules) -> (littéraux, règles sans littéral)
+        pending: Dict = {}
+
+        for tech, fingerprint in technologies.items():
+            for relation in ('implies', 'excludes'):
+                targets = [_strip_tags(target) for target in _as_list(fingerprint.get(relation))]
+                if targets:
+                    getattr(self, relation)[tech] = targets
+
+            for source in TEXT_SOURCES:
+                for pattern in _as_list(fingerprint.get(source)):
+                    self._add_rule(pending, source, tech, _strip_tags(pattern), presence=False)
+            for source in KEYED_SOURCES:
+                for name, patterns in (fingerprint.get(source) or {}).items():
+                    for pattern in _as_list(patterns):
+                        self._add_rule(pending, (source, name.lower()), tech, _strip_tags(pattern), presence=True)
+
+        self.indexes = {
+            key: (LiteralScanner(literals), unfiltered) for key, (literals, unfiltered) in pending.items()
+        }
+        self.regexes = {}
+
+    def _add_rule(self, pending: Dict, key, tech: str, pattern: str, presence: bool):
+        """Ajoute une règle à un index (motif vide : présence du nom pour les sources nommées)"""
+        if not pattern and not presence:
+            return
+        if pattern and not self._valid(tech, pattern):
+            return
+        literals, unfiltered = pending.setdefault(key, ({}, []))
+        exact = split_literals(pattern) if pattern else None
+        atoms = exact or (required_literals(pattern) if pattern else None)
+        rule = len(self.rules)
+        self.rules.append((tech, None if exact or not pattern else pattern))
+        if atoms is None:
+            unfiltered.append(rule)
+        for atom in atoms or ():
+            literals.setdefault(atom, set()).add(rule)
+
+    def _valid(self, tech: str, pattern: str) -> bool:
+        try:
+            sre_parse.parse(pattern)
+            return True
+        except (re.error, RecursionError, OverflowError) as e:
+            self.invalid += 1
+            logging.debug(f"Empreinte {tech} ignorée, motif invalide {pattern!r}: {e}")
+            return False
+
+    def __getstate__(self):
+        # Les regex des règles sont compilées à la demande, dans chaque processus
+        state = dict(self.__dict__)
+        state['regexes'] = {}
+        return state
+
+    def regex(self, pattern: str):
+        compiled = self.regexes.get(pattern)
+        if compiled is None:
+            compiled = self.regexes[pattern] = re.compile(pattern, re.I)
+        return compiled
+
+    @staticmethod
+    def page_texts(page, source: str) -> List[str]:
+        """Textes de la page lus par une source"""
+        if source == 'html':
+            return [page.markup]
+        if source == 'scriptSrc':
+            return page.script_sources
+        if source == 'scripts':
+            return [' '.join(page.script_texts)]
+        if source == 'css':
+            return [' '.join(page.style_texts)]
+        if source == 'styleSrc':
+            return page.stylesheets
+        return [page.url] if page.url else []
+
+    @staticmethod
+    def cookies(headers: Dict[str, str]) -> Dict[str, str]:
+        """Cookies posés par la réponse (en-têtes Set-Cookie, un par ligne)"""
+        cookies = {}
+        for name, value in headers.items():
+            if name.lower() != 'set-cookie':
+                continue
+            for line in value.split('\n'):
+                cookie_name, _, cookie_value = line.partition('=')
+                if cookie_name.strip():
+                    cookies[cookie_name.strip()] = cookie_value.split(';', 1)[0]
+        return cookies
+
+    def scan(self, key, texts: List[str]) -> Set[str]:
+        """
+        Technologies trouvées par un index dans des textes
+
+        Les littéraux sont cherchés en une passe sur les textes joints par un saut de ligne ;
+        les regex candidates (littéral obligatoire trouvé) sont ensuite vérifiées texte par texte.
+        """
+        found = set()
+        index = self.indexes.get(key)
+        if index is None:
+            return found
+        scanner, unfiltered = index
+        candidates = scanner.scan('\n'.join(texts))
+        candidates.update(unfiltered)
+        for rule in sorted(candidates):
+            tech, pattern = self.rules[rule]
+            if tech in found:
+                continue
+            if pattern is None or any(self.regex(pattern).search(text) for text in texts):
+                found.add(tech)
+        return found
+
+    def match(self, page, headers: Optional[Dict[str, str]] = None) -> Set[str]:
+        """Ensemble des technologies détectées sur la page (technologies impliquées comprises)"""
+        found = set()
+        for source in TEXT_SOURCES:
+            if source in self.indexes:
+                texts = self.page_texts(page, source)
+                if any(texts):
+                    found |= self.scan(source, texts)
+
+        named = [('meta', page.meta)]
+        if headers:
+            named += [('headers', headers), ('cookies', self.cookies(headers))]
+        for source, values in named:
+            for name, value in values.items():
+                found |= self.scan((source, name.lower()), [value])
+
+        # Technologies impliquées (transitivement), puis exclusions
+        pending = list(found)
+        while pending:
+            for implied in self.implies.get(pending.pop(), ()):
+                if implied not in found:
+                    found.add(implied)
+                    pending.append(implied)
+        for tech in list(found):
+            found.difference_update(self.excludes.get(tech, ()))
+        return found
+
+    def categorize(self, detected: Iterable[str]) -> Dict[str, List[str]]:
+        """Technologies détectées par catégorie, dans l'ordre du fichier d'empreintes"""
+        detected = set(detected)
+        by_category = {category: [] for category in self.categories}
+        for tech in self.techs:
+            if tech in detected:
+                for category in self.tech_categories[tech]:
+                    by_category[category].append(tech)
+        return {category: techs for category, techs in by_category.items() if techs}
+
+
+# Bases déjà chargées dans le processus (clé : hash du fichier)
+_loaded: Dict[str, FingerprintMatcher] = {}
+
+
+def load_fingerprints(path: Optional[str] = None, cache_dir: Optional[str] = FINGERPRINTS_CACHE_DIR) -> FingerprintMatcher:
+    """
+    Charge une base d'empreintes compilée, depuis le cache disque quand le fichier n'a pas changé
+
+    Args:
+        path: Fichier JSON d'empreintes (défaut : technologies.json du projet)
+        cache_dir: Dossier du cache compilé (None : pas de cache disque)
+
+    Returns:
+        FingerprintMatcher prêt à l'emploi
+    """
+    path = path or DEFAULT_FINGERPRINTS
+    with open(path, 'rb') as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if digest in _loaded:
+        return _loaded[digest]
+
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, f'fingerprints_v{CACHE_FORMAT}_{digest[:24]}.pickle')
+        try:
+            with open(cache_path, 'rb') as f:
+                matcher = pickle.load(f)
+            logging.debug(f"Empreintes chargées depuis le cache {cache_path}")
+            _loaded[digest] = matcher
+            return matcher
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Cache d'empreintes illisible {cache_path}, recompilation: {str(e)}")
+
+    matcher = FingerprintMatcher(json.loads(content.decode('utf-8')))
+    logging.info(f"{len(matcher.techs)} technologies compilées depuis {path}"
+                 + (f" ({matcher.invalid} motifs invalides ignorés)" if matcher.invalid else ''))
+
+    if cache_path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Écriture atomique : plusieurs processus peuvent compiler la même base en même temps
+            temp_path = f'{cache_path}.{os.getpid()}.tmp'
+            with open(temp_path, 'wb') as f:
+                pickle.dump(matcher, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logging.warning(f"Impossible d'écrire le cache d'empreintes {cache_path}: {str(e)}")
+
+    _loaded[digest] = matcher
+    return matcher
@@ -0,0 +1,255 @@
+import asyncio
+import time
+import logging
+from contextlib import asynccontextmanager, AsyncExitStack
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, min_rate: float = 0.05):
+        """
+        Seau à jetons : `rate` requêtes par seconde avec une rafale de `capacity` requêtes
+
+        Args:
+            rate: Débit nominal (jetons par seconde)
+            capacity: Nombre maximum de jetons accumulés
+            min_rate: Débit plancher après ralentissements successifs
+        """
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """
+        Réserve un jeton et retourne le délai d'attente avant de pouvoir l'utiliser
+
+        Le solde peut devenir négatif : les réservations suivantes sont alors étalées
+        dans le temps au rythme du débit courant.
+        """
+        self._refill()
+        self.tokens -= 1
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def pause(self, seconds: float):
+        """Suspend le seau pendant `seconds` secondes (Retry-After)"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+    def slow_down(self, factor: float = 0.5):
+        """Réduit le débit (429, 503)"""
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * factor)
+
+    def is_idle(self) -> bool:
+        """Seau plein au débit nominal : identique à un seau neuf, il peut être oublié"""
+        self._refill()
+        return self.tokens >= self.capacity and self.rate >= self.base_rate
+
+    def recover(self, step: float = 0.1):
+        """Remonte progressivement vers le débit nominal après une réponse correcte"""
+        if self.rate < self.base_rate:
+            self._refill()
+            self.rate = min(self.base_rate, self.rate + self.base_rate * step)
+
+
+# Nombre d'hôtes et d'IP suivis à partir duquel les inactifs sont oubliés (le seuil double
+# ensuite avec le nombre d'entrées restantes : le coût du balayage reste constant par requête)
+EVICTION_THRESHOLD = 1024
+
+
+class HostLimiter:
+    def __init__(self, host_rate: float = 2.0, host_burst: int = 4, host_max_in_flight: int = 2,
+                 ip_rate: float = 8.0, ip_burst: int = 16, ip_max_in_flight: int = 8,
+                 max_retry_after: float = 120.0):
+        """
+        Politesse par hôte et par adresse IP, indépendante de la concurrence globale
+
+        Args:
+            host_rate: Requêtes par seconde autorisées par hôte
+            host_burst: Rafale maximale par hôte
+            host_max_in_flight: Requêtes simultanées maximum par hôte
+            ip_rate: Requêtes par seconde autorisées par adresse IP (hébergement mutualisé)
+            ip_burst: Rafale maximale par adresse IP
+            ip_max_in_flight: Requêtes simultanées maximum par adresse IP
+            max_retry_after: Durée maximale de pause acceptée depuis un Retry-After (secondes)
+        """
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.host_max_in_flight = host_max_in_flight
+        self.ip_rate = ip_rate
+        self.ip_burst = ip_burst
+        self.ip_max_in_flight = ip_max_in_flight
+        self.max_retry_after = max_retry_after
+
+        self.host_buckets: Dict[str, TokenBucket] = {}
+        self.host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.ip_buckets: Dict[str, TokenBucket] = {}
+        self.ip_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.host_ips: Dict[str, str] = {}  # Hôte -> adresse IP observée
+        # Requêtes en attente ou en cours par hôte et par IP (absents : aucune)
+        self.host_active: Dict[str, int] = {}
+        self.ip_active: Dict[str, int] = {}
+        self.eviction_threshold = EVICTION_THRESHOLD
+
+        self.stats = {
+            'throttled_requests': 0,
+            'throttle_wait_seconds': 0.0,
+            'rate_limited_responses': 0,
+            'retry_after_pauses': 0,
+            'hosts_created': 0,
+            'ips_created': 0,
+            'evicted_hosts': 0,
+            'evicted_ips': 0,
+        }
+
+    def _host_bucket(self, host: str) -> TokenBucket:
+        if host not in self.host_buckets:
+            self.host_buckets[host] = TokenBucket(self.host_rate, self.host_burst)
+        return self.host_buckets[host]
+
+    def _ip_bucket(self, ip: str) -> TokenBucket:
+        if ip not in self.ip_buckets:
+            self.ip_buckets[ip] = TokenBucket(self.ip_rate, self.ip_burst)
+        return self.ip_buckets[ip]
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(self.host_max_in_flight)
+            self.stats['hosts_created'] += 1
+        return self.host_semaphores[host]
+
+    def _ip_semaphore(self, ip: str) -> asyncio.Semaphore:
+        if ip not in self.ip_semaphores:
+            self.ip_semaphores[ip] = asyncio.Semaphore(self.ip_max_in_flight)
+            self.stats['ips_created'] += 1
+        return self.ip_semaphores[ip]
+
+    @staticmethod
+    def _leave(active: Dict[str, int], key: str):
+        if active[key] == 1:
+            del active[key]
+        else:
+            active[key] -= 1
+
+    def evict_idle(self):
+        """
+        Oublie les hôtes et les IP sans requête en attente ni en cours dont le seau est plein au
+        débit nominal : leur état est celui d'une entrée neuve, l'éviction ne change donc rien à la
+        politesse. Un hôte ralenti (429, Retry-After) est gardé jusqu'à son rétablissement.
+        """
+        for buckets, semaphores, active, counter in (
+                (self.host_buckets, self.host_semaphores, self.host_active, 'evicted_hosts'),
+                (self.ip_buckets, self.ip_semaphores, self.ip_active, 'evicted_ips')):
+            idle = [key for key in set(buckets) | set(semaphores)
+                    if key not in active and (key not in buckets or buckets[key].is_idle())]
+            for key in idle:
+                buckets.pop(key, None)
+                semaphores.pop(key, None)
+            self.stats[counter] += len(idle)
+        for host in [host for host in self.host_ips if host not in self.host_semaphores]:
+            del self.host_ips[host]
+
+        tracked = len(self.host_semaphores) + len(self.ip_semaphores)
+        self.eviction_threshold = max(EVICTION_THRESHOLD, 2 * tracked)
+
+    def set_host_ip(self, host: str, ip: Optional[str]):
+        """Associe un hôte à l'adresse IP qui le sert"""
+        if host and ip:
+            self.host_ips[host] = ip
+
+    @asynccontextmanager
+    async def acquire(self, url: str):
+        """
+        Attend une place et un jeton pour l'hôte (et son IP si connue) avant d'envoyer la requête
+        """
+        host = urlparse(url).hostname or ''
+        ip = self.host_ips.get(host)
+        if len(self.host_semaphores) + len(self.ip_semaphores) >= self.eviction_threshold:
+            self.evict_idle()
+
+        self.host_active[host] = self.host_active.get(host, 0) + 1
+        if ip:
+            self.ip_active[ip] = self.ip_active.get(ip, 0) + 1
+        try:
+            async with AsyncExitStack() as stack:
+                # Toujours dans le même ordre (hôte puis IP) pour éviter les interblocages
+                await stack.enter_async_context(self._host_semaphore(host))
+                if ip:
+                    await stack.enter_async_context(self._ip_semaphore(ip))
+
+                wait = self._host_bucket(host).reserve()
+                if ip:
+                    wait = max(wait, self._ip_bucket(ip).reserve())
+                if wait > 0:
+                    self.stats['throttled_requests'] += 1
+                    self.stats['throttle_wait_seconds'] += wait
+                    await asyncio.sleep(wait)
+
+                yield
+        finally:
+            self._leave(self.host_active, host)
+            if ip:
+                self._leave(self.ip_active, ip)
+
+    def parse_retry_after(self, value: str) -> Optional[float]:
+        """Convertit un en-tête Retry-After (secondes ou date HTTP) en secondes"""
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                retry_date = parsedate_to_datetime(value)
+                if retry_date.tzinfo is None:
+                    retry_date = retry_date.replace(tzinfo=timezone.utc)
+                seconds = (retry_date - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        return min(max(seconds, 0.0), self.max_retry_after)
+
+    def record_response(self, url: str, status: int, headers: dict):
+        """
+        Ajuste le débit de l'hôte en fonction de la réponse (429, 503, Retry-After)
+        """
+        host = urlparse(url).hostname or ''
+        bucket = self._host_bucket(host)
+
+        if status in (429, 503):
+            if status == 429:
+                self.stats['rate_limited_responses'] += 1
+            bucket.slow_down()
+            retry_after = self.parse_retry_after(headers.get('Retry-After', ''))
+            if retry_after:
+                self.stats['retry_after_pauses'] += 1
+                bucket.pause(retry_after)
+            logging.info(f"Ralentissement de {host} (HTTP {status}) : {bucket.rate:.2f} req/s")
+        elif status and status < 400:
+            bucket.recover()
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Retourne les compteurs de politesse
+
+        Returns:
+            Dict avec le nombre de requêtes retardées, le temps d'attente cumulé, les ralentissements,
+            les entrées d'hôtes et d'IP créées (un hôte oublié puis revenu compte deux fois), encore
+            suivies et oubliées
+        """
+        stats = dict(self.stats)
+        stats['throttle_wait_seconds'] = round(stats['throttle_wait_seconds'], 2)
+        stats['tracked_hosts'] = len(self.host_semaphores)
+        stats['tracked_ips'] = len(self.ip_semaphores)
+        stats['slowed_hosts'] = sum(1 for bucket in self.host_buckets.values() if bucket.rate < bucket.base_rate)
+        return stats
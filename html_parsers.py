@@ -0,0 +1,219 @@
+import importlib.util
+import logging
+from typing import Dict, List, Optional, Tuple
+
+# Balises dont le texte n'appartient pas au texte visible de leurs ancêtres
+# (mêmes conteneurs que BeautifulSoup : leur texte n'est lu que sur la balise elle-même)
+TEXT_CONTAINERS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+# Balises qui séparent le texte à l'affichage (bloc, cellule, saut de ligne)
+BLOCK_ELEMENTS = frozenset([
+    'address', 'article', 'aside', 'blockquote', 'body', 'br', 'dd', 'details', 'dialog', 'div', 'dl',
+    'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'head', 'header', 'hr', 'html', 'li', 'main', 'nav', 'ol', 'option', 'p', 'pre', 'section',
+    'summary', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'title', 'tr', 'ul',
+])
+
+# Élément aplati : [nom, attributs, premier segment, fin des segments, fin des descendants]
+# (indice dans la liste des éléments qui suit le dernier descendant : un élément vide reste
+# situable par rapport à ses voisins, ce que sa plage de segments ne permet pas)
+Element = list
+# Segment de texte : (conteneur le plus proche ou None, texte)
+Segment = Tuple[Optional[str], str]
+
+
+class ParserBackend:
+    """
+    Backend d'analyse HTML : construit l'arbre avec sa bibliothèque, puis l'aplatit en
+    éléments et segments de texte dans l'ordre du document. Toutes les vues utilisées par
+    les extracteurs sont calculées sur cette forme commune, d'où des résultats identiques
+    quel que soit le backend.
+    """
+    name = None
+    module = None
+
+    @classmethod
+    def available(cls) -> bool:
+        return importlib.util.find_spec(cls.module) is not None
+
+    def parse(self, html: str):
+        """Construit l'arbre natif du document"""
+        raise NotImplementedError
+
+    def serialize(self, tree) -> str:
+        """HTML re-sérialisé par le parser"""
+        raise NotImplementedError
+
+    def flatten(self, tree) -> Tuple[List[Element], List[Segment]]:
+        """Aplatit l'arbre en éléments (ordre préfixe) et segments de texte (commentaires exclus)"""
+        raise NotImplementedError
+
+
+class Bs4Backend(ParserBackend):
+    """BeautifulSoup avec le parser html.parser de la bibliothèque standard"""
+    name = 'bs4'
+    module = 'bs4'
+
+    def __init__(self):
+        from bs4 import BeautifulSoup, Tag, NavigableString, CData
+        from bs4.element import Script, Stylesheet, TemplateString, RubyTextString, RubyParenthesisString
+        self.BeautifulSoup = BeautifulSoup
+        self.Tag = Tag
+        self.text_types = (NavigableString, CData, Script, Stylesheet, TemplateString,
+                           RubyTextString, RubyParenthesisString)
+
+    def parse(self, html: str):
+        return self.BeautifulSoup(html, 'html.parser')
+
+    def serialize(self, tree) -> str:
+        return str(tree)
+
+    def flatten(self, tree) -> Tuple[List[Element], List[Segment]]:
+        elements, segments = [], []
+        stack = [(iter(tree.contents), None, None)]
+        while stack:
+            children, kind, element = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if element is not None:
+                    element[3] = len(segments)
+                    element[4] = len(elements)
+                continue
+            if isinstance(child, self.Tag):
+                attrs = {name: ' '.join(value) if isinstance(value, list) else value
+                         for name, value in child.attrs.items()}
+                element = [child.name, attrs, len(segments), None, None]
+                elements.append(element)
+                stack.append((iter(child.contents), child.name if child.name in TEXT_CONTAINERS else kind, element))
+            elif type(child) in self.text_types:
+                segments.append((kind, str(child)))
+        return elements, segments
+
+
+class LxmlBackend(ParserBackend):
+    """Parser HTML de libxml2 (lxml.html)"""
+    name = 'lxml'
+    module = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        import lxml.etree
+        self.html = lxml.html
+        self.etree = lxml.etree
+        self.parser = lxml.html.HTMLParser(encoding='utf-8')
+
+    def parse(self, html: str):
+        # Octets UTF-8 : lxml refuse les chaînes qui portent une déclaration d'encodage
+        try:
+            return self.html.document_fromstring(html.encode('utf-8', 'surrogatepass'), parser=self.parser)
+        except self.etree.ParserError:
+            # Document vide
+            return self.html.document_fromstring(b'<html></html>', parser=self.parser)
+
+    def serialize(self, tree) -> str:
+        return self.etree.tostring(tree.getroottree(), encoding='unicode', method='html')
+
+    def flatten(self, tree) -> Tuple[List[Element], List[Segment]]:
+        elements, segments = [], []
+        stack = [(iter([tree]), None, None, None)]
+        while stack:
+            children, kind, element, node = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if element is not None:
+                    element[3] = len(segments)
+                    element[4] = len(elements)
+                    # Le texte qui suit la balise appartient à son parent
+                    if node.tail:
+                        segments.append((stack[-1][1] if stack else None, node.tail))
+                continue
+            if not isinstance(child.tag, str):
+                # Commentaire ou instruction : seul le texte qui suit est conservé
+                if child.tail:
+                    segments.append((kind, child.tail))
+                continue
+            name = child.tag.lower()
+            element = [name, dict(child.attrib), len(segments), None, None]
+            elements.append(element)
+            inner_kind = name if name in TEXT_CONTAINERS else kind
+            if child.text:
+                segments.append((inner_kind, child.text))
+            stack.append((iter(child), inner_kind, element, child))
+        return elements, segments
+
+
+class SelectolaxBackend(ParserBackend):
+    """Moteur lexbor via selectolax"""
+    name = 'selectolax'
+    module = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self.LexborHTMLParser = LexborHTMLParser
+
+    def parse(self, html: str):
+        return self.LexborHTMLParser(html)
+
+    def serialize(self, tree) -> str:
+        return tree.html or ''
+
+    def flatten(self, tree) -> Tuple[List[Element], List[Segment]]:
+        elements, segments = [], []
+        if tree.root is None:
+            return elements, segments
+        stack = [(iter([tree.root]), None, None)]
+        while stack:
+            children, kind, element = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if element is not None:
+                    element[3] = len(segments)
+                    element[4] = len(elements)
+                continue
+            tag = child.tag
+            if tag == '-text':
+                segments.append((kind, child.text_content or ''))
+            elif tag.startswith(('-', '_', '!')):
+                # Commentaire, doctype
+                continue
+            else:
+                attrs = {name: value if value is not None else '' for name, value in child.attributes.items()}
+                element = [tag, attrs, len(segments), None, None]
+                elements.append(element)
+                stack.append((child.iter(include_text=True), tag if tag in TEXT_CONTAINERS else kind, element))
+        return elements, segments
+
+
+PARSER_BACKENDS = {
+    backend.name: backend for backend in (Bs4Backend, LxmlBackend, SelectolaxBackend)
+}
+DEFAULT_PARSER = 'bs4'
+
+# Une instance par backend (les parsers sont sans état entre deux documents)
+_instances: Dict[str, ParserBackend] = {}
+
+
+def available_parsers() -> List[str]:
+    """Backends dont la bibliothèque est installée"""
+    return [name for name, backend in PARSER_BACKENDS.items() if backend.available()]
+
+
+def get_parser_backend(name: Optional[str] = None) -> ParserBackend:
+    """
+    Retourne le backend demandé (BeautifulSoup si le nom est inconnu ou la bibliothèque absente)
+
+    Args:
+        name: bs4, lxml ou selectolax
+    """
+    name = name or DEFAULT_PARSER
+    if name not in _instances:
+        backend = PARSER_BACKENDS.get(name)
+        if backend is None or not backend.available():
+            logging.warning(f"Parser HTML {name} indisponible, utilisation de {DEFAULT_PARSER}")
+            _instances[name] = get_parser_backend(DEFAULT_PARSER)
+        else:
+            _instances[name] = backend()
+    return _instances[name]
@@ -0,0 +1,298 @@
+import asyncio
+import aiohttp
+import ssl
+import re
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from host_limiter import HostLimiter
+from dns_cache import DnsCache
+from deadline import Deadline
+from fetch_errors import (CircuitBreaker, UnsupportedContentType, classify_exception, classify_status,
+                          DEADLINE, CIRCUIT_OPEN)
+
+# Types de contenu lus par le client (les autres sont rejetés sur leurs en-têtes)
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+
+
+class HttpClient:
+    def __init__(self, limit: int = 100, limit_per_host: int = 4, total_timeout: float = 30,
+                 connect_timeout: float = 5, keepalive_timeout: float = 30,
+                 limiter: Optional[HostLimiter] = None, dns_cache: Optional[DnsCache] = None,
+                 breaker: Optional[CircuitBreaker] = None, max_body_bytes: int = 2 * 1024 * 1024,
+                 chunk_size: int = 64 * 1024):
+        """
+        Client HTTP partagé par le crawler et le scraper pendant toute l'exécution
+
+        Args:
+            limit: Nombre maximum de connexions ouvertes au total
+            limit_per_host: Nombre maximum de connexions ouvertes par hôte
+            total_timeout: Timeout global d'une requête (secondes)
+            connect_timeout: Timeout de connexion (secondes)
+            keepalive_timeout: Durée de conservation des connexions inactives (secondes)
+            limiter: Politesse par hôte / par IP appliquée à chaque requête
+            dns_cache: Cache DNS partagé (créé à l'ouverture si absent)
+            breaker: Disjoncteur par hôte (plus aucune requête vers un hôte qui échoue en boucle)
+            max_body_bytes: Nombre maximum d'octets lus par réponse (au-delà, le corps est tronqué)
+            chunk_size: Taille des blocs lus sur le flux de la réponse
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self.keepalive_timeout = keepalive_timeout
+        self.limiter = limiter or HostLimiter()
+        self.dns_cache = dns_cache
+        self.breaker = breaker or CircuitBreaker()
+        # Échecs par classe (dns, connect, tls, timeout, 5xx, 429, 4xx, ...)
+        self.failures: Dict[str, int] = {}
+        self.max_body_bytes = max_body_bytes
+        self.chunk_size = chunk_size
+
+        # Contexte SSL créé une seule fois (chargement des CA) et réutilisé par toutes les connexions
+        self.ssl_context = ssl.create_default_context()
+        self.ssl_context.check_hostname = False
+        self.ssl_context.verify_mode = ssl.CERT_NONE
+
+        self.session = None
+
+        # Compteurs de réutilisation des connexions et de lecture des corps
+        self.stats = {
+            'requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'bytes_read': 0,
+            'truncated': 0,
+        }
+
+    async def start(self):
+        """Ouvre la session et le pool de connexions"""
+        if self.session is None:
+            if self.dns_cache is None:
+                self.dns_cache = DnsCache()
+
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_request_start.append(self._on_request_start)
+            trace_config.on_connection_create_end.append(self._on_connection_create_end)
+            trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+
+            connector = aiohttp.TCPConnector(
+                ssl=self.ssl_context,
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                # Le cache DNS du run remplace celui du connecteur (TTL, cache négatif, préchargement)
+                resolver=self.dns_cache,
+                use_dns_cache=False,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                trace_configs=[trace_config]
+            )
+        return self
+
+    async def close(self):
+        """Ferme proprement la session et toutes les connexions du pool"""
+        if self.session is not None:
+            await self.session.close()
+            await self.dns_cache.close()
+            self.session = None
+            # Laisser le temps aux transports SSL de se fermer
+            await asyncio.sleep(0.25)
+            logging.info(f"Statistiques HTTP: {self.get_stats()}")
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _on_request_start(self, session, trace_config_ctx, params):
+        self.stats['requests'] += 1
+
+    async def _on_connection_create_end(self, session, trace_config_ctx, params):
+        self.stats['connections_created'] += 1
+
+    async def _on_connection_reuseconn(self, session, trace_config_ctx, params):
+        self.stats['connections_reused'] += 1
+
+    async def fetch(self, url: str, headers: dict, timeout: Optional[float] = None,
+                    deadline: Optional[Deadline] = None, max_bytes: Optional[int] = None,
+                    use_range: bool = False) -> dict:
+        """
+        Récupère une page et retourne le document complet
+
+        Args:
+            url: URL à récupérer
+            headers: En-têtes HTTP de la requête
+            timeout: Timeout spécifique à cette requête (secondes, optionnel)
+            deadline: Budget du site : la requête ne dispose que du temps restant (optionnel)
+            max_bytes: Nombre maximum d'octets lus pour cette requête (défaut : max_body_bytes)
+            use_range: Demande seulement les `max_bytes` premiers octets (en-tête Range)
+
+        Returns:
+            dict: Document récupéré (url, final_url, status, headers, content_type, body (octets bruts),
+                  html, bytes_read, truncated, error, error_kind)
+        """
+        page = {
+            'url': url,
+            'final_url': url,
+            'status': None,
+            'headers': {},
+            'content_type': '',
+            'body': b'',
+            'html': '',
+            'bytes_read': 0,
+            'truncated': False,
+            'error': None,
+            'error_kind': None
+        }
+
+        host = urlparse(url).hostname
+
+        # Budget de la requête : son timeout, borné par le temps restant du site
+        budget = timeout
+        limited_by_deadline = False
+        if deadline is not None:
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                return self._fail(page, DEADLINE, 'deadline')
+            if budget is None or remaining < budget:
+                budget = remaining
+                limited_by_deadline = True
+
+        # Ne plus rien demander à un hôte qui échoue en boucle
+        if not self.breaker.allow(host):
+            return self._fail(page, CIRCUIT_OPEN, 'circuit open')
+
+        try:
+            # Le budget couvre aussi l'attente de politesse
+            max_bytes = min(max_bytes or self.max_body_bytes, self.max_body_bytes)
+            if use_range:
+                headers = dict(headers, Range=f'bytes=0-{max_bytes - 1}')
+            if budget:
+                await asyncio.wait_for(self._fetch(url, headers, page, max_bytes), budget)
+            else:
+                await self._fetch(url, headers, page, max_bytes)
+            error_kind = classify_status(page['status'])
+            if error_kind:
+                self._fail(page, error_kind, f"HTTP {page['status']}")
+        except asyncio.TimeoutError:
+            if limited_by_deadline:
+                logging.info(f"Budget du site épuisé pendant la récupération de {url}")
+                self._fail(page, DEADLINE, 'deadline')
+            else:
+                logging.error(f"Timeout lors de la récupération de {url}")
+                self._fail(page, classify_exception(asyncio.TimeoutError()), 'timeout')
+        except UnsupportedContentType as e:
+            logging.info(f"{url} ignorée : {str(e)}")
+            self._fail(page, classify_exception(e), str(e))
+        except Exception as e:
+            logging.error(f"Erreur lors de la récupération de {url}: {str(e)}")
+            self._fail(page, classify_exception(e), str(e))
+
+        self.stats['bytes_read'] += page['bytes_read']
+        self.stats['truncated'] += page['truncated']
+        # Une échéance n'est pas un échec de l'hôte, mais elle termine un essai en cours
+        self.breaker.record(host, page['error_kind'])
+        return page
+
+    def _fail(self, page: dict, error_kind: str, error: str) -> dict:
+        """Marque le document en échec et compte l'échec dans sa classe"""
+        page['error'] = error
+        page['error_kind'] = error_kind
+        self.failures[error_kind] = self.failures.get(error_kind, 0) + 1
+        return page
+
+    async def _fetch(self, url: str, headers: dict, page: dict, max_bytes: int):
+        """Envoie la requête (après la politesse) et complète le document au fil de l'eau"""
+        # L'IP résolue (cache DNS) permet d'appliquer la politesse par IP dès la première requête
+        host = urlparse(url).hostname
+        self.limiter.set_host_ip(host, self.dns_cache.cached_ip(host))
+
+        async with self.limiter.acquire(url):
+            async with self.session.get(url, headers=headers) as response:
+                page['final_url'] = str(response.url)
+                page['status'] = response.status
+                page['headers'] = dict(response.headers)
+                # Tous les cookies posés (un par ligne), pas seulement le dernier en-tête Set-Cookie
+                cookies = response.headers.getall('Set-Cookie', [])
+                if len(cookies) > 1:
+                    page['headers']['Set-Cookie'] = '\n'.join(cookies)
+
+                # Politesse : mémoriser l'IP de l'hôte et ralentir en cas de 429 / Retry-After
+                self.limiter.set_host_ip(host, self.get_peer_ip(response))
+                self.limiter.record_response(url, response.status, page['headers'])
+
+                # Rejeter les contenus non HTML sur leurs en-têtes, avant de lire le corps
+                page['content_type'] = response.headers.get('content-type', '')
+                if not self.is_html(page['content_type']):
+                    raise UnsupportedContentType(f"Type de contenu ignoré : {page['content_type']}")
+
+                # Lire le corps par blocs, sans dépasser max_bytes
+                chunks = []
+                async for chunk in response.content.iter_chunked(self.chunk_size):
+                    remaining = max_bytes - page['bytes_read']
+                    if len(chunk) >= remaining:
+                        chunks.append(chunk[:remaining])
+                        page['bytes_read'] += remaining
+                        # Tronqué seulement s'il restait des données au-delà de la limite
+                        page['truncated'] = len(chunk) > remaining or not response.content.at_eof()
+                        break
+                    chunks.append(chunk)
+                    page['bytes_read'] += len(chunk)
+
+                # Réponse partielle (Range) : tronquée si le serveur annonce une taille supérieure
+                if response.status == 206 and not page['truncated']:
+                    page['truncated'] = self.range_truncated(response.headers.get('Content-Range', ''))
+
+                page['body'] = b''.join(chunks)
+                page['html'] = self.decode(page['body'], page['content_type'])
+
+    def is_html(self, content_type: str) -> bool:
+        """Indique si le type de contenu annoncé doit être lu (absent = lu)"""
+        mime = content_type.split(';')[0].strip().lower()
+        return not mime or mime in HTML_CONTENT_TYPES
+
+    def range_truncated(self, content_range: str) -> bool:
+        """Indique si un en-tête Content-Range (bytes début-fin/total) couvre moins que le document"""
+        match = re.match(r'bytes\s+(\d+)-(\d+)/(\d+|\*)', content_range.strip())
+        if not match:
+            return True
+        end, total = int(match.group(2)), match.group(3)
+        return total == '*' or end + 1 < int(total)
+
+    def get_peer_ip(self, response: aiohttp.ClientResponse) -> Optional[str]:
+        """Retourne l'adresse IP du serveur qui a répondu"""
+        connection = response.connection
+        if connection is None or connection.transport is None:
+            return None
+        peername = connection.transport.get_extra_info('peername')
+        return peername[0] if peername else None
+
+    def decode(self, content: bytes, content_type: str) -> str:
+        """Décode le contenu en essayant le charset annoncé puis les encodages courants"""
+        charset = None
+        if 'charset=' in content_type:
+            charset = content_type.split('charset=')[-1].split(';')[0].strip()
+
+        for encoding in [charset, 'utf-8', 'latin1', 'cp1252', 'iso-8859-1']:
+            if not encoding:
+                continue
+            try:
+                return content.decode(encoding)
+            except (UnicodeDecodeError, LookupError):
+                continue
+        return ""
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Retourne les compteurs de connexions
+
+        Returns:
+            Dict avec le nombre de requêtes, de connexions créées et réutilisées
+        """
+        stats = dict(self.stats)
+        connections = stats['connections_created'] + stats['connections_reused']
+        stats['reuse_ratio'] = round(stats['connections_reused'] / connections, 3) if connections else 0.0
+        return stats
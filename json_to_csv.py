@@ -66,12 +66,17 @@ def json_to_csv(json_file: str, csv_file: str):
                 if 'emails' in site_data:
                     for i, email in enumerate(site_data['emails']):
                         row[f'email_{i}'] = email['value']
+                        row[f'email_{i}_origin'] = email.get('origin', '')
+                        row[f'email_{i}_page_type'] = email.get('page_type', '')
                         row[f'email_{i}_sources'] = '|'.join(email['sources'])
                 
                 # Traiter les numéros de téléphone
                 if 'phone_numbers' in site_data:
                     for i, phone in enumerate(site_data['phone_numbers']):
                         row[f'phone_{i}'] = phone['value']
+                        row[f'phone_{i}_confidence'] = phone.get('confidence', '')
+                        row[f'phone_{i}_origin'] = phone.get('origin', '')
+                        row[f'phone_{i}_page_type'] = phone.get('page_type', '')
                         row[f'phone_{i}_sources'] = '|'.join(phone['sources'])
                 
                 # Traiter les réseaux sociaux
@@ -0,0 +1,92 @@
+import unicodedata
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+
+class KeywordAutomaton:
+    def __init__(self, keywords: Dict[str, Any], whole_words: bool = True):
+        """
+        Automate d'Aho-Corasick : toutes les occurrences de tous les mots-clés en une passe
+
+        Chaque caractère du texte fait avancer l'automate d'un état (les liens d'échec évitent
+        tout retour arrière) : le coût est linéaire en la taille du texte, quel que soit le
+        nombre de mots-clés. La recherche est insensible à la casse.
+
+        Args:
+            keywords: Mot-clé -> valeur rendue avec chaque occurrence (catégorie, poids...)
+            whole_words: N'accepte que les mots entiers pour les écritures qui séparent les mots
+                         (« tel » n'est pas trouvé dans « hotel », 電話 l'est dans 代表電話)
+        """
+        self.whole_words = whole_words
+
+        # Transitions, lien d'échec et sorties (longueur, valeur, mot entier exigé) de chaque état
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[Tuple[int, Any, bool]]] = [[]]
+
+        for keyword, value in keywords.items():
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                state = next_state
+            self.outputs[state].append((len(keyword), value, self._needs_boundary(keyword)))
+
+        # Liens d'échec en largeur : plus long suffixe de l'état qui est aussi un préfixe de mot-clé
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+
+    @staticmethod
+    def _needs_boundary(keyword: str) -> bool:
+        # Les écritures chinoise, japonaise et coréenne ne séparent pas les mots
+        return not any(unicodedata.east_asian_width(char) in 'WF' for char in keyword)
+
+    @staticmethod
+    def _is_word_char(char: str) -> bool:
+        return char.isalnum() or char == '_'
+
+    def find(self, text: str) -> List[Tuple[int, int, Any]]:
+        """
+        Occurrences des mots-clés dans le texte
+
+        Returns:
+            Liste (début, fin, valeur) triée par position de fin
+        """
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Quelques majuscules s'écrivent en deux caractères une fois en minuscules (İ)
+            lowered = ''.join(char.lower()[0] for char in text)
+
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        hits = []
+        state = 0
+        for end, char in enumerate(lowered, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                for length, value, bounded in outputs[state]:
+                    start = end - length
+                    if bounded and self.whole_words and (
+                            (start > 0 and self._is_word_char(lowered[start - 1])) or
+                            (end < len(lowered) and self._is_word_char(lowered[end]))):
+                        continue
+                    hits.append((start, end, value))
+        return hits
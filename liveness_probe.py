@@ -0,0 +1,143 @@
+import asyncio
+import socket
+import time
+import logging
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
+from dns_cache import DnsCache
+
+
+class LivenessProbe:
+    def __init__(self, dns_cache: DnsCache, concurrency: int = 500,
+                 dns_timeout: float = 3, connect_timeout: float = 3):
+        """
+        Pré-vol rapide (DNS + connexion TCP) pour écarter les domaines morts avant le crawl
+
+        Args:
+            dns_cache: Cache DNS du run (les résolutions servent ensuite au crawl)
+            concurrency: Nombre de sondes simultanées
+            dns_timeout: Timeout de la résolution DNS (secondes)
+            connect_timeout: Timeout de la connexion TCP (secondes)
+        """
+        self.dns_cache = dns_cache
+        self.concurrency = concurrency
+        self.dns_timeout = dns_timeout
+        self.connect_timeout = connect_timeout
+        self.stats = {
+            'probed': 0,
+            'alive': 0,
+            'dead': 0,
+            'reasons': {},
+        }
+
+    async def probe(self, url: str) -> Dict:
+        """
+        Vérifie qu'un site résout et accepte une connexion TCP sur le port de son schéma
+
+        Returns:
+            dict: url, alive, reason (None si vivant), ip, elapsed_ms
+        """
+        start = time.monotonic()
+        parsed = urlparse(url)
+        host = parsed.hostname or ''
+        try:
+            port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        except ValueError:
+            port = None
+        result = {'url': url, 'alive': False, 'reason': None, 'ip': None, 'elapsed_ms': None}
+
+        if not host or port is None:
+            result['reason'] = 'invalid_url'
+        else:
+            result['reason'], result['ip'] = await self._check(host, port)
+            result['alive'] = result['reason'] is None
+
+        result['elapsed_ms'] = round((time.monotonic() - start) * 1000, 1)
+        return result
+
+    async def _check(self, host: str, port: int) -> Tuple[str, str]:
+        """Retourne (raison de l'échec ou None, IP contactée)"""
+        if self.dns_cache.is_ip(host):
+            ips = [host]
+        else:
+            # Le timeout borne l'attente de la sonde, pas la résolution partagée avec le crawl
+            try:
+                addresses = await self.dns_cache.resolve(host, port, socket.AF_UNSPEC, timeout=self.dns_timeout)
+            except asyncio.TimeoutError:
+                return 'dns_timeout', None
+            except Exception:
+                return 'dns_error', None
+            ips = list(dict.fromkeys(address['host'] for address in addresses))
+            if not ips:
+                return 'dns_error', None
+
+        # Le site est vivant si l'une de ses adresses répond (IPv6 en tête sans route v6, IP retirée...)
+        failure = None
+        for ip in ips:
+            reason = await self._connect(ip, port)
+            if reason is None:
+                return None, ip
+            if failure is None:
+                failure = (reason, ip)
+        return failure
+
+    async def _connect(self, ip: str, port: int) -> str:
+        """Retourne la raison de l'échec de la connexion TCP, ou None si elle aboutit"""
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), self.connect_timeout)
+        except asyncio.TimeoutError:
+            return 'connect_timeout'
+        except ConnectionRefusedError:
+            return 'connect_refused'
+        except Exception:
+            return 'connect_error'
+
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+        return None
+
+    async def filter(self, urls: List[str]) -> Tuple[List[str], List[Dict]]:
+        """
+        Sonde toutes les URLs en parallèle
+
+        Returns:
+            tuple: (URLs vivantes dans l'ordre d'entrée, sondes des sites morts avec leur raison)
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded_probe(url: str) -> Dict:
+            async with semaphore:
+                return await self.probe(url)
+
+        results = await asyncio.gather(*(bounded_probe(url) for url in urls), return_exceptions=True)
+
+        alive, dead = [], []
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                # Une sonde en erreur écarte son site, pas tout le pré-vol
+                result = {'url': url, 'alive': False, 'reason': 'probe_error', 'ip': None, 'elapsed_ms': None}
+            self.stats['probed'] += 1
+            if result['alive']:
+                self.stats['alive'] += 1
+                alive.append(result['url'])
+            else:
+                self.stats['dead'] += 1
+                self.stats['reasons'][result['reason']] = self.stats['reasons'].get(result['reason'], 0) + 1
+                dead.append(result)
+
+        logging.info(f"Pré-vol : {len(alive)} sites vivants, {len(dead)} morts")
+        return alive, dead
+
+    def get_stats(self) -> Dict:
+        """
+        Retourne les compteurs du pré-vol
+
+        Returns:
+            Dict avec le nombre de sites sondés, vivants, morts et la répartition des raisons
+        """
+        stats = dict(self.stats)
+        stats['reasons'] = dict(self.stats['reasons'])
+        return stats
@@ -1,6 +1,5 @@
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 from typing import List, Dict, Set, Optional
 from collections import defaultdict
@@ -8,20 +7,33 @@ import re
 from company_detector import CompanyDetector
 import time
 import logging
-import ssl
-import importlib.util
+from http_client import HttpClient
+from extraction_pool import ExtractionPool
+from deadline import Deadline
+from bounded_cache import LruCache, shared_cache
+
+# Octets de documents gardés en mémoire par site (corps bruts et HTML décodé) ; une page évincée
+# est récupérée à nouveau pour l'extraction
+PAGE_CACHE_BYTES = 16 * 1024 * 1024
 
 class PageCrawler:
-    def __init__(self, max_pages: int = 10):
+    def __init__(self, http_client: HttpClient, max_pages: int = 10, deadline: Optional[Deadline] = None,
+                 discovery_bytes: Optional[int] = None, pool: Optional[ExtractionPool] = None):
         self.max_pages = max_pages
+        self.http_client = http_client
+        self.deadline = deadline  # Budget du site, partagé avec l'extraction
+        # Pages lues seulement pour leurs liens : requête Range limitée à discovery_bytes (None = page entière)
+        self.discovery_bytes = discovery_bytes
+        self.discovery_urls = set()
+        self.pool = pool  # Étape d'analyse des pages (liens + extraction, partagée avec le scraper)
         self.company_detector = CompanyDetector()
-        self.ssl_context = ssl.create_default_context()
-        self.ssl_context.check_hostname = False
-        self.ssl_context.verify_mode = ssl.CERT_NONE
         self.visited = set()
         self.priority_urls = set()
-        self.html_cache = {}  # Cache pour le contenu HTML
-        self.semaphore = asyncio.Semaphore(5)  # Limite les requêtes parallèles
+        # Cache borné des documents récupérés (url -> page)
+        self.page_cache = LruCache(max_entries=max_pages * 2, max_bytes=PAGE_CACHE_BYTES,
+                                   sizeof=lambda page: len(page['body']) + len(page['html']))
+        # Liens déjà normalisés ((page, href) -> URL ou None), partagé par tous les sites
+        self.link_cache = shared_cache('urls')
         
         # Patterns pour les pages prioritaires (compilés)
         self.priority_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in [
@@ -35,60 +47,62 @@ class PageCrawler:
             r'mentions-legales'
         ]]  # Réduit la liste pour se concentrer sur les plus importants
 
-        # Parser HTML rapide
-        self.parser = 'lxml'
-        if not importlib.util.find_spec('lxml'):
-            self.parser = 'html.parser'
-
-    async def get_page_content(self, session: aiohttp.ClientSession, url: str, headers: dict) -> tuple[str, dict]:
-        """Récupère le contenu d'une page avec cache et compression"""
-        if url in self.html_cache:
-            return self.html_cache[url], {}
-            
-        async with self.semaphore:
-            try:
-                # Ajouter l'acceptation de la compression
-                headers['Accept-Encoding'] = 'gzip, deflate'
-                async with session.get(url, headers=headers, ssl=self.ssl_context, timeout=10) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        self.html_cache[url] = html
-                        return html, dict(response.headers)
-                    else:
-                        logging.error(f"Erreur HTTP {response.status} pour {url}")
-                        return "", {}
-            except Exception as e:
-                logging.error(f"Erreur lors de la récupération de {url}: {str(e)}")
-                return "", {}
+    async def get_page_content(self, url: str, headers: dict, discovery: bool = False) -> str:
+        """
+        Récupère le contenu d'une page avec cache (le document complet est conservé pour l'extraction)
+        
+        Args:
+            discovery: La page n'est lue que pour ses liens (début du document seulement si discovery_bytes)
+        """
+        page = self.page_cache.get(url)
+        if page is None:
+            # La politesse par hôte est appliquée par le client HTTP
+            if discovery and self.discovery_bytes:
+                self.discovery_urls.add(url)
+                page = await self.http_client.fetch(url, headers, timeout=10, deadline=self.deadline,
+                                                    max_bytes=self.discovery_bytes, use_range=True)
+            else:
+                page = await self.http_client.fetch(url, headers, timeout=10, deadline=self.deadline)
+            self.page_cache.put(url, page)
+        
+        if page['status'] not in (200, 206):
+            if page['status'] is not None:
+                logging.error(f"Erreur HTTP {page['status']} pour {url}")
+            return ""
+        return page['html']
 
-    def extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
+    def extract_links(self, hrefs: List[str], base_url: str) -> List[str]:
         """
         Extrait tous les liens d'une page qui appartiennent au même domaine
-        Version optimisée avec set et parsing rapide
+        Version optimisée avec set, à partir des liens <a href> du document déjà analysé
         """
         links = set()
-        base_domain = urlparse(base_url).netloc
         
-        # Extraction rapide des liens avec sélecteur CSS
-        for tag in soup.select('a[href]'):
-            href = tag.get('href', '').strip()
+        # Liens <a href> du document (les menus se répètent d'une page à l'autre : normalisation en cache)
+        for href in hrefs:
+            href = href.strip()
             if not href or href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
                 continue
                 
-            try:
-                absolute_url = urljoin(base_url, href)
-                parsed = urlparse(absolute_url)
-                if parsed.netloc == base_domain and parsed.scheme in ('http', 'https'):
-                    # Normaliser l'URL
-                    normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                    if parsed.query:
-                        normalized += f"?{parsed.query}"
-                    links.add(normalized)
-            except:
-                continue
+            normalized = self.link_cache.get_or_compute((base_url, href), lambda: self.normalize_link(href, base_url))
+            if normalized:
+                links.add(normalized)
         
         return list(links)
 
+    def normalize_link(self, href: str, base_url: str) -> Optional[str]:
+        """URL absolue du lien sans fragment, None s'il sort du domaine de la page ou n'est pas HTTP"""
+        try:
+            parsed = urlparse(urljoin(base_url, href))
+            if parsed.netloc != urlparse(base_url).netloc or parsed.scheme not in ('http', 'https'):
+                return None
+            normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+            if parsed.query:
+                normalized += f"?{parsed.query}"
+            return normalized
+        except:
+            return None
+
     def is_priority_page(self, url: str) -> bool:
         """
         Détermine si une URL correspond à une page prioritaire
@@ -101,60 +115,74 @@ class PageCrawler:
             return False
 
     async def crawl_priority_pages(self, start_url: str, headers: dict):
-        """Crawl optimisé des pages prioritaires"""
-        timeout = aiohttp.ClientTimeout(total=20, connect=5)
-        connector = aiohttp.TCPConnector(ssl=False, limit=5, force_close=True)
+        """
+        Crawl optimisé des pages prioritaires
         
+        Returns:
+            Dict[str, Optional[dict]]: URL -> document déjà récupéré pendant le crawl (None si à récupérer)
+        """
         try:
-            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-                # Toujours ajouter l'URL de départ
-                self.priority_urls.add(start_url)
+            # Toujours ajouter l'URL de départ
+            self.priority_urls.add(start_url)
+            
+            html = await self.get_page_content(start_url, headers)
+            # Liens et extraction en une seule analyse (le résultat est réutilisé par le scraper)
+            analysis = await self.pool.analyze(self.page_cache.get(start_url), start_url, links=True,
+                                               deadline=self.deadline) if html else None
+            if analysis:
+                initial_links = self.extract_links(analysis['links'], start_url)
                 
-                html, headers_info = await self.get_page_content(session, start_url, headers)
-                if html:
-                    soup = BeautifulSoup(html, self.parser)
-                    initial_links = self.extract_links(soup, start_url)
-                    
-                    # Filtrer d'abord les liens prioritaires
-                    priority_links = [link for link in initial_links if self.is_priority_page(link)]
-                    self.priority_urls.update(priority_links)
-                    
-                    # Créer les tâches pour les liens prioritaires uniquement
-                    tasks = []
-                    for link in priority_links[:3]:  # Réduit à 3 liens prioritaires
-                        if len(self.visited) < self.max_pages:
-                            tasks.append(self.collect_priority_urls(session, link, headers))
-                    
-                    if tasks:
-                        await asyncio.gather(*tasks, return_exceptions=True)
+                # Filtrer d'abord les liens prioritaires
+                priority_links = [link for link in initial_links if self.is_priority_page(link)]
+                self.priority_urls.update(priority_links)
                 
-                return self.format_crawl_results(self.priority_urls)
+                # Créer les tâches pour les liens prioritaires uniquement
+                tasks = []
+                for link in priority_links[:3]:  # Réduit à 3 liens prioritaires
+                    if len(self.visited) < self.max_pages:
+                        tasks.append(self.collect_priority_urls(link, headers))
+                
+                if tasks:
+                    await asyncio.gather(*tasks, return_exceptions=True)
+            
+            return self.format_crawl_results(start_url, self.priority_urls)
                 
         except Exception as e:
             logging.error(f"Erreur lors du crawl: {str(e)}")
-            return self.format_crawl_results(self.priority_urls)
+            return self.format_crawl_results(start_url, self.priority_urls)
 
-    async def collect_priority_urls(self, session, url: str, headers: dict):
+    async def collect_priority_urls(self, url: str, headers: dict):
         """Collecte optimisée des URLs prioritaires"""
         if url in self.visited:
             return
         self.visited.add(url)
         
-        html, _ = await self.get_page_content(session, url, headers)
-        if html is None:  # Vérifie explicitement None
+        html = await self.get_page_content(url, headers, discovery=True)
+        if not html:
             return
-            
-        soup = BeautifulSoup(html, self.parser)
-        links = self.extract_links(soup, url)
+        
+        # Une page de découverte tronquée sera récupérée en entier : seuls ses liens sont analysés
+        page = self.page_cache.get(url)
+        analysis = await self.pool.analyze(page, url, links=True, extract=not page['truncated'],
+                                           deadline=self.deadline)
+        if not analysis:
+            return
+        links = self.extract_links(analysis['links'], url)
         priority_links = [link for link in links if self.is_priority_page(link)]
         self.priority_urls.update(priority_links)
 
-    def format_crawl_results(self, results: Set[str]) -> List[str]:
+    def format_crawl_results(self, start_url: str, results: Set[str]) -> Dict[str, Optional[dict]]:
         """
-        Formate les résultats du crawl dans l'ordre de priorité
+        Formate les résultats du crawl : page d'accueil en premier, puis les autres URLs trouvées,
+        chacune associée au document déjà récupéré s'il existe (les pages de découverte
+        tronquées par la requête Range sont à récupérer en entier)
         """
-        # Retourner toutes les URLs trouvées
-        return list(results)
+        urls = [start_url] + sorted(url for url in results if url != start_url)
+        pages = {url: self.page_cache.get(url) for url in urls}
+        for url in self.discovery_urls:
+            if pages.get(url) and pages[url]['truncated']:
+                pages[url] = None
+        return pages
 
     # Mots-clés pour les pages prioritaires dans différentes langues
     priority_keywords = {
@@ -0,0 +1,234 @@
+import json
+import logging
+from bisect import bisect_right
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from html_parsers import TEXT_CONTAINERS, BLOCK_ELEMENTS, get_parser_backend
+
+
+class ParsedPage:
+    def __init__(self, html: str, url: str = '', headers: Optional[Dict] = None, parser: Optional[str] = None):
+        """
+        Document HTML analysé une seule fois et partagé par tous les extracteurs
+
+        L'arbre est construit à la création par le backend choisi, les vues dérivées (texte,
+        liens, meta, scripts, JSON-LD) sont calculées au premier accès puis conservées.
+
+        Args:
+            html: Contenu HTML de la page
+            url: URL de la page (base des liens relatifs)
+            headers: En-têtes HTTP de la réponse (optionnel)
+            parser: Backend d'analyse (bs4, lxml ou selectolax, défaut : bs4)
+        """
+        self.html = html or ''
+        self.url = url
+        self.headers = headers or {}
+        self.backend = get_parser_backend(parser)
+        self.parser = self.backend.name
+        self.tree = self.backend.parse(self.html)
+
+    @classmethod
+    def of(cls, document: Union['ParsedPage', str], url: str = '', headers: Optional[Dict] = None,
+           parser: Optional[str] = None) -> 'ParsedPage':
+        """Retourne le document analysé (analyse le HTML s'il est fourni brut)"""
+        if isinstance(document, ParsedPage):
+            return document
+        return cls(document, url, headers, parser)
+
+    @classmethod
+    def from_page(cls, page: dict, url: str = '', parser: Optional[str] = None) -> 'ParsedPage':
+        """
+        Retourne le document analysé d'une page récupérée par le client HTTP,
+        en le mémorisant dans la page (le crawler et l'extraction partagent la même analyse)
+        """
+        if page.get('parsed') is None:
+            page['parsed'] = cls(page['html'], url or page['url'], page['headers'], parser)
+        return page['parsed']
+
+    @cached_property
+    def flat(self):
+        """Éléments (nom, attributs, plage de segments, fin des descendants) et segments de texte du document"""
+        return self.backend.flatten(self.tree)
+
+    def find_all(self, names: Union[str, Iterable[str]]) -> List[list]:
+        """Éléments portant l'un des noms donnés, dans l'ordre du document"""
+        names = {names} if isinstance(names, str) else set(names)
+        return [element for element in self.flat[0] if element[0] in names]
+
+    def get_text(self, element: list) -> str:
+        """Texte d'un élément (le texte des scripts, styles et templates imbriqués est exclu)"""
+        kind = element[0] if element[0] in TEXT_CONTAINERS else None
+        segments = self.flat[1][element[2]:element[3]]
+        return ''.join(text for segment_kind, text in segments if segment_kind == kind)
+
+    @cached_property
+    def markup(self) -> str:
+        """HTML re-sérialisé par le parser"""
+        return self.backend.serialize(self.tree)
+
+    @cached_property
+    def text(self) -> str:
+        """Texte visible, un espace entre chaque bloc"""
+        return ' '.join(text.strip() for kind, text in self.flat[1] if kind is None and text.strip())
+
+    @cached_property
+    def flat_text(self) -> str:
+        """Texte brut du document, blocs concaténés sans séparateur"""
+        return ''.join(text for kind, text in self.flat[1] if kind is None)
+
+    @cached_property
+    def text_streams(self) -> Dict[Optional[str], Tuple[str, List[int], List[Optional[int]]]]:
+        """
+        Texte du document par conteneur (None pour le texte visible, script, style...), en un seul parcours
+
+        Chaque segment n'est lu qu'une fois, quelle que soit la profondeur d'imbrication ; les
+        segments séparés par une balise de bloc (div, p, td, br...) sont séparés par un saut de
+        ligne, les autres sont concaténés comme dans get_text.
+
+        Returns:
+            Dict conteneur -> (texte, début de chaque segment dans le texte,
+                               indice dans flat[0] de l'élément le plus proche de chaque segment)
+        """
+        elements, segments = self.flat
+        streams = {}
+        # Éléments ouverts (indices), prochain élément à ouvrir, nombre de limites de bloc franchies
+        stack, next_element, blocks = [], 0, 0
+        for index, (kind, text) in enumerate(segments):
+            while stack and elements[stack[-1]][3] <= index:
+                blocks += elements[stack.pop()][0] in BLOCK_ELEMENTS
+            while next_element < len(elements) and elements[next_element][2] <= index:
+                element = elements[next_element]
+                blocks += element[0] in BLOCK_ELEMENTS
+                # Les éléments vides (<br>, <img>) se referment avant le segment
+                if element[3] > index:
+                    stack.append(next_element)
+                next_element += 1
+
+            stream = streams.get(kind)
+            if stream is None:
+                stream = streams[kind] = [[], [], [], 0, blocks]
+            parts, offsets, owners, length, last_blocks = stream
+            if parts and blocks != last_blocks:
+                parts.append('\n')
+                length += 1
+            parts.append(text)
+            offsets.append(length)
+            owners.append(stack[-1] if stack else None)
+            stream[3] = length + len(text)
+            stream[4] = blocks
+        return {kind: (''.join(parts), offsets, owners) for kind, (parts, offsets, owners, _, _) in streams.items()}
+
+    def element_at(self, kind: Optional[str], position: int) -> Optional[list]:
+        """Élément le plus proche du caractère `position` du texte du conteneur `kind` (voir text_streams)"""
+        _, offsets, owners = self.text_streams[kind]
+        index = bisect_right(offsets, position) - 1
+        if index < 0 or owners[index] is None:
+            return None
+        return self.flat[0][owners[index]]
+
+    @cached_property
+    def links(self) -> List[str]:
+        """Valeurs href des balises <a>, dans l'ordre du document"""
+        return [element[1]['href'] for element in self.find_all('a') if 'href' in element[1]]
+
+    @cached_property
+    def meta_tags(self) -> List[Dict[str, str]]:
+        """Attributs des balises <meta>"""
+        return [dict(element[1]) for element in self.find_all('meta')]
+
+    @cached_property
+    def meta(self) -> Dict[str, str]:
+        """Nom (ou propriété) en minuscules -> contenu des balises <meta>"""
+        meta_data = {}
+        for attrs in self.meta_tags:
+            name = attrs.get('name', attrs.get('property', ''))
+            content = attrs.get('content', '')
+            if name and content:
+                meta_data[name.lower()] = content
+        return meta_data
+
+    @cached_property
+    def script_sources(self) -> List[str]:
+        """Attributs src des balises <script>"""
+        return [element[1]['src'] for element in self.find_all('script') if 'src' in element[1]]
+
+    @cached_property
+    def script_texts(self) -> List[str]:
+        """Contenu des balises <script> (vide pour les scripts externes)"""
+        return [self.get_text(element) for element in self.find_all('script')]
+
+    @cached_property
+    def stylesheets(self) -> List[str]:
+        """Attributs href des feuilles de style"""
+        return [element[1].get('href', '') for element in self.find_all('link')
+                if 'stylesheet' in element[1].get('rel', '').split()]
+
+    @cached_property
+    def style_texts(self) -> List[str]:
+        """Contenu des balises <style>"""
+        return [self.get_text(element) for element in self.find_all('style')]
+
+    @cached_property
+    def json_ld(self) -> List[Union[Dict, List]]:
+        """Blocs JSON-LD décodés (les blocs invalides sont ignorés)"""
+        blocks = []
+        for element in self.find_all('script'):
+            if element[1].get('type') != 'application/ld+json':
+                continue
+            try:
+                blocks.append(json.loads(self.get_text(element)))
+            except ValueError:
+                logging.debug(f"JSON-LD invalide ignoré sur {self.url}")
+        return blocks
+
+    @cached_property
+    def microdata(self) -> List[Dict]:
+        """
+        Items microdata (itemscope / itemprop) au format des blocs JSON-LD : {'@type': ..., propriété: valeurs}
+
+        Les items imbriqués par itemprop deviennent la valeur de cette propriété, les autres sont
+        rendus au premier niveau. Le document n'est parcouru qu'une fois.
+        """
+        elements = self.flat[0]
+        items = []
+        # Items ouverts : (fin de leurs descendants dans la liste des éléments, item)
+        scopes: List[Tuple[int, Dict]] = []
+        for index, element in enumerate(elements):
+            attrs = element[1]
+            while scopes and index >= scopes[-1][0]:
+                scopes.pop()
+
+            if 'itemscope' in attrs:
+                value = {}
+                if attrs.get('itemtype'):
+                    # https://schema.org/LocalBusiness -> LocalBusiness
+                    value['@type'] = [item_type.rstrip('/').rsplit('/', 1)[-1]
+                                      for item_type in attrs['itemtype'].split()]
+            elif 'itemprop' in attrs:
+                value = self._itemprop_value(element)
+            else:
+                continue
+
+            if 'itemprop' in attrs and scopes:
+                item = scopes[-1][1]
+                for prop in attrs['itemprop'].split():
+                    item.setdefault(prop, []).append(value)
+            elif 'itemscope' in attrs:
+                items.append(value)
+
+            if 'itemscope' in attrs:
+                scopes.append((element[4], value))
+        return items
+
+    def _itemprop_value(self, element: list) -> str:
+        """Valeur d'une propriété microdata (attribut content, lien, source ou texte de l'élément)"""
+        name, attrs = element[0], element[1]
+        if 'content' in attrs:
+            return attrs['content'].strip()
+        if name in ('a', 'area', 'link'):
+            return attrs.get('href', '').strip()
+        if name in ('img', 'audio', 'video', 'source', 'iframe', 'embed'):
+            return attrs.get('src', '').strip()
+        if name == 'time' and 'datetime' in attrs:
+            return attrs['datetime'].strip()
+        return ' '.join(self.get_text(element).split())
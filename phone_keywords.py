@@ -105,3 +105,10 @@ EXCLUDE_PATTERNS = [
     r'created(?:on|at)[-_]?\d+',  # Dates de création
     r'updated(?:on|at)[-_]?\d+',  # Dates de mise à jour
 ]
+
+# Mots suspects qui, près d'une suite de chiffres, en font un identifiant, une date ou une mesure
+# (recherchés en une passe avec les mots-clés de PHONE_KEYWORDS)
+EXCLUDE_KEYWORDS = [
+    'id', 'version', 'timestamp', 'date', 'time', 'size', 'width', 'height',
+    'index', 'item', 'row', 'col',
+]
@@ -0,0 +1,127 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from country_codes import (COUNTRY_CODES, NATIONAL_NUMBER_LENGTHS, DEFAULT_NATIONAL_LENGTH,
+                           OPTIONAL_TRUNK_CODES)
+
+# Pays des numéros nationaux (sans indicatif) quand le domaine du site n'en indique pas
+DEFAULT_COUNTRY = 'FR'
+
+# Domaines nationaux qui ne reprennent pas le code ISO du pays
+TLD_COUNTRIES = {'uk': 'GB'}
+
+# Bornes E.164 : indicatif + numéro national
+E164_MIN_DIGITS = 8
+E164_MAX_DIGITS = 15
+
+
+class PhoneNormalizer:
+    def __init__(self, country_codes: Dict[str, Tuple[str, Optional[str]]] = COUNTRY_CODES,
+                 default_country: str = DEFAULT_COUNTRY):
+        """
+        Normalisation des numéros au format E.164 pour tous les pays de COUNTRY_CODES
+
+        Les indicatifs sont rangés dans un arbre (un nœud par chiffre) : l'indicatif le plus long
+        en tête d'un numéro est trouvé en parcourant au plus 3 chiffres, sans regex. Le préfixe
+        local (0 en France, 8 en Russie...) est retiré des numéros nationaux et des numéros
+        internationaux qui le conservent à tort (+33 (0)1..., +33 01...).
+
+        Args:
+            country_codes: Code pays -> (indicatif, préfixe local)
+            default_country: Pays des numéros nationaux quand aucun indice n'est fourni
+        """
+        self.country_codes = country_codes
+        self.default_country = default_country
+
+        # Arbre des indicatifs : chiffre -> nœud, '' -> pays qui partagent l'indicatif
+        self.dial_code_trie = {}
+        for country, (dial_code, _) in country_codes.items():
+            node = self.dial_code_trie
+            for digit in dial_code:
+                node = node.setdefault(digit, {})
+            node.setdefault('', []).append(country)
+
+        self.trunk_pattern = re.compile(r'\(0\)')
+        self.non_digits = re.compile(r'\D')
+
+    def match_dial_code(self, digits: str) -> Optional[Tuple[str, List[str]]]:
+        """
+        Indicatif le plus long en tête des chiffres
+
+        Returns:
+            (indicatif, pays qui le partagent) ou None si aucun indicatif ne correspond
+        """
+        node, found = self.dial_code_trie, None
+        for length, digit in enumerate(digits, 1):
+            node = node.get(digit)
+            if node is None:
+                break
+            if '' in node:
+                found = (digits[:length], node[''])
+        return found
+
+    def country_for_url(self, url: str) -> Optional[str]:
+        """Pays indiqué par le domaine national du site (example.de -> DE), None pour .com, .org..."""
+        if not url:
+            return None
+        host = urlparse(url if '//' in url else f'//{url}').hostname or ''
+        tld = host.rsplit('.', 1)[-1].lower()
+        country = TLD_COUNTRIES.get(tld, tld.upper())
+        return country if country in self.country_codes else None
+
+    def is_valid_national(self, country: str, national: str) -> bool:
+        """Vérifie la longueur du numéro national selon les règles du pays"""
+        minimum, maximum = NATIONAL_NUMBER_LENGTHS.get(country, DEFAULT_NATIONAL_LENGTH)
+        dial_code = self.country_codes[country][0]
+        return (minimum <= len(national) <= maximum
+                and E164_MIN_DIGITS <= len(dial_code) + len(national) <= E164_MAX_DIGITS)
+
+    def normalize(self, phone: str, default_country: Optional[str] = None) -> Optional[str]:
+        """
+        Convertit un numéro au format E.164 (+33142680000)
+
+        Args:
+            phone: Numéro brut (séparateurs, +, 00, (0) acceptés)
+            default_country: Pays des numéros nationaux (indice tiré du domaine du site)
+
+        Returns:
+            Numéro E.164 ou None si le numéro n'est valide pour aucun pays
+        """
+        phone = self.trunk_pattern.sub('', phone)
+        digits = self.non_digits.sub('', phone)
+        if not digits:
+            return None
+
+        # + avant le premier chiffre, ou préfixe international 00
+        if '+' in phone[:phone.index(digits[0])]:
+            return self._normalize_international(digits, default_country)
+        if digits.startswith('00'):
+            return self._normalize_international(digits[2:], default_country)
+        return self._normalize_national(digits, default_country or self.default_country)
+
+    def _normalize_international(self, digits: str, hint: Optional[str]) -> Optional[str]:
+        found = self.match_dial_code(digits)
+        if found is None:
+            return None
+        dial_code, countries = found
+        country = hint if hint in countries else countries[0]
+        national = digits[len(dial_code):]
+
+        if not self.is_valid_national(country, national):
+            # Préfixe local conservé après l'indicatif (+33 01 42 68 00 00)
+            trunk = self.country_codes[country][1]
+            if not (trunk and national.startswith(trunk) and self.is_valid_national(country, national[len(trunk):])):
+                return None
+            national = national[len(trunk):]
+        return f'+{dial_code}{national}'
+
+    def _normalize_national(self, digits: str, country: str) -> Optional[str]:
+        if country not in self.country_codes:
+            return None
+        dial_code, trunk = self.country_codes[country]
+        if trunk and digits.startswith(trunk) and self.is_valid_national(country, digits[len(trunk):]):
+            return f'+{dial_code}{digits[len(trunk):]}'
+        # Sans préfixe local : seulement dans les pays qui n'en ont pas ou où il est facultatif
+        if (not trunk or dial_code in OPTIONAL_TRUNK_CODES) and self.is_valid_national(country, digits):
+            return f'+{dial_code}{digits}'
+        return None
@@ -0,0 +1,90 @@
+import re
+from typing import Callable, Iterator, Optional, Tuple
+
+# Chiffres minimum d'un numéro (0 + 9 chiffres, ou + et 9 chiffres)
+MIN_PHONE_DIGITS = 9
+
+# Séparateurs consécutifs tolérés entre deux chiffres d'une même séquence
+MAX_SEPARATORS = 3
+
+
+class PhoneScanner:
+    def __init__(self):
+        """
+        Recherche des numéros de téléphone en deux étapes
+
+        1. Un parcours linéaire du texte repère les séquences de chiffres (séparées par des
+           espaces, points, tirets ou parenthèses) ; celles qui ont trop peu de chiffres sont
+           écartées sans autre calcul.
+        2. Les formats de numéros (français, nord-américain, international) ne sont appliqués
+           qu'à l'intérieur de ces séquences.
+
+        Les deux étapes ne font pas de retour arrière au-delà d'une séquence : le coût par page
+        est linéaire en la taille du texte. L'indicatif des numéros internationaux est validé
+        ensuite par PhoneNormalizer (arbre des indicatifs), pas par le motif.
+        """
+        # Étape 1 : séquence de chiffres commençant par un chiffre, + ou ( et finissant par un chiffre
+        # (séparateurs et chiffres disjoints : aucune ambiguïté, donc aucun retour arrière)
+        self.sequence_pattern = re.compile(rf'[+(]?\d(?:[\s().-]{{0,{MAX_SEPARATORS}}}\d)*')
+        self.non_digits = re.compile(r'\D')
+
+        # Étape 2 : formats de numéros, sans contexte (appliqués aux seules séquences candidates)
+        number_patterns = [
+            # Format français
+            r"(?:(?:\+|00)?33(?:\s*\(0\))?|0)\s*[1-9](?:[\s.-]*\d{2}){4}",
+
+            # Format nord-américain
+            r"(?:\+?1[-. ]?)?\(?[2-9][0-9]{2}\)?[-. ]?[0-9]{3}[-. ]?[0-9]{4}",
+
+            # Format international : indicatif puis chiffres groupés sur une même ligne
+            # (+44 20 7946 0958, +33 (0)1 42 68 00 00)
+            r"(?:\+|00)[1-9](?:[ \t\xa0.-]?(?:\(0\)[ \t\xa0.-]?)?\d){7,14}",
+
+            # Format générique pour les numéros sans indicatif
+            r"0[1-9](?:[\s.-]*\d{2}){4}",
+        ]
+        # Un numéro ne commence ni ne finit au milieu d'un groupe de chiffres
+        self.number_patterns = [re.compile(r'(?<!\d)' + pattern + r'(?!\d)') for pattern in number_patterns]
+
+    def candidates(self, text: str) -> Iterator[re.Match]:
+        """Étape 1 : séquences de chiffres assez longues pour contenir un numéro"""
+        for sequence in self.sequence_pattern.finditer(text):
+            if sequence.end() - sequence.start() >= MIN_PHONE_DIGITS and \
+                    len(self.non_digits.sub('', sequence.group())) >= MIN_PHONE_DIGITS:
+                yield sequence
+
+    def scan(self, text: str, normalize: Callable[[str], Optional[str]]) -> Iterator[Tuple[str, int, int]]:
+        """
+        Numéros trouvés dans le texte
+
+        Dans chaque séquence, les correspondances de tous les formats sont examinées de la plus
+        à gauche à la plus longue ; une correspondance qui chevauche un numéro déjà retenu est
+        une autre lecture des mêmes chiffres et est ignorée.
+
+        Args:
+            text: Texte à parcourir
+            normalize: Valide et normalise un numéro brut (None s'il est rejeté) ; le numéro est
+                       passé avec le caractère non alphanumérique qui l'entoure, utilisé par les
+                       exclusions (#0142680000 est une référence, pas un numéro)
+
+        Returns:
+            Itérateur (numéro normalisé, début, fin du numéro brut dans le texte)
+        """
+        for sequence in self.candidates(text):
+            start, end = sequence.span()
+            matches = sorted((match.span() for pattern in self.number_patterns
+                              for match in pattern.finditer(text, start, end)),
+                             key=lambda span: (span[0], -span[1]))
+            accepted_end = start
+            for match_start, match_end in matches:
+                if match_start < accepted_end:
+                    continue
+                context_start, context_end = match_start, match_end
+                if match_start > 0 and not (text[match_start - 1].isalnum() or text[match_start - 1] == '_'):
+                    context_start -= 1
+                if match_end < len(text):
+                    context_end += 1
+                phone = normalize(text[context_start:context_end])
+                if phone:
+                    accepted_end = match_end
+                    yield phone, match_start, match_end
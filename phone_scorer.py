@@ -0,0 +1,95 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Tuple
+from keyword_automaton import KeywordAutomaton
+from phone_keywords import PHONE_KEYWORDS, EXCLUDE_KEYWORDS
+
+# Confiance d'un numéro sans aucun indice autour
+BASE_CONFIDENCE = 0.5
+
+# Confiance d'un numéro publié dans un lien tel:
+TEL_LINK_CONFIDENCE = 1.0
+
+# Mot-clé téléphone (tel, phone, 電話...) avant le numéro, ou juste après (« (fax) »)
+KEYWORD_BEFORE_DISTANCE = 40
+KEYWORD_AFTER_DISTANCE = 12
+KEYWORD_BEFORE_BONUS = 0.4
+KEYWORD_AFTER_BONUS = 0.2
+
+# Numéro écrit avec son indicatif (+33, 0033)
+INTERNATIONAL_BONUS = 0.1
+
+# Mot d'exclusion (id, width, px...) collé au numéro
+EXCLUDE_DISTANCE = 3
+EXCLUDE_PENALTY = 0.4
+
+KEYWORD = 'keyword'
+EXCLUDE = 'exclude'
+
+
+class PhoneScorer:
+    def __init__(self):
+        """
+        Confiance des numéros de téléphone d'après les mots qui les entourent
+
+        Les mots-clés multilingues de PHONE_KEYWORDS et les mots d'exclusion sont réunis dans un
+        seul automate d'Aho-Corasick, parcouru une fois par texte ; chaque numéro est ensuite
+        noté par recherche dichotomique des mots les plus proches.
+        """
+        words = {}
+        for group in PHONE_KEYWORDS:
+            for keyword in group.split('|'):
+                words[keyword] = KEYWORD
+        for keyword in EXCLUDE_KEYWORDS:
+            words.setdefault(keyword, EXCLUDE)
+        self.automaton = KeywordAutomaton(words)
+
+    def index(self, text: str) -> Dict[str, Tuple[List[int], List[int]]]:
+        """
+        Positions des mots-clés et des mots d'exclusion du texte
+
+        Returns:
+            Dict catégorie -> (débuts, fins) des occurrences, triés
+        """
+        positions = {KEYWORD: ([], []), EXCLUDE: ([], [])}
+        for start, end, kind in self.automaton.find(text):
+            starts, ends = positions[kind]
+            starts.append(start)
+            ends.append(end)
+        for starts, ends in positions.values():
+            starts.sort()
+        return positions
+
+    @staticmethod
+    def _near(starts: List[int], ends: List[int], start: int, end: int,
+              before: int, after: int) -> Tuple[bool, bool]:
+        """Un mot finit dans les `before` caractères avant le numéro / commence dans les `after` après"""
+        found_before = bisect_right(ends, start) > bisect_left(ends, start - before)
+        found_after = bisect_right(starts, end + after) > bisect_left(starts, end)
+        return found_before, found_after
+
+    def score(self, index: Dict[str, Tuple[List[int], List[int]]], phone: str, start: int, end: int) -> float:
+        """
+        Confiance (0 à 1) d'un numéro trouvé entre `start` et `end` dans le texte indexé
+
+        Args:
+            index: Positions des mots du texte (voir index())
+            phone: Numéro brut tel qu'écrit dans le texte
+            start: Début du numéro dans le texte
+            end: Fin du numéro dans le texte
+        """
+        confidence = BASE_CONFIDENCE
+
+        keyword_before, keyword_after = self._near(*index[KEYWORD], start, end,
+                                                   KEYWORD_BEFORE_DISTANCE, KEYWORD_AFTER_DISTANCE)
+        if keyword_before:
+            confidence += KEYWORD_BEFORE_BONUS
+        elif keyword_after:
+            confidence += KEYWORD_AFTER_BONUS
+
+        if phone.lstrip('( ').startswith(('+', '00')):
+            confidence += INTERNATIONAL_BONUS
+
+        if any(self._near(*index[EXCLUDE], start, end, EXCLUDE_DISTANCE, EXCLUDE_DISTANCE)):
+            confidence -= EXCLUDE_PENALTY
+
+        return round(min(max(confidence, 0.0), 1.0), 2)
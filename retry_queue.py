@@ -0,0 +1,111 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+import logging
+from typing import Awaitable, Callable, Dict
+from fetch_errors import TRANSIENT_ERRORS
+
+
+class RetryQueue:
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0):
+        """
+        File différée des pages en échec transitoire, traitée après la passe principale
+
+        Args:
+            max_attempts: Nombre maximum de relances par page
+            base_delay: Délai de la première relance (secondes)
+            max_delay: Délai maximum entre deux relances (secondes)
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.heap = []
+        self.counter = itertools.count()
+        self.stats = {
+            'scheduled': 0,
+            'retried': 0,
+            'recovered': 0,
+            'exhausted': 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def backoff(self, attempt: int) -> float:
+        """Délai exponentiel avec gigue (entre 50 % et 100 % du délai nominal)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def schedule(self, entry: Dict) -> bool:
+        """
+        Programme une relance de l'entrée (page_url, headers, ...)
+
+        Returns:
+            bool: False si l'entrée a épuisé ses relances
+        """
+        attempt = entry.get('attempt', 0)
+        if attempt >= self.max_attempts:
+            self.stats['exhausted'] += 1
+            return False
+        entry['attempt'] = attempt + 1
+        ready_at = time.monotonic() + self.backoff(attempt)
+        heapq.heappush(self.heap, (ready_at, next(self.counter), entry))
+        self.stats['scheduled'] += 1
+        return True
+
+    async def drain(self, handler: Callable[[Dict], Awaitable[dict]], concurrency: int = 20):
+        """
+        Traite les relances dans l'ordre de leur échéance
+
+        Args:
+            handler: Coroutine qui relance la récupération d'une entrée et retourne le document
+            concurrency: Nombre de relances simultanées
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = set()
+
+        async def run(entry: Dict):
+            try:
+                self.stats['retried'] += 1
+                page = await handler(entry)
+                if page['error_kind'] in TRANSIENT_ERRORS:
+                    self.schedule(entry)
+                elif page['error_kind'] is None:
+                    self.stats['recovered'] += 1
+            except Exception as e:
+                logging.error(f"Erreur lors de la relance de {entry.get('page_url')}: {str(e)}")
+            finally:
+                semaphore.release()
+
+        while self.heap or tasks:
+            if not self.heap:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                continue
+
+            delay = self.heap[0][0] - time.monotonic()
+            if delay > 0:
+                # Attendre l'échéance suivante (ou la fin d'une relance qui peut en programmer une plus proche)
+                if tasks:
+                    await asyncio.wait(tasks, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                else:
+                    await asyncio.sleep(delay)
+                continue
+
+            _, _, entry = heapq.heappop(self.heap)
+            await semaphore.acquire()
+            task = asyncio.create_task(run(entry))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Retourne les compteurs de relance
+
+        Returns:
+            Dict avec le nombre de relances programmées, effectuées, réussies et épuisées
+        """
+        stats = dict(self.stats)
+        stats['pending'] = len(self.heap)
+        return stats
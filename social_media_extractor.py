@@ -1,53 +1,152 @@
 import re
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from typing import Dict, Iterable, Optional, Tuple
+from parsed_page import ParsedPage
+from structured_data import StructuredDataExtractor
+
+# Plateforme -> (domaine, chemin d'un profil, chemins réservés, URL canonique, identifiant sans casse)
+# Les chemins réservés sont ceux des boutons de partage, des intents et des pages du réseau
+# lui-même : ils ne désignent jamais le profil du site.
+SOCIAL_PLATFORMS = {
+    'facebook': (r'(?:facebook|fb)\.com', r'[\w.-]+',
+                 'sharer|sharer\\.php|share|share\\.php|dialog|plugins|tr|login|help|policies|privacy'
+                 '|profile\\.php|photo\\.php|pages|watch|events|groups|hashtag',
+                 'https://www.facebook.com/{path}', True),
+    'linkedin': (r'linkedin\.com', r'(?:company|in|school|showcase)/[\w%-]+', '',
+                 'https://www.linkedin.com/{path}', True),
+    'instagram': (r'instagram\.com', r'[\w.]+', 'p|reel|reels|explore|accounts|stories|tv|direct',
+                  'https://www.instagram.com/{path}', True),
+    'twitter': (r'(?:twitter|x)\.com', r'\w+',
+                'intent|share|home|search|hashtag|i|login|signup|privacy|tos|explore|settings',
+                'https://x.com/{path}', True),
+    'youtube': (r'youtube\.com', r'(?:(?:user|channel|c)/[\w-]+|@[\w.-]+|[\w-]+)',
+                'watch|embed|results|redirect|playlist|shorts|feed|share|live|hashtag|premium|account',
+                'https://www.youtube.com/{path}', False),
+    'github': (r'github\.com', r'[\w-]+', 'sponsors|login|signup|features|about|pricing|topics|marketplace|explore',
+               'https://github.com/{path}', True),
+    'pinterest': (r'pinterest\.(?:com|fr)', r'[\w-]+', 'pin|search|ideas|login|today',
+                  'https://www.pinterest.com/{path}', True),
+    'tiktok': (r'tiktok\.com', r'@[\w.]+', '', 'https://www.tiktok.com/{path}', True),
+    'snapchat': (r'snapchat\.com', r'add/[\w.-]+', '', 'https://www.snapchat.com/{path}', True),
+    'houzz': (r'houzz\.(?:com|fr)', r'(?:pro/)?[\w-]+', 'photos|products|magazine|discussions|login|signup',
+              'https://www.{host}/{path}', True),
+    'google': (r'(?:plus\.google\.com|g\.page)', r'[\w.+-]+', '', 'https://{host}/{path}', False),
+    'yelp': (r'yelp\.(?:com|fr)', r'biz/[\w%-]+', '', 'https://www.{host}/{path}', True),
+    'nextdoor': (r'nextdoor\.(?:com|fr)', r'(?:pages/)?[\w-]+', 'login|signup|join|news_feed|sharing',
+                 'https://{host}/{path}', True),
+}
+
+# Profils désignés par un identifiant numérique plutôt que par un nom (profile.php?id=N des
+# pages récentes, anciens formats pages/Nom/N et pages/category/Catégorie/Nom-N) :
+# plateforme -> (chemin, URL canonique)
+PROFILE_ID_PATHS = {
+    'facebook': (r'(?:profile\.php\?(?:[^#]*&)?id=|pages/category/[^/?#]+/[^/?#]*-|pages/[^/?#]+/)'
+                 r'(?P<facebook_id>\d+)(?:&[^#]*)?',
+                 'https://www.facebook.com/profile.php?id={id}'),
+}
+
+# Priorité des sources : le site déclare ses profils dans le JSON-LD (sameAs), les liens
+# viennent ensuite (en-tête, pied de page), puis les meta Open Graph / Twitter
+SAME_AS_RANK = 3
+LINK_RANK = 2
+META_RANK = 1
+
+# Meta qui peuvent désigner un profil (article:publisher est la page Facebook de l'éditeur)
+SOCIAL_META_PREFIXES = ('og:', 'twitter:', 'article:publisher', 'article:author')
+
 
 class SocialMediaExtractor:
     def __init__(self):
-        self.social_patterns = {
-            'facebook': r'facebook\.com/[\w.]+',
-            'linkedin': r'linkedin\.com/(?:company/[\w-]+|in/[\w-]+)',
-            'instagram': r'instagram\.com/[\w.]+',
-            'twitter': r'(?:twitter\.com|x\.com)/[\w]+',
-            'youtube': r'youtube\.com/(?:user/|channel/|c/)?[\w-]+',
-            'github': r'github\.com/[\w-]+',
-            'pinterest': r'pinterest\.(?:com|fr)/[\w-]+',
-            'tiktok': r'(?:tiktok\.com|vm\.tiktok\.com)/@?[\w.]+',
-            'snapchat': r'snapchat\.com/add/[\w-]+',
-            'houzz': r'houzz\.(?:com|fr)/[\w-]+',
-            'google': r'(?:plus\.google\.com|g\.page)/[\w.+]+',
-            'yelp': r'yelp\.(?:com|fr)/[\w-]+',
-            'nextdoor': r'nextdoor\.(?:com|fr)/[\w-]+'
-        }
-
-    def extract_social_links(self, soup: BeautifulSoup, base_url: str) -> dict:
+        """
+        Profils de réseaux sociaux d'une page
+
+        Toutes les plateformes sont réunies dans une seule expression compilée (un groupe nommé par
+        plateforme) : chaque URL n'est testée qu'une fois. L'URL doit commencer par le domaine du
+        réseau (un lien relatif ne peut pas désigner un profil, il n'est donc jamais résolu), les
+        boutons de partage sont écartés et le profil est réécrit sous une forme canonique
+        (https, sans paramètres ni barre finale, ou profile.php?id=N pour une page Facebook
+        désignée par son identifiant).
+        """
+        self.structured_data_extractor = StructuredDataExtractor()
+        branches = []
+        for platform, (host, path, reserved, _, _) in SOCIAL_PLATFORMS.items():
+            if reserved:
+                path = rf'(?!(?:{reserved})(?:[/?#]|$)){path}'
+            if platform in PROFILE_ID_PATHS:
+                path = rf'(?:{PROFILE_ID_PATHS[platform][0]}|{path})'
+            branches.append(rf'(?P<{platform}>{host}/{path})')
+        self.profile_pattern = re.compile(
+            r'(?:https?:)?(?://)?(?:[\w-]+\.)*(?:' + '|'.join(branches) + r')(?=[/?#]|$)',
+            re.IGNORECASE
+        )
+
+    def canonical_profile(self, url: str) -> Optional[Tuple[str, str]]:
+        """
+        Plateforme et URL canonique d'un lien de profil
+
+        Args:
+            url: Lien ou contenu de meta
+
+        Returns:
+            (plateforme, URL canonique), ou None si l'URL n'est pas un profil
+        """
+        match = self.profile_pattern.match(url.strip())
+        if not match:
+            return None
+        platform = match.lastgroup
+        if platform in PROFILE_ID_PATHS and match.group(f'{platform}_id'):
+            return platform, PROFILE_ID_PATHS[platform][1].format(id=match.group(f'{platform}_id'))
+        host, _, path = match.group(platform).partition('/')
+        _, _, _, template, case_insensitive = SOCIAL_PLATFORMS[platform]
+        if case_insensitive:
+            path = path.lower()
+        return platform, template.format(host=host.lower(), path=path)
+
+    def extract_social_links(self, page: ParsedPage, base_url: str,
+                             same_as: Optional[Iterable[str]] = None) -> dict:
         """
         Extrait les liens des réseaux sociaux d'une page web
-        
+
         Args:
-            soup: Objet BeautifulSoup de la page
-            base_url: URL de base pour résoudre les liens relatifs
-            
+            page: Document déjà analysé (partagé avec les autres extracteurs)
+            base_url: URL de la page (les liens relatifs ne désignant jamais un profil, elle n'est
+                      pas utilisée pour les résoudre)
+            same_as: Profils déclarés par l'entreprise dans ses données structurées (sameAs),
+                     lus sur la page s'ils ne sont pas fournis
+
         Returns:
             dict: Dictionnaire des liens sociaux trouvés avec toutes les plateformes initialisées à None
         """
-        # Initialiser toutes les plateformes à None
-        social_media = {platform: None for platform in self.social_patterns.keys()}
-        
-        # Recherche dans les liens <a>
-        for link in soup.find_all('a', href=True):
-            href = urljoin(base_url, link['href'])
-            for platform, pattern in self.social_patterns.items():
-                if re.search(pattern, href, re.I):
-                    social_media[platform] = href
-        
-        # Recherche dans les meta tags (pour Open Graph et autres)
-        meta_tags = soup.find_all('meta', property=lambda x: x and ('og:' in x or 'twitter:' in x))
-        for meta in meta_tags:
-            content = meta.get('content', '')
-            if content:
-                for platform, pattern in self.social_patterns.items():
-                    if re.search(pattern, content, re.I):
-                        social_media[platform] = content
-        
+        # Plateforme -> (priorité de la source, URL canonique)
+        found: Dict[str, Tuple[int, str]] = {}
+
+        if same_as is None:
+            same_as = [url for url in self.structured_data_extractor.extract(page).get('sameAs', [])
+                       if isinstance(url, str)]
+
+        def candidates():
+            for url in same_as:
+                yield SAME_AS_RANK, url
+            for link in page.links:
+                yield LINK_RANK, link
+            for meta in page.meta_tags:
+                name = (meta.get('property') or meta.get('name') or '').lower()
+                content = meta.get('content', '')
+                if content and name.startswith(SOCIAL_META_PREFIXES):
+                    if name in ('twitter:site', 'twitter:creator') and content.startswith('@'):
+                        # Compte Twitter donné sous la forme @compte
+                        content = 'twitter.com/' + content[1:]
+                    yield META_RANK, content
+
+        for rank, url in candidates():
+            profile = self.canonical_profile(url)
+            if profile is None:
+                continue
+            platform, canonical = profile
+            # La première URL de la meilleure source l'emporte
+            if platform not in found or rank > found[platform][0]:
+                found[platform] = (rank, canonical)
+
+        social_media = {platform: None for platform in SOCIAL_PLATFORMS}
+        for platform, (_, canonical) in found.items():
+            social_media[platform] = canonical
         return social_media
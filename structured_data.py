@@ -0,0 +1,114 @@
+from typing import Any, Dict, List, Optional
+from parsed_page import ParsedPage
+
+# Types schema.org d'une entreprise (Yoast, Rank Math, Shopify publient Organization ou LocalBusiness)
+ORGANIZATION_TYPES = frozenset([
+    'Organization', 'Corporation', 'LocalBusiness', 'NGO', 'OnlineStore', 'OnlineBusiness',
+    'Restaurant', 'Hotel', 'Dentist', 'Physician', 'Attorney', 'Notary', 'Bakery', 'Pharmacy',
+    'Optician', 'Plumber', 'Electrician', 'Locksmith', 'HousePainter', 'Winery', 'Brewery',
+    'Hospital', 'MedicalClinic', 'Florist', 'Library', 'Museum', 'Campground', 'Motel',
+])
+
+# Suffixes des autres sous-types (HomeAndConstructionBusiness, ClothingStore, LegalService,
+# TravelAgency, RoofingContractor, FoodEstablishment, SportsOrganization...)
+ORGANIZATION_SUFFIXES = ('Business', 'Organization', 'Store', 'Service', 'Agency', 'Contractor',
+                         'Establishment', 'Shop')
+
+# Point de contact d'une entreprise (contactPoint), lu seulement sous une entreprise
+CONTACT_POINT_TYPES = frozenset(['ContactPoint', 'PostalAddress'])
+
+# Propriétés lues sur les entreprises
+STRUCTURED_PROPERTIES = ('telephone', 'email', 'sameAs', 'vatID', 'taxID', 'address')
+
+
+class StructuredDataExtractor:
+    def __init__(self):
+        """
+        Coordonnées déclarées par le site dans ses données structurées (JSON-LD et microdata)
+
+        Seuls les nœuds d'entreprise (Organization, LocalBusiness et sous-types) et leurs points
+        de contact sont lus : les profils et numéros d'un auteur (Person) ou d'un produit ne sont
+        pas ceux du site. Les valeurs sont rendues brutes, chaque extracteur les valide.
+        """
+        self.organization_types = ORGANIZATION_TYPES
+        self.properties = STRUCTURED_PROPERTIES
+
+    def is_organization(self, types: List[str]) -> bool:
+        for item_type in types:
+            if item_type in self.organization_types:
+                return True
+            if any(item_type.endswith(suffix) and item_type != suffix for suffix in ORGANIZATION_SUFFIXES):
+                return True
+        return False
+
+    @staticmethod
+    def node_types(node: Dict) -> List[str]:
+        """Types d'un nœud, sans préfixe (schema:Organization, https://schema.org/Organization)"""
+        types = node.get('@type', [])
+        if isinstance(types, str):
+            types = [types]
+        return [item_type.rstrip('/').rsplit('/', 1)[-1].rsplit(':', 1)[-1]
+                for item_type in types if isinstance(item_type, str)]
+
+    def _collect(self, node: Any, found: Dict[str, List], in_organization: bool = False):
+        if isinstance(node, list):
+            for item in node:
+                self._collect(item, found, in_organization)
+            return
+        if not isinstance(node, dict):
+            return
+
+        types = self.node_types(node)
+        is_organization = self.is_organization(types)
+        collect = is_organization or (in_organization and any(t in CONTACT_POINT_TYPES for t in types))
+        for key, value in node.items():
+            if collect and key in self.properties:
+                values = found.setdefault(key, [])
+                for item in (value if isinstance(value, list) else [value]):
+                    if item and item not in values:
+                        values.append(item)
+                # Les téléphones et emails d'une adresse postale sont aussi ceux de l'entreprise
+                if key == 'address':
+                    self._collect(value, found, is_organization)
+            elif isinstance(value, (dict, list)):
+                self._collect(value, found, is_organization)
+
+    def extract(self, page: ParsedPage) -> Dict[str, List]:
+        """
+        Propriétés des entreprises décrites par la page
+
+        Args:
+            page: Document déjà analysé (partagé avec les autres extracteurs)
+
+        Returns:
+            Dict propriété (telephone, email, sameAs, vatID, taxID, address) -> valeurs brutes,
+            dans l'ordre du document, sans doublons ; vide si la page n'en publie pas
+        """
+        found = {}
+        for block in page.json_ld:
+            self._collect(block, found)
+        for item in page.microdata:
+            self._collect(item, found)
+        return found
+
+    @staticmethod
+    def format_address(address: Any) -> Optional[str]:
+        """Adresse sur une ligne (« 1 rue de la Paix, 75002 Paris, FR ») depuis un texte ou un PostalAddress"""
+        if isinstance(address, list):
+            address = address[0] if address else None
+        if isinstance(address, str):
+            return ' '.join(address.split()) or None
+        if not isinstance(address, dict):
+            return None
+
+        def field(name: str) -> str:
+            value = address.get(name) or ''
+            if isinstance(value, list):
+                value = value[0] if value else ''
+            if isinstance(value, dict):
+                value = value.get('name') or ''
+            return ' '.join(str(value).split())
+
+        city = ' '.join(part for part in (field('postalCode'), field('addressLocality')) if part)
+        parts = [field('streetAddress'), city, field('addressCountry')]
+        return ', '.join(part for part in parts if part) or None
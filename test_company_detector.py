@@ -0,0 +1,107 @@
+import pytest
+from company_detector import CompanyDetector, STRUCTURED, TEXT
+from parsed_page import ParsedPage
+
+
+@pytest.fixture(scope='module')
+def detector():
+    return CompanyDetector()
+
+
+@pytest.mark.parametrize('siren, valid', [
+    ('732829320', True),
+    ('552100554', True),
+    ('542107651', True),
+    ('732829321', False),   # Clé de Luhn fausse
+    ('73282932', False),    # 8 chiffres
+    ('73282932a', False),
+    ('', False),
+])
+def test_validate_siren(detector, siren, valid):
+    assert detector._validate_siren(siren) is valid
+
+
+@pytest.mark.parametrize('siret, valid', [
+    ('73282932000074', True),
+    ('55210055400013', True),
+    ('73282932000075', False),
+    ('7328293200007', False),
+])
+def test_validate_siret(detector, siret, valid):
+    assert detector._validate_siret(siret) is valid
+
+
+@pytest.mark.parametrize('tva, key_matches', [
+    ('FR44732829320', True),
+    ('FR96552100554', True),
+    ('FR45732829320', False),   # SIREN valide, clé fausse
+    ('IT12345678901', False),   # Pas une TVA française
+])
+def test_tva_key(detector, tva, key_matches):
+    assert detector.tva_key_matches(tva) is key_matches
+
+
+@pytest.mark.parametrize('tva, valid', [
+    ('FR44732829320', True),
+    ('FR 44 732829320', True),
+    ('FR44732829321', False),   # SIREN invalide
+    ('FR4473282932', False),
+])
+def test_validate_tva(detector, tva, valid):
+    assert detector._validate_tva(tva) is valid
+
+
+@pytest.mark.parametrize('text, expected', [
+    # Un numéro annoncé par un libellé passe avant un numéro isolé, même plus loin dans le texte
+    ('Commande 552100554\nSIREN : 732829320',
+     {'siren': '732829320', 'siret': None, 'tva': None, 'confidence': 0.5}),
+    ('Notre numéro 732829320',
+     {'siren': '732829320', 'siret': None, 'tva': None, 'confidence': 0.2}),
+    # SIRET et TVA de la même entreprise : accord (+0.3), pas une répétition
+    ('SIRET : 732 829 320 00074\nTVA : FR44732829320',
+     {'siren': '732829320', 'siret': '73282932000074', 'tva': 'FR44732829320', 'confidence': 0.8}),
+    # Le même numéro écrit deux fois : répétition (+0.1)
+    ('SIREN 732829320 et encore 732829320',
+     {'siren': '732829320', 'siret': None, 'tva': None, 'confidence': 0.6}),
+    # Un numéro annoncé passe avant une paire SIRET + TVA sans libellé
+    ('SIREN : 552100554\nHébergement assuré par notre prestataire informatique 73282932000074 FR44732829320',
+     {'siren': '552100554', 'siret': None, 'tva': None, 'confidence': 0.5}),
+    ('RCS Paris B 732 829 320',
+     {'siren': '732829320', 'siret': None, 'tva': None, 'confidence': 0.5}),
+    ('TVA FR 44 732 829 320',
+     {'siren': '732829320', 'siret': None, 'tva': 'FR44732829320', 'confidence': 0.5}),
+    # Clé de TVA fausse : la TVA est rendue sans SIREN
+    ('TVA : FR45732829320',
+     {'siren': None, 'siret': None, 'tva': 'FR45732829320', 'confidence': 0.5}),
+    ('SIREN : 732829321', None),
+    # Chiffres collés à un numéro plus long ou à un indicatif
+    ('Tél +212 732829320', None),
+    ('1732829320', None),
+])
+def test_rank_candidates(detector, text, expected):
+    assert detector.rank_candidates(detector.scan_candidates(text)) == expected
+
+
+def test_label_announces_one_number(detector):
+    candidates = detector.scan_candidates('SIREN : 123456782 et 732829320')
+    assert [(number, labelled) for _, number, _, labelled in candidates] == [('123456782', True), ('732829320', False)]
+
+
+def test_rank_prefers_agreement_over_first_position(detector):
+    text = 'SIREN : 552100554\nSIREN : 732829320 - TVA FR44732829320'
+    assert detector.rank_candidates(detector.scan_candidates(text))['siren'] == '732829320'
+
+
+def test_structured_siren_completed_from_text(detector):
+    page = ParsedPage('<p>SIRET : 73282932000074</p><p>SIRET : 55210055400013</p>', 'https://acme.fr/')
+    result = detector.extract_company_info(page, 'https://acme.fr/', {'vatID': ['FR44732829320']})
+    assert result['siren'] == '732829320'
+    assert result['siret'] == '73282932000074'
+    assert result['origin'] == STRUCTURED
+    assert result['confidence'] == 1.0
+
+
+def test_text_company_info(detector):
+    page = ParsedPage('<footer>SIRET : 732 829 320 00074</footer>', 'https://acme.fr/')
+    result = detector.extract_company_info(page, 'https://acme.fr/')
+    assert (result['siren'], result['siret'], result['origin']) == ('732829320', '73282932000074', TEXT)
@@ -0,0 +1,44 @@
+import pytest
+from email_scanner import EmailScanner, PLAIN, ENTITIES, URL_ENCODED, SPELLED, CLOUDFLARE
+
+# contact@acme.fr chiffré par Cloudflare (clé 0x42)
+CLOUDFLARE_HEX = '42212d2c362321360223212f276c2430'
+
+scanner = EmailScanner()
+
+
+@pytest.mark.parametrize('data, email, kind', [
+    (b'Ecrivez a contact@acme.fr.', 'contact@acme.fr', PLAIN),
+    (b'Contact@ACME.FR', 'contact@acme.fr', PLAIN),
+    (b'info&#64;acme.fr', 'info@acme.fr', ENTITIES),
+    (b'&#105;nfo&#x40;acme&#46;fr', 'info@acme.fr', ENTITIES),
+    (b'jean&commat;acme&period;fr', 'jean@acme.fr', ENTITIES),
+    (b'<a href="mailto:sales%40acme.fr">', 'sales@acme.fr', URL_ENCODED),
+    (b'jean [at] acme [dot] fr', 'jean@acme.fr', SPELLED),
+    (b'jean (arobase) acme (point) fr', 'jean@acme.fr', SPELLED),
+    (f'<span data-cfemail="{CLOUDFLARE_HEX}">'.encode(), 'contact@acme.fr', CLOUDFLARE),
+    (f'<a href="/cdn-cgi/l/email-protection#{CLOUDFLARE_HEX}">'.encode(), 'contact@acme.fr', CLOUDFLARE),
+    # Octets Latin-1 autour de l'adresse
+    ('café contact@acme.fr'.encode('latin-1'), 'contact@acme.fr', PLAIN),
+])
+def test_decoded_forms(data, email, kind):
+    assert scanner.scan(data) == {email: kind}
+
+
+def test_address_trimmed_after_decoding():
+    # Espace, point ou paramètres encodés collés à l'adresse : le domaine est coupé, pas rejeté
+    assert scanner.scan(b'contact@acme.fr&#160;') == {'contact@acme.fr': PLAIN}
+    assert scanner.scan(b'contact@acme.fr%20') == {'contact@acme.fr': PLAIN}
+    assert scanner.scan(b'contact@acme.fr&#46;') == {'contact@acme.fr': PLAIN}
+    assert scanner.scan(b'<a href="mailto:%20contact@acme.fr">') == {'contact@acme.fr': PLAIN}
+    assert scanner.scan(b'mailto:contact%40acme.fr%3Fsubject%3DHi') == {'contact@acme.fr': URL_ENCODED}
+
+
+def test_false_positives():
+    assert scanner.scan(b'logo@2x.png') == {}
+    assert scanner.scan(b'user@localhost') == {}
+    assert scanner.scan(b'twitter @acme') == {}
+
+
+def test_text_and_duplicates():
+    assert scanner.scan('a@acme.fr, A@acme.fr et b&#64;acme.fr') == {'a@acme.fr': PLAIN, 'b@acme.fr': ENTITIES}
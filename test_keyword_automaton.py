@@ -0,0 +1,33 @@
+from keyword_automaton import KeywordAutomaton
+
+KEYWORDS = {'tel': 'tel', 'téléphone': 'phone', 'fax': 'fax', 'telefax': 'telefax', '電話': 'denwa'}
+
+automaton = KeywordAutomaton(KEYWORDS)
+
+
+def test_case_insensitive():
+    assert automaton.find('Tel: 01') == [(0, 3, 'tel')]
+    assert automaton.find('TÉLÉPHONE') == [(0, 9, 'phone')]
+
+
+def test_whole_words_only():
+    assert automaton.find('hotel') == []
+    assert automaton.find('telephone') == []
+    assert automaton.find('tel.fax') == [(0, 3, 'tel'), (4, 7, 'fax')]
+    # Mot-clé inclus dans un autre : seul le mot entier est gardé
+    assert automaton.find('telefax 01') == [(0, 7, 'telefax')]
+
+
+def test_scripts_without_word_breaks():
+    assert automaton.find('代表電話') == [(2, 4, 'denwa')]
+
+
+def test_substrings():
+    substrings = KeywordAutomaton(KEYWORDS, whole_words=False)
+    assert substrings.find('hotel telefax') == [(2, 5, 'tel'), (6, 9, 'tel'), (6, 13, 'telefax'), (10, 13, 'fax')]
+
+
+def test_positions_after_multi_char_lowercase():
+    # İ devient deux caractères en minuscules : les positions restent celles du texte d'origine
+    text = 'İstanbul tel'
+    assert [text[start:end] for start, end, _ in automaton.find(text)] == ['tel']
@@ -0,0 +1,39 @@
+import pytest
+from phone_normalizer import PhoneNormalizer
+
+normalizer = PhoneNormalizer()
+
+
+def test_french_spellings():
+    # Préfixe local 0, parfois conservé à tort après l'indicatif
+    for phone in ('01 42 68 00 00', '+33 1 42 68 00 00', '+33 (0)1 42 68 00 00',
+                  '+33 01 42 68 00 00', '0033 1 42 68 00 00'):
+        assert normalizer.normalize(phone) == '+33142680000', phone
+
+
+@pytest.mark.parametrize('phone, country, expected', [
+    ('030 1234567', 'DE', '+49301234567'),
+    ('020 7946 0958', 'GB', '+442079460958'),
+    ('+44 (0)20 7946 0958', None, '+442079460958'),
+    ('02 1234 5678', 'BE', '+32212345678'),
+    ('8 495 123 45 67', 'RU', '+74951234567'),
+    ('06 123 4567', 'IT', '+39061234567'),      # Pas de préfixe local en Italie : le 0 est gardé
+    ('(212) 555-0123', 'US', '+12125550123'),   # Préfixe 1 facultatif
+    ('+1 212 555 0123', None, '+12125550123'),
+    ('+7 495 123 45 67', 'KZ', '+74951234567'),  # Indicatif partagé par la Russie et le Kazakhstan
+])
+def test_national_plans(phone, country, expected):
+    assert normalizer.normalize(phone, country) == expected
+
+
+def test_rejected_numbers():
+    assert normalizer.normalize('+999 1234567') is None
+    assert normalizer.normalize('12 34', 'FR') is None
+    assert normalizer.normalize('1 42 68 00 00', 'FR') is None
+
+
+def test_country_for_url():
+    assert normalizer.country_for_url('https://www.example.de/') == 'DE'
+    assert normalizer.country_for_url('https://www.example.co.uk/contact') == 'GB'
+    assert normalizer.country_for_url('example.fr') == 'FR'
+    assert normalizer.country_for_url('https://example.com/') is None
@@ -0,0 +1,30 @@
+from phone_normalizer import PhoneNormalizer
+from phone_scanner import PhoneScanner
+
+scanner = PhoneScanner()
+normalizer = PhoneNormalizer()
+
+
+def phones(text):
+    return [phone for phone, _, _ in scanner.scan(text, normalizer.normalize)]
+
+
+def test_numbers_in_text():
+    assert phones('Tél : 01 42 68 00 00 ou +44 20 7946 0958') == ['+33142680000', '+442079460958']
+    assert phones('Appelez le 01.42.68.00.00.') == ['+33142680000']
+
+
+def test_digit_runs_that_are_not_phones():
+    assert phones('Réf. 014268000012345') == []
+    assert phones('Date 2024-01-15, 12 articles') == []
+    assert phones('') == []
+
+
+def test_shorter_reading_not_repeated():
+    assert phones('+33 1 42 68 00 00') == ['+33142680000']
+
+
+def test_positions():
+    text = 'Tél : 01 42 68 00 00'
+    [(phone, start, end)] = scanner.scan(text, normalizer.normalize)
+    assert text[start:end] == '01 42 68 00 00'